@@ -1,11 +1,12 @@
 -- Don't Change Visual by default is table 
 -- Copy Paste the name of Bi table in your metabase implementation
 -- D01 - Detail table related to analysis
--- You can check/override the original sql code `wardriving_vendor` for view 
+-- You can check/override the original sql code `wardriving_vendor_mv` for view 
 --  in wardrive/apps/wardriving/sql_views.py
+-- (materialized, refreshed by apps.wardriving.tasks.refresh_bi_views)
 SELECT
 	*
-FROM wardriving_vendor
+FROM wardriving_vendor_mv
 WHERE
 	{{ssid}}
 	AND {{device_source}}
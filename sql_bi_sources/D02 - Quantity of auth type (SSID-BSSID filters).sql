@@ -0,0 +1,19 @@
+-- Change Visual Mode to Cake graph
+-- Copy Paste the name of Bi table in your metabase implementation
+-- D02 - Quantity of auth type
+-- Same card read from `wardriving_vendor_mv`, one row per network: keeps
+--  the {{ssid}}/{{bssid}} filters and the exact {{first_seen}} that the
+--  rollup version (`D02 - Quantity of auth type.sql`) can't take
+SELECT
+	auth_mode,
+	count(*) as qty_auth
+FROM wardriving_vendor_mv
+WHERE
+	{{ssid}}
+	AND {{device_source}}
+	AND {{author}}
+	AND {{first_seen}}
+	AND {{bssid}}
+	AND {{auth_mode}}
+	AND {{vendor}}
+GROUP BY auth_mode
\ No newline at end of file
@@ -1,16 +1,18 @@
 -- Change Visual Mode to Cake graph
 -- Copy Paste the name of Bi table in your metabase implementation
 -- D05 - Quantity by signal streng
+-- Reads the daily rollup `wardriving_rollup_vendor` (one row per day and
+--  dimension, see wardrive/apps/wardriving/rollups.py): map the first_seen
+--  filter to its `day` column. A dashboard filtering by SSID/BSSID or by time
+--  of day uses `D05 - Quantity by signal streng (SSID-BSSID filters).sql` instead
 SELECT
 	signal_streng,
-	count(*) as qty_by_signal
-FROM wardriving_vendor
+	sum(qty) as qty_by_signal
+FROM wardriving_rollup_vendor
 WHERE
-	{{ssid}}
-	AND {{device_source}}
+	{{device_source}}
 	AND {{author}}
 	AND {{first_seen}}
-	AND {{bssid}}
 	AND {{auth_mode}}
 	AND {{vendor}}
 GROUP BY signal_streng
\ No newline at end of file
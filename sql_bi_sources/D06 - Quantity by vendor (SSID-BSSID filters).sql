@@ -0,0 +1,19 @@
+-- Change Visual Mode to Cake graph
+-- Copy Paste the name of Bi table in your metabase implementation
+-- D06 - Quantity by vendor
+-- Same card read from `wardriving_vendor_mv`, one row per network: keeps
+--  the {{ssid}}/{{bssid}} filters and the exact {{first_seen}} that the
+--  rollup version (`D06 - Quantity by vendor.sql`) can't take
+SELECT
+	vendor,
+	count(*) as qty_by_signal
+FROM wardriving_vendor_mv
+WHERE
+	{{ssid}}
+	AND {{device_source}}
+	AND {{author}}
+	AND {{first_seen}}
+	AND {{bssid}}
+	AND {{auth_mode}}
+	AND {{vendor}}
+GROUP BY vendor
\ No newline at end of file
@@ -0,0 +1,11 @@
+from rest_framework.routers import DefaultRouter
+
+from .views import BIRefreshStateViewSet
+
+router = DefaultRouter()
+
+router.register(
+    prefix="bi-freshness",
+    viewset=BIRefreshStateViewSet,
+    basename="bi-freshness",
+)
@@ -0,0 +1,20 @@
+from rest_framework import serializers
+
+from apps.wardriving.models import BIRefreshState
+
+
+class BIRefreshStateSerializer(serializers.ModelSerializer):
+    is_stale = serializers.BooleanField(read_only=True)
+    staleness_seconds = serializers.FloatField(read_only=True, allow_null=True)
+
+    class Meta:
+        model = BIRefreshState
+        fields = [
+            "view_name",
+            "refreshed_at",
+            "stale_since",
+            "is_stale",
+            "staleness_seconds",
+            "last_duration_ms",
+        ]
+        read_only_fields = fields
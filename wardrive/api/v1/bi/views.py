@@ -0,0 +1,29 @@
+from rest_framework import viewsets, permissions
+
+from drf_yasg.utils import swagger_auto_schema
+
+from .serializers import BIRefreshStateSerializer
+
+
+from apps.wardriving.models import BIRefreshState
+from api.pagination import CustomPagination
+
+
+class BIRefreshStateViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Watermark de los materialized views que leen los dashboards de BI:
+    `refreshed_at` es el corte de los datos y `staleness_seconds` cuánto lleva
+    esperando la escritura más vieja que aún no aparece.
+    """
+
+    lookup_field = "view_name"
+    queryset = BIRefreshState.objects.order_by("view_name")
+    serializer_class = BIRefreshStateSerializer
+    permission_classes = [
+        permissions.AllowAny,
+    ]
+    pagination_class = CustomPagination
+
+    @swagger_auto_schema(responses={200: BIRefreshStateSerializer(many=True)})
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
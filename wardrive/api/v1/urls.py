@@ -1,7 +1,9 @@
 from django.urls import include, path
 
 from .files.routers import router as files_router
+from .bi.routers import router as bi_router
 
 urlpatterns = [
     path("", include(files_router.urls)),
+    path("", include(bi_router.urls)),
 ]
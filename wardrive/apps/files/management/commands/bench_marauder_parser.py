@@ -0,0 +1,87 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.files.utils import (
+    _parse_marauder_ble_line,
+    _parse_marauder_line,
+    _parse_marauder_wifi_line,
+)
+
+
+def _legacy_auto_parser(line: str):
+    # Previous dispatcher: BLE grammar first, then WiFi grammar
+    return _parse_marauder_ble_line(line) or _parse_marauder_wifi_line(line)
+
+
+def build_mixed_corpus(n_lines: int, seed: int = 0) -> list[str]:
+    """Synthetic Flipper/Marauder log with WiFi, BLE and noise lines."""
+    rnd = random.Random(seed)
+    macs = [":".join(f"{rnd.randrange(256):02x}" for _ in range(6)) for _ in range(512)]
+    lines = []
+    for i in range(n_lines):
+        mac = rnd.choice(macs)
+        ts = f"2025-01-01 {rnd.randint(0, 23):02d}:{rnd.randint(0, 59):02d}:{rnd.randint(0, 59):02d}"
+        rssi = rnd.randint(-95, -30)
+        lat = f"19.4{rnd.randint(0, 99999):05d}"
+        lon = f"-99.1{rnd.randint(0, 99999):05d}"
+        kind = rnd.random()
+        if kind < 0.55:
+            lines.append(
+                f"{i} | {mac},Net{i % 50},[WPA2_PSK],{ts},{rnd.choice((1, 6, 11))},{rssi},{lat},{lon},2240.5,5.0,WIFI\n"
+            )
+        elif kind < 0.95:
+            lines.append(
+                f"Device: Band {i % 7}{mac},,[BLE],{ts},0,{rssi},{lat},{lon},2240.5,5.0,BLE\n"
+            )
+        else:
+            lines.append("wifi:can not get wifi protocol\n")
+    return lines
+
+
+class Command(BaseCommand):
+    help = "Benchmark del parser mixto de Marauder (BLE + WiFi): lines/sec antes y después."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--lines",
+            type=int,
+            default=200000,
+            help="Número de líneas del corpus sintético.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+            help="Repeticiones por parser (se reporta la mejor).",
+        )
+
+    def _best_rate(self, parser_fn, lines, repeat):
+        best = 0.0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for line in lines:
+                parser_fn(line)
+            elapsed = time.perf_counter() - start
+            best = max(best, len(lines) / elapsed)
+        return best
+
+    def handle(self, *args, **opts):
+        lines = build_mixed_corpus(opts["lines"])
+        repeat = opts["repeat"]
+
+        mismatches = sum(
+            1
+            for line in lines
+            if _legacy_auto_parser(line) != _parse_marauder_line(line)
+        )
+        if mismatches:
+            raise RuntimeError(f"Parsers disagree on {mismatches} lines")
+
+        before = self._best_rate(_legacy_auto_parser, lines, repeat)
+        after = self._best_rate(_parse_marauder_line, lines, repeat)
+
+        self.stdout.write(f"legacy _auto_parser:         {before:,.0f} lines/sec")
+        self.stdout.write(f"fused  _parse_marauder_line: {after:,.0f} lines/sec")
+        self.stdout.write(self.style.SUCCESS(f"speedup x{after / before:.2f}"))
@@ -0,0 +1,142 @@
+import random
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.core.management.base import BaseCommand
+from django.utils.timezone import get_current_timezone, make_aware
+from pandas import Series
+
+from apps.files.utils import (
+    TIMESTAMP_FORMAT,
+    _cached_dt_aware,
+    _parse_datetimes,
+    _parse_dt_aware,
+)
+
+
+def _legacy_parse_dt_aware(s: str):
+    # Previous decoder: strptime + make_aware on every line
+    if not s:
+        return None
+    try:
+        return make_aware(datetime.strptime(s.strip(), TIMESTAMP_FORMAT))
+    except Exception:
+        return None
+
+
+def build_timestamp_corpus(n_lines: int, per_second: int, seed: int = 0) -> list[str]:
+    """Marauder-like timestamps: every second repeats while the device scans."""
+    rnd = random.Random(seed)
+    start = datetime(2025, 1, 1, 8, 0, 0).timestamp()
+    second = start
+    stamps = []
+    for _ in range(n_lines):
+        if rnd.random() < 1 / per_second:
+            second += rnd.randint(1, 3)
+        stamps.append(datetime.fromtimestamp(second).strftime(TIMESTAMP_FORMAT))
+    return stamps
+
+
+def dst_edge_stamps(tz, years=range(2015, 2031)):
+    """
+    Local times skipped (spring forward) or repeated (fall back) by the DST
+    changes of `tz`: where the line and batch decoders are most likely to
+    disagree, so the equality check always includes them.
+    """
+    stamps = []
+    hour = datetime(years[0], 1, 1, tzinfo=dt_timezone.utc)
+    end = datetime(years[-1] + 1, 1, 1, tzinfo=dt_timezone.utc)
+    before = hour.astimezone(tz).utcoffset()
+    while hour < end:
+        hour += timedelta(hours=1)
+        after = hour.astimezone(tz).utcoffset()
+        if after != before:
+            wall = hour.replace(tzinfo=None) + before
+            # Middle of the skipped (jump > 0) or repeated (jump < 0) hours
+            middle = wall + (after - before) / 2
+            stamps += [
+                middle.strftime(TIMESTAMP_FORMAT),
+                wall.strftime(TIMESTAMP_FORMAT),
+            ]
+            before = after
+    return stamps
+
+
+class Command(BaseCommand):
+    help = "Benchmark del decoder de timestamps: strptime por línea vs LRU (línea) vs vectorizado (batch)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--lines",
+            type=int,
+            default=200000,
+            help="Número de timestamps del corpus sintético.",
+        )
+        parser.add_argument(
+            "--per-second",
+            type=int,
+            default=200,
+            help="Líneas promedio que repiten el mismo segundo.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+            help="Repeticiones por decoder (se reporta la mejor).",
+        )
+
+    def _best_rate(self, decode, stamps, repeat):
+        best = 0.0
+        for _ in range(repeat):
+            # Every round starts with a cold cache
+            _cached_dt_aware.cache_clear()
+            start = time.perf_counter()
+            decode(stamps)
+            elapsed = time.perf_counter() - start
+            best = max(best, len(stamps) / elapsed)
+        return best
+
+    def handle(self, *args, **opts):
+        stamps = build_timestamp_corpus(opts["lines"], opts["per_second"])
+        repeat = opts["repeat"]
+        tz = get_current_timezone()
+
+        def legacy(values):
+            return [_legacy_parse_dt_aware(s) for s in values]
+
+        def line_mode(values):
+            return [_parse_dt_aware(s, tz) for s in values]
+
+        def batch_mode(values):
+            return _parse_datetimes(Series(values))
+
+        checked = stamps + dst_edge_stamps(tz)
+        expected = legacy(checked)
+        for name, decoded in (
+            ("line", line_mode(checked)),
+            ("batch", list(batch_mode(checked))),
+        ):
+            mismatches = sum(
+                1
+                for a, b in zip(expected, decoded)
+                # The stored instant: make_aware keeps a skipped local time
+                # as is (old offset), pandas can only write it shifted
+                if a.astimezone(dt_timezone.utc) != b.astimezone(dt_timezone.utc)
+            )
+            if mismatches:
+                raise RuntimeError(
+                    f"{name} decoder disagrees on {mismatches} timestamps"
+                )
+
+        before = self._best_rate(legacy, stamps, repeat)
+        line = self._best_rate(line_mode, stamps, repeat)
+        batch = self._best_rate(batch_mode, stamps, repeat)
+
+        self.stdout.write(f"legacy strptime+make_aware: {before:,.0f} timestamps/sec")
+        self.stdout.write(f"line   LRU cache:           {line:,.0f} timestamps/sec")
+        self.stdout.write(f"batch  to_datetime(format): {batch:,.0f} timestamps/sec")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"speedup line x{line / before:.2f}, batch x{batch / before:.2f}"
+            )
+        )
@@ -0,0 +1,23 @@
+# Generated by Django 5.2 on 2026-10-17 04:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("files", "0009_alter_filesuploaded_device_source"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="filesuploaded",
+            name="ingest_line",
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="filesuploaded",
+            name="ingest_offset",
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.2 on 2026-10-17 04:42
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_status(apps, schema_editor):
+    FilesUploaded = apps.get_model("files", "FilesUploaded")
+    FilesUploaded.objects.update(status_updated_at=F("created_at"))
+    FilesUploaded.objects.filter(is_procesed=True).update(status="done")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("files", "0010_filesuploaded_ingest_progress"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="filesuploaded",
+            name="attempts",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="filesuploaded",
+            name="last_error",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.AddField(
+            model_name="filesuploaded",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "pending"),
+                    ("running", "running"),
+                    ("done", "done"),
+                    ("failed", "failed"),
+                ],
+                default="pending",
+                editable=False,
+                max_length=10,
+            ),
+        ),
+        migrations.AddField(
+            model_name="filesuploaded",
+            name="status_updated_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_status, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="filesuploaded",
+            index=models.Index(
+                condition=models.Q(("status", "done"), _negated=True),
+                fields=["status", "status_updated_at"],
+                name="file_upload_backlog_idx",
+            ),
+        ),
+    ]
@@ -1,10 +1,28 @@
 import hashlib
+from datetime import timedelta
 
+from django.conf import settings
 from django.db import models
+from django.db.models import F, Q
+from django.utils.timezone import now
 
 from apps.wardriving import SourceDevice
 
 
+class ProcessingStatus:
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    CHOICES = [
+        (PENDING, PENDING),
+        (RUNNING, RUNNING),
+        (DONE, DONE),
+        (FAILED, FAILED),
+    ]
+
+
 class SourcesWithCopy(models.Model):
     original_author = models.TextField(verbose_name="Original author", default="")
     fake_author = models.TextField(verbose_name="Fake author", default="")
@@ -25,16 +43,88 @@ class FilesUploaded(models.Model):
         default=SourceDevice.UNKNOWN,
     )
     is_procesed = models.BooleanField(default=False)
+    status = models.CharField(
+        max_length=10,
+        choices=ProcessingStatus.CHOICES,
+        default=ProcessingStatus.PENDING,
+        editable=False,
+    )
+    # Runs of process_file on this file, retries included
+    attempts = models.PositiveIntegerField(default=0, editable=False)
+    last_error = models.TextField(blank=True, default="", editable=False)
+    # Last status change or committed progress (heartbeat of a running file)
+    status_updated_at = models.DateTimeField(null=True, blank=True, editable=False)
     hash_sha256 = models.CharField(max_length=64, blank=True, null=True, editable=False)
+    # Resume point of the ingestion: next byte / line of the file to read,
+    # committed together with the rows before it
+    ingest_offset = models.BigIntegerField(default=0, editable=False)
+    ingest_line = models.BigIntegerField(default=0, editable=False)
 
     class Meta:
         db_table = "file_upload"
         verbose_name = "File Upload"
         verbose_name_plural = "Files Upload"
+        indexes = [
+            # Backlog of drain_file_backlog; done files are most of the table
+            models.Index(
+                fields=["status", "status_updated_at"],
+                condition=~models.Q(status=ProcessingStatus.DONE),
+                name="file_upload_backlog_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.source}"
 
+    @classmethod
+    def claim(cls, pk, redelivered=False):
+        """
+        Move a pending or failed file to running, counting one more attempt.
+        A running file is only taken over once it is INGEST_RUNNING_TIMEOUT
+        without progress (its worker was lost), or at once by the redelivery
+        of the task whose worker was lost. Returns the file, or None when
+        there is nothing to process.
+        """
+        running = Q(status=ProcessingStatus.RUNNING)
+        if not redelivered:
+            lost = now() - timedelta(seconds=settings.INGEST_RUNNING_TIMEOUT)
+            running &= Q(status_updated_at__lt=lost)
+        claimed = (
+            cls.objects.filter(pk=pk)
+            .filter(
+                Q(status__in=[ProcessingStatus.PENDING, ProcessingStatus.FAILED])
+                | running
+            )
+            .update(
+                status=ProcessingStatus.RUNNING,
+                attempts=F("attempts") + 1,
+                status_updated_at=now(),
+            )
+        )
+        return cls.objects.get(pk=pk) if claimed else None
+
+    @classmethod
+    def set_status_of(cls, pks, status, error=""):
+        # Updated in place: save() would re-check duplicates and is_procesed
+        fields = {"status": status, "last_error": error, "status_updated_at": now()}
+        if status == ProcessingStatus.DONE:
+            fields["is_procesed"] = True
+        cls.objects.filter(pk__in=pks).update(**fields)
+        return fields
+
+    def set_status(self, status, error=""):
+        for name, value in self.set_status_of([self.pk], status, error).items():
+            setattr(self, name, value)
+
+    def save_ingest_progress(self, offset, line):
+        self.status_updated_at = now()
+        FilesUploaded.objects.filter(pk=self.pk).update(
+            ingest_offset=offset,
+            ingest_line=line,
+            status_updated_at=self.status_updated_at,
+        )
+        self.ingest_offset, self.ingest_line = offset, line
+
     def _is_diff_author(self, first_instance):
         return self.uploaded_by != first_instance.uploaded_by
 
@@ -48,6 +138,12 @@ class FilesUploaded(models.Model):
 
         exists_instance = qs.exists()
         self.is_procesed = exists_instance
+        if self._state.adding:
+            # A copy of an uploaded file is not processed again
+            self.status = (
+                ProcessingStatus.DONE if exists_instance else ProcessingStatus.PENDING
+            )
+            self.status_updated_at = now()
         old_instance = qs.first()
         if exists_instance and self._is_diff_author(old_instance):
             SourcesWithCopy.objects.create(
@@ -0,0 +1,224 @@
+"""
+Routing of process_file onto the proc_N queues (one single-threaded worker
+each, see start_celery.sh).
+
+- A (uploaded_by, device_source) pair maps to its queue through a
+  consistent-hash ring over a stable digest (blake2b), so every gunicorn
+  and celery process agrees and resizing CELERY_SHARDS only moves ~1/N of
+  the pairs.
+- While an uploader has files in flight, all of its files go to the queue
+  that holds them (a Redis lease keyed by uploaded_by). Wardriving keys are
+  (uploaded_by, mac, channel), shared by all devices of an uploader, so this
+  is what keeps two shards from upserting the same key at the same time.
+- With no file in flight the uploader is free to move: when its ring queue
+  is CELERY_SHARD_SPILL_DEPTH messages deeper than the least-loaded queue
+  (depths read from the broker), it spills there instead.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from bisect import bisect_right
+
+from celery import current_app
+from django.conf import settings
+from redis import Redis, RedisError
+
+logger = logging.getLogger(__name__)
+
+# Tasks that write an uploader's rows, routed to its shard: process_file,
+# the merge of a chunked file (chord callback) and a group of small files
+SHARDED_TASKS = ("process_file", "merge_file_chunks", "process_file_group")
+
+# KEYS: lease (queue name), in-flight file pks. ARGV: proposed queue, file pk,
+# ttl. The lease only moves when the uploader has nothing in flight.
+_ACQUIRE_LUA = """
+local queue = redis.call('GET', KEYS[1])
+if not queue or redis.call('SCARD', KEYS[2]) == 0 then
+    queue = ARGV[1]
+    redis.call('SET', KEYS[1], queue)
+end
+redis.call('SADD', KEYS[2], ARGV[2])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+redis.call('EXPIRE', KEYS[2], ARGV[3])
+return queue
+"""
+
+# KEYS: lease, in-flight file pks. ARGV: file pk
+_RELEASE_LUA = """
+redis.call('SREM', KEYS[2], ARGV[1])
+if redis.call('SCARD', KEYS[2]) == 0 then
+    redis.call('DEL', KEYS[1])
+end
+return redis.call('SCARD', KEYS[2])
+"""
+
+
+def _digest(value):
+    # Stable across processes, unlike hash() (PYTHONHASHSEED)
+    return int.from_bytes(
+        hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big"
+    )
+
+
+class HashRing:
+    """Consistent-hash ring with `vnodes` points per node."""
+
+    def __init__(self, nodes, vnodes=64):
+        points = sorted(
+            (_digest(f"{node}#{v}"), node) for node in nodes for v in range(vnodes)
+        )
+        self._hashes = [h for h, _ in points]
+        self._nodes = [node for _, node in points]
+
+    def node_for(self, key):
+        i = bisect_right(self._hashes, _digest(key)) % len(self._hashes)
+        return self._nodes[i]
+
+
+def shard_queues(n=None):
+    return [f"proc_{i}" for i in range(n or settings.CELERY_SHARDS)]
+
+
+_state = {"ring": None, "ring_key": None, "depths": {}, "depths_at": 0.0}
+_lock = threading.Lock()
+_redis = {"client": None, "scripts": None}
+
+
+def _ring():
+    key = (settings.CELERY_SHARDS, settings.CELERY_SHARD_VNODES)
+    with _lock:
+        if _state["ring_key"] != key:
+            _state["ring"] = HashRing(shard_queues(), settings.CELERY_SHARD_VNODES)
+            _state["ring_key"] = key
+        return _state["ring"]
+
+
+def ring_shard_for(uploaded_by_id, device_source):
+    """Queue of the pair on the ring, ignoring load."""
+    return _ring().node_for(f"{uploaded_by_id}:{device_source}")
+
+
+def queue_depths():
+    """
+    Ready messages per proc_N queue, read from the broker at most every
+    CELERY_SHARD_DEPTH_TTL seconds. Empty when the broker can't be asked.
+    """
+    with _lock:
+        if time.monotonic() - _state["depths_at"] < settings.CELERY_SHARD_DEPTH_TTL:
+            return _state["depths"]
+
+    depths = {}
+    try:
+        with current_app.connection_for_read() as conn:
+            for queue in shard_queues():
+                channel = conn.channel()
+                try:
+                    depths[queue] = channel.queue_declare(
+                        queue=queue, passive=True
+                    ).message_count
+                except conn.channel_errors:
+                    # Not declared yet: no worker ever consumed it
+                    depths[queue] = 0
+                finally:
+                    channel.close()
+    except Exception:
+        logger.warning("Could not read shard queue depths", exc_info=True)
+        depths = {}
+
+    with _lock:
+        _state["depths"], _state["depths_at"] = depths, time.monotonic()
+    return depths
+
+
+def _spill_target(queue, depths):
+    if not depths or queue not in depths:
+        return queue
+    least = min(shard_queues(), key=lambda q: (depths.get(q, 0), q))
+    if depths[queue] - depths.get(least, 0) >= settings.CELERY_SHARD_SPILL_DEPTH:
+        return least
+    return queue
+
+
+def _scripts():
+    if _redis["scripts"] is None:
+        if not settings.REDIS_URL:
+            raise RedisError("REDIS_URL is not configured")
+        # Routing runs inside the upload request: fail fast to the ring
+        client = Redis.from_url(
+            settings.REDIS_URL, socket_connect_timeout=1, socket_timeout=1
+        )
+        _redis["client"] = client
+        _redis["scripts"] = (
+            client.register_script(_ACQUIRE_LUA),
+            client.register_script(_RELEASE_LUA),
+        )
+    return _redis["scripts"]
+
+
+def _lease_keys(uploaded_by_id):
+    return [
+        f"shard-lease:{uploaded_by_id}",
+        f"shard-lease:{uploaded_by_id}:files",
+    ]
+
+
+def shard_for(uploaded_by_id, device_source, file_pk):
+    """
+    Queue for one file: the uploader's current lease, or (when it has
+    nothing in flight) its ring queue, spilled to the least-loaded queue
+    when that one is hot. Without Redis it falls back to the ring queue.
+    """
+    proposed = _spill_target(
+        ring_shard_for(uploaded_by_id, device_source), queue_depths()
+    )
+    try:
+        acquire, _ = _scripts()
+        queue = acquire(
+            keys=_lease_keys(uploaded_by_id),
+            args=[proposed, file_pk, settings.CELERY_SHARD_LEASE_TTL],
+        )
+    except RedisError:
+        logger.warning("Shard lease unavailable, using the ring", exc_info=True)
+        return ring_shard_for(uploaded_by_id, device_source)
+    return queue.decode() if isinstance(queue, bytes) else queue
+
+
+def release_shard(uploaded_by_id, file_pk):
+    """Called once a file is done (processed or given up)."""
+    if uploaded_by_id is None or file_pk is None:
+        return
+    try:
+        _, release = _scripts()
+        release(keys=_lease_keys(uploaded_by_id), args=[file_pk])
+    except RedisError:
+        logger.warning("Could not release the shard lease", exc_info=True)
+
+
+def spread_queues(count):
+    """`count` queues for parse-only chunk tasks, least loaded first."""
+    depths = queue_depths()
+    queues = sorted(shard_queues(), key=lambda q: (depths.get(q, 0), q))
+    return [queues[i % len(queues)] for i in range(count)]
+
+
+def task_file_pk(args, kwargs):
+    # process_file(file_pk); merge_file_chunks(checkpoints, file_pk=...);
+    # process_file_group(file_pk=<file that opened the group>)
+    if "file_pk" in kwargs:
+        return kwargs["file_pk"]
+    return args[0] if args else None
+
+
+def route_by_pair(name, args, kwargs, options, task=None, **_):
+    if name.rsplit(".", 1)[-1] in SHARDED_TASKS:
+        ub = kwargs.get("_uploaded_by_id")
+        ds = kwargs.get("_device_source")
+        file_pk = task_file_pk(args, kwargs)
+        if ub is not None and ds is not None and file_pk is not None:
+            q = shard_for(ub, ds, file_pk)
+            # prioridad ejemplo: fuentes críticas más alto (más cercano a 10)
+            prio = 8 if ds in {"wardriving_app"} else 5
+            return {"queue": q, "routing_key": q, "priority": prio}
+    return None
@@ -0,0 +1,240 @@
+"""
+Column-oriented batch of rows for the parser -> dedupe -> upsert pipeline.
+
+Parsers append one tuple per record instead of building a dict, and every
+field lands in a typed array:
+
+- KIND_INT: array("q") of the values.
+- KIND_DATETIME: array("q") of microseconds since the epoch (UTC).
+- KIND_OBJECT (the rest): dictionary encoded, an array("I") of codes into
+  the list of distinct values (MACs, auth modes, altitudes and SSIDs repeat
+  a lot in a capture).
+
+Each column also keeps a bytearray mask of the cells that are set (an unset
+cell never overwrites a stored value). Values shared by every row of the
+batch (uploaded_by, device_source) are kept once in `constants`. Row dicts
+are only built at the ORM boundary, one per deduped row.
+"""
+
+from array import array
+from datetime import datetime, timedelta, timezone as dt_timezone
+from itertools import repeat
+
+from pandas.api.types import is_datetime64_any_dtype, is_integer_dtype
+
+KIND_INT = "int"
+KIND_DATETIME = "datetime"
+KIND_OBJECT = "object"
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def _to_micros(value):
+    return (value - EPOCH) // timedelta(microseconds=1)
+
+
+def _from_micros(value):
+    return EPOCH + timedelta(microseconds=value)
+
+
+class _Dictionary:
+    """Distinct values of an object column; code 0 is the unset cell."""
+
+    def __init__(self):
+        self.values = [None]
+        self._codes = {}
+
+    def code(self, value):
+        # Non-strings are keyed with their type so 1, 1.0 and True stay apart
+        key = value if type(value) is str else (type(value), value)
+        code = self._codes.get(key)
+        if code is None:
+            code = self._codes[key] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class RowBatch:
+    def __init__(self, fields, kinds=None, constants=None):
+        kinds = kinds or {}
+        self.constants = dict(constants or {})
+        self.fields = tuple(f for f in fields if f not in self.constants)
+        self.kinds = {f: kinds.get(f, KIND_OBJECT) for f in self.fields}
+        self._index = {f: i for i, f in enumerate(self.fields)}
+        self._columns = [
+            array("I") if self.kinds[f] == KIND_OBJECT else array("q")
+            for f in self.fields
+        ]
+        self._masks = [bytearray() for _ in self.fields]
+        self._dictionaries = [
+            _Dictionary() if self.kinds[f] == KIND_OBJECT else None for f in self.fields
+        ]
+        self._length = 0
+        self._encoded = None
+
+    def _encoders(self):
+        # Per column, what turns an appended value into its array cell
+        return [
+            d.code if d is not None else _to_micros if k == KIND_DATETIME else None
+            for d, k in zip(self._dictionaries, self.kinds.values())
+        ]
+
+    def __len__(self):
+        return self._length
+
+    def __contains__(self, field):
+        return field in self._index or field in self.constants
+
+    def new_like(self):
+        """Empty batch with the same fields, kinds and constants."""
+        return RowBatch(self.fields, self.kinds, self.constants)
+
+    def append(self, values):
+        """Add one row; `values` follow `fields` and None leaves a cell unset."""
+        if self._encoded is None:
+            self._encoded = self._encoders()
+        for column, mask, encode, value in zip(
+            self._columns, self._masks, self._encoded, values
+        ):
+            if value is None:
+                column.append(0)
+                mask.append(0)
+                continue
+            column.append(encode(value) if encode else value)
+            mask.append(1)
+        self._length += 1
+
+    @classmethod
+    def from_rows(cls, rows, kinds=None, constants=None):
+        """Batch of row dicts; missing keys and None values are unset cells."""
+        rows = list(rows)
+        fields = list(dict.fromkeys(k for row in rows for k in row))
+        batch = cls(fields, kinds, constants)
+        for row in rows:
+            batch.append([row.get(f) for f in batch.fields])
+        return batch
+
+    @classmethod
+    def from_frame(cls, df, fields, kinds=None, constants=None):
+        """Batch of the `fields` columns of an already normalized DataFrame."""
+        kinds = dict(kinds or {})
+        for field in fields:
+            if field not in df:
+                continue
+            dtype = df[field].dtype
+            # Typed kinds need a matching dtype, anything else is an object
+            if kinds.get(field) == KIND_INT and not is_integer_dtype(dtype):
+                kinds[field] = KIND_OBJECT
+            if kinds.get(field) == KIND_DATETIME and (
+                not is_datetime64_any_dtype(dtype) or getattr(dtype, "tz", None) is None
+            ):
+                kinds[field] = KIND_OBJECT
+
+        batch = cls([f for f in fields if f in df], kinds, constants)
+        for i, field in enumerate(batch.fields):
+            series = df[field]
+            present = series.notna().to_numpy()
+            batch._masks[i] = bytearray(present.astype("uint8").tobytes())
+            if batch.kinds[field] == KIND_INT:
+                values = series.to_numpy(dtype="int64", na_value=0)
+            elif batch.kinds[field] == KIND_DATETIME:
+                naive_utc = series.dt.tz_convert("UTC").dt.tz_localize(None)
+                values = naive_utc.to_numpy(dtype="datetime64[us]").view("int64")
+                values = values.copy()
+                values[~present] = 0
+            else:
+                dictionary = batch._dictionaries[i]
+                batch._columns[i] = array(
+                    "I",
+                    (
+                        dictionary.code(v) if set_ else 0
+                        for v, set_ in zip(series.astype(object).tolist(), present)
+                    ),
+                )
+                continue
+            batch._columns[i] = array("q", values.astype("int64").tobytes())
+        batch._length = len(df)
+        return batch
+
+    @classmethod
+    def concat(cls, batches):
+        """Rows of several batches that share fields and constants, in order."""
+        batches = list(batches)
+        batch = batches[0].new_like()
+        for i, dictionary in enumerate(batch._dictionaries):
+            for part in batches:
+                codes = part._columns[i]
+                if dictionary is not None:
+                    remap = [0] + [
+                        dictionary.code(v) for v in part._dictionaries[i].values[1:]
+                    ]
+                    codes = array("I", (remap[c] for c in codes))
+                batch._columns[i].extend(codes)
+                batch._masks[i].extend(part._masks[i])
+        batch._length = sum(len(part) for part in batches)
+        return batch
+
+    def take(self, indices):
+        """New batch with the rows at `indices`, in that order."""
+        batch = self.new_like()
+        for i, (column, mask) in enumerate(zip(self._columns, self._masks)):
+            batch._columns[i] = array(column.typecode, (column[j] for j in indices))
+            batch._masks[i] = bytearray(mask[j] for j in indices)
+            if self._dictionaries[i] is not None:
+                batch._dictionaries[i] = self._dictionaries[i]
+        batch._encoded = None
+        batch._length = len(indices)
+        return batch
+
+    def column(self, field):
+        """Values of `field` row by row, None for unset cells."""
+        if field in self.constants:
+            return repeat(self.constants[field], self._length)
+        i = self._index[field]
+        column, mask = self._columns[i], self._masks[i]
+        if self._dictionaries[i] is not None:
+            values = self._dictionaries[i].values
+            return (values[code] for code in column)
+        if self.kinds[field] == KIND_DATETIME:
+            return (_from_micros(v) if m else None for v, m in zip(column, mask))
+        return (v if m else None for v, m in zip(column, mask))
+
+    def keys(self, key_fields):
+        """Key tuple of every row."""
+        return list(zip(*(self.column(f) for f in key_fields)))
+
+    def value(self, i, field):
+        """Cell `i` of `field`, None when unset."""
+        if field in self.constants:
+            return self.constants[field]
+        j = self._index[field]
+        if not self._masks[j][i]:
+            return None
+        value = self._columns[j][i]
+        if self._dictionaries[j] is not None:
+            return self._dictionaries[j].values[value]
+        if self.kinds[field] == KIND_DATETIME:
+            return _from_micros(value)
+        return value
+
+    def row(self, i):
+        """Row `i` as a dict of its constants and set cells."""
+        row = dict(self.constants)
+        for field, mask in zip(self.fields, self._masks):
+            if mask[i]:
+                row[field] = self.value(i, field)
+        return row
+
+    def group_by_shape(self):
+        """Row indices grouped by the frozenset of fields each row carries."""
+        if not self.fields:
+            return {frozenset(self.constants): list(range(self._length))}
+        groups = {}
+        for i, flags in enumerate(zip(*self._masks)):
+            groups.setdefault(flags, []).append(i)
+        return {
+            frozenset(self.constants).union(
+                f for f, flag in zip(self.fields, flags) if flag
+            ): indices
+            for flags, indices in groups.items()
+        }
@@ -1,7 +1,7 @@
 from django.db import transaction
 
 from .models import FilesUploaded
-from .tasks import process_file
+from .tasks import enqueue_process_file
 
 
 def run_process_file(file_upload_id: int = None, instance: FilesUploaded = None):
@@ -11,16 +11,4 @@ def run_process_file(file_upload_id: int = None, instance: FilesUploaded = None)
         except FilesUploaded.DoesNotExist:
             return
     if instance:
-        uploaded_by_id = getattr(instance, "uploaded_by", None)
-        device_source = getattr(instance, "device_source", None)
-
-        def _enqueue():
-            process_file.apply_async(
-                args=(instance.pk,),
-                kwargs={
-                    "_uploaded_by_id": uploaded_by_id,
-                    "_device_source": device_source,
-                },
-            )
-
-        transaction.on_commit(_enqueue)
+        transaction.on_commit(lambda: enqueue_process_file(instance, group=True))
@@ -1,41 +1,377 @@
-from celery import shared_task
+from datetime import timedelta
 
+from celery import chord, shared_task
+from celery.signals import task_failure, task_success
+from django.conf import settings
+from django.db.models import Case, F, IntegerField, Q, Value, When
+from django.utils.timezone import now
+from redis import RedisError
 
-from .models import FilesUploaded, AllowToLoadData
-from .utils import CHOICES_FUNCTION_PROCESS
+from apps.wardriving.tasks import request_bi_refresh
 
+from .models import FilesUploaded, AllowToLoadData, ProcessingStatus
+from .routing import (
+    SHARDED_TASKS,
+    queue_depths,
+    release_shard,
+    spread_queues,
+    task_file_pk,
+)
+from .utils import (
+    CHOICES_FUNCTION_PROCESS,
+    IngestProgress,
+    can_process_together,
+    chunk_checkpoint_path,
+    clear_file_chunks,
+    parse_file_chunk,
+    plan_file_chunks,
+    process_files_together,
+    redis_client,
+    upsert_file_chunks,
+)
+
+
+def _group_key(uploaded_by, device_source):
+    return f"ingest-group:{uploaded_by}:{device_source}"
+
+
+def _join_file_group(file_obj):
+    """
+    Micro-batching of small uploads (INGEST_GROUP_*): the first small file
+    of an (uploaded_by, device_source) pair schedules process_file_group
+    INGEST_GROUP_WINDOW seconds later; files arriving meanwhile are picked
+    up by that same task. False when the file must go on its own.
+    """
+    window = settings.INGEST_GROUP_WINDOW
+    if window <= 0 or not can_process_together(file_obj.device_source):
+        return False
+    if file_obj.source.size > settings.INGEST_GROUP_MAX_BYTES:
+        return False
+    try:
+        opened = redis_client.set(
+            _group_key(file_obj.uploaded_by, file_obj.device_source),
+            file_obj.pk,
+            nx=True,
+            ex=window + 60,
+        )
+    except RedisError:
+        return False
+    if opened:
+        _schedule_file_group(file_obj, countdown=window)
+    return True
+
+
+def _schedule_file_group(file_obj, countdown=None):
+    process_file_group.apply_async(
+        kwargs={
+            "file_pk": file_obj.pk,
+            "_uploaded_by_id": file_obj.uploaded_by,
+            "_device_source": file_obj.device_source,
+        },
+        countdown=countdown,
+    )
 
+
+def enqueue_process_file(file_obj, group=False):
+    """Queue a file; `group` lets a small upload wait for its siblings."""
+    if group and _join_file_group(file_obj):
+        return
+    process_file.apply_async(
+        args=(file_obj.pk,),
+        kwargs={
+            "_uploaded_by_id": file_obj.uploaded_by,
+            "_device_source": file_obj.device_source,
+        },
+    )
+
+
+def _file_processed(file_obj, new_added, updated, ignored):
+    total = new_added + updated + ignored
+    file_obj.set_status(ProcessingStatus.DONE)
+    if new_added or updated:
+        request_bi_refresh()
+    return f"File {file_obj.pk} - {file_obj} processed successfully. Total of records in file {total}, Total new records {new_added}, Total updated found records {updated}, Total ignored {ignored}"
+
+
+# No autoretry: the file is marked failed and drain_file_backlog requeues it
+# (up to INGEST_MAX_ATTEMPTS), so a backoff retry can't race a drain requeue
 @shared_task(
     bind=True,
     acks_late=True,
-    autoretry_for=(Exception,),
-    retry_backoff=True,
-    retry_jitter=True,
-    max_retries=5,
     reject_on_worker_lost=True,
 )
 def process_file(self, file_pk, _uploaded_by_id=None, _device_source=None):
     if not AllowToLoadData.objects.filter(active=True).exists():
+        # Stays pending, drain_file_backlog requeues it once loading is back
         return "Data loading is currently disabled."
-    try:
-        file_obj = FilesUploaded.objects.get(pk=file_pk, is_procesed=False)
-    except FilesUploaded.DoesNotExist:
-        return f"File with pk={file_pk} does not exist or is already processed."
+    # Redelivered by acks_late after a lost worker: the file is still running
+    # under this same task, so it resumes now instead of after the timeout
+    redelivered = bool((self.request.delivery_info or {}).get("redelivered"))
+    file_obj = FilesUploaded.claim(file_pk, redelivered=redelivered)
+    if file_obj is None:
+        # A running file keeps its shard lease until its own task is done
+        self.request.shard_handed_off = FilesUploaded.objects.filter(
+            pk=file_pk, status=ProcessingStatus.RUNNING
+        ).exists()
+        return f"File with pk={file_pk} does not exist, is already processed or is running."
     device_source = file_obj.device_source
     class_process_function = CHOICES_FUNCTION_PROCESS.get(device_source, None)
 
     if not class_process_function:
-        return f"No processing function found for source: {device_source}"
+        message = f"No processing function found for source: {device_source}"
+        file_obj.set_status(ProcessingStatus.FAILED, message)
+        return message
     try:
         file_path = file_obj.source.path
+        # A file partly committed by a lost attempt resumes sequentially
+        resuming = bool(file_obj.ingest_offset)
+        chunks = [] if resuming else plan_file_chunks(file_path, device_source)
+        if chunks:
+            _dispatch_file_chunks(file_obj, chunks, _uploaded_by_id, _device_source)
+            # The uploader keeps its shard until merge_file_chunks is done
+            self.request.shard_handed_off = True
+            return f"File {file_pk} - {file_obj} split in {len(chunks)} chunks."
         new_added, updated, ignored = class_process_function(
             file_path=file_path,
             device_source=device_source,
             uploaded_by=file_obj.uploaded_by,
+            progress=IngestProgress(
+                file_obj.ingest_offset,
+                file_obj.ingest_line,
+                save=file_obj.save_ingest_progress,
+            ),
+        )
+        return _file_processed(file_obj, new_added, updated, ignored)
+    except Exception as e:
+        # Recorded for drain_file_backlog, raised so the task shows as failed
+        file_obj.set_status(ProcessingStatus.FAILED, str(e))
+        raise
+
+
+def _dispatch_file_chunks(file_obj, chunks, uploaded_by_id, device_source):
+    """
+    Fan-out/fan-in: one process_file_chunk per byte range, spread over the
+    least loaded proc_N queues, then merge_file_chunks on the uploader's
+    shard. Chunks already checkpointed by an earlier attempt return at once.
+    """
+    file_path = file_obj.source.path
+    header = [
+        process_file_chunk.s(
+            file_path,
+            file_obj.device_source,
+            file_obj.uploaded_by,
+            start,
+            end,
+            chunk_checkpoint_path(file_obj.pk, start, end),
+        ).set(queue=queue, routing_key=queue)
+        for (start, end), queue in zip(chunks, spread_queues(len(chunks)))
+    ]
+    file_kwargs = {
+        "file_pk": file_obj.pk,
+        "_uploaded_by_id": uploaded_by_id,
+        "_device_source": device_source,
+    }
+    # A chunk out of retries skips the merge: the errback fails the file
+    chord(header)(
+        merge_file_chunks.s(**file_kwargs).on_error(fail_file_chunks.s(**file_kwargs))
+    )
+
+
+@shared_task(
+    bind=True,
+    acks_late=True,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    retry_jitter=True,
+    max_retries=5,
+    reject_on_worker_lost=True,
+)
+def process_file_chunk(
+    self, file_path, device_source, uploaded_by, start, end, checkpoint
+):
+    # Parse only: the rows reach the DB in merge_file_chunks
+    return parse_file_chunk(
+        file_path, device_source, uploaded_by, start, end, checkpoint
+    )
+
+
+@shared_task(
+    bind=True,
+    acks_late=True,
+    reject_on_worker_lost=True,
+)
+def merge_file_chunks(
+    self, checkpoints, file_pk=None, _uploaded_by_id=None, _device_source=None
+):
+    file_obj = (
+        FilesUploaded.objects.filter(pk=file_pk)
+        .exclude(status=ProcessingStatus.DONE)
+        .first()
+    )
+    if file_obj is None:
+        clear_file_chunks(file_pk)
+        return f"File with pk={file_pk} does not exist or is already processed."
+    try:
+        new_added, updated, ignored = upsert_file_chunks(checkpoints)
+    except Exception as e:
+        file_obj.set_status(ProcessingStatus.FAILED, str(e))
+        raise
+    message = _file_processed(file_obj, new_added, updated, ignored)
+    clear_file_chunks(file_pk)
+    return message
+
+
+@shared_task
+def fail_file_chunks(
+    request, exc, traceback, file_pk=None, _uploaded_by_id=None, _device_source=None
+):
+    """
+    Errback of the chord: mark the file failed for drain_file_backlog, give
+    back the shard handed off by process_file and drop the checkpoints.
+    """
+    FilesUploaded.set_status_of([file_pk], ProcessingStatus.FAILED, str(exc))
+    release_shard(_uploaded_by_id, file_pk)
+    clear_file_chunks(file_pk)
+
+
+@shared_task(
+    bind=True,
+    acks_late=True,
+    reject_on_worker_lost=True,
+)
+def process_file_group(self, file_pk=None, _uploaded_by_id=None, _device_source=None):
+    """
+    Process the waiting small files of one (uploaded_by, device_source) at
+    once: one parse pass per file, then a single dedupe and upsert, so the
+    connection, existing-row lookup and transaction are paid once.
+    """
+    if not AllowToLoadData.objects.filter(active=True).exists():
+        return "Data loading is currently disabled."
+    try:
+        # Uploads from now on open the next group
+        redis_client.delete(_group_key(_uploaded_by_id, _device_source))
+    except RedisError:
+        pass
+
+    waiting = FilesUploaded.objects.filter(
+        uploaded_by=_uploaded_by_id,
+        device_source=_device_source,
+        status__in=[ProcessingStatus.PENDING, ProcessingStatus.FAILED],
+        attempts__lt=settings.INGEST_MAX_ATTEMPTS,
+    ).order_by("pk")
+    max_files = settings.INGEST_GROUP_MAX_FILES
+    # Bigger files (e.g. left pending by a pause) keep their own task
+    small = [
+        f
+        for f in waiting[: 4 * max_files]
+        if f.source.size <= settings.INGEST_GROUP_MAX_BYTES
+    ]
+    pks = [f.pk for f in small[:max_files]]
+    FilesUploaded.objects.filter(
+        pk__in=pks,
+        status__in=[ProcessingStatus.PENDING, ProcessingStatus.FAILED],
+    ).update(
+        status=ProcessingStatus.RUNNING,
+        attempts=F("attempts") + 1,
+        status_updated_at=now(),
+    )
+    files = list(
+        FilesUploaded.objects.filter(
+            pk__in=pks, status=ProcessingStatus.RUNNING
+        ).order_by("pk")
+    )
+    if not files:
+        return "No files waiting."
+    pks = [f.pk for f in files]
+
+    try:
+        new_added, updated, ignored = process_files_together(
+            [f.source.path for f in files], _device_source, _uploaded_by_id
         )
-        total = new_added + updated + ignored
-        file_obj.is_procesed = True
-        file_obj.save()
-        return f"File {file_pk} - {file_obj} processed successfully. Total of records in file {total}, Total new records {new_added}, Total updated found records {updated}, Total ignored {ignored}"
     except Exception as e:
-        return f"Error while processing file {file_pk}: {str(e)}"
+        FilesUploaded.set_status_of(pks, ProcessingStatus.FAILED, str(e))
+        raise
+    FilesUploaded.set_status_of(pks, ProcessingStatus.DONE)
+    if new_added or updated:
+        request_bi_refresh()
+    if len(small) > max_files:
+        _schedule_file_group(small[max_files])
+    total = new_added + updated + ignored
+    return f"Files {pks} processed together. Total of records in files {total}, Total new records {new_added}, Total updated found records {updated}, Total ignored {ignored}"
+
+
+def _file_backlog():
+    """
+    Files to requeue, in priority order: never processed first, then failed
+    ones with the fewest attempts, then those lost while running; oldest
+    first within each. Files touched recently are still queued.
+    """
+    stamp = now()
+    stale = stamp - timedelta(seconds=settings.INGEST_DRAIN_STALE_SECONDS)
+    lost = stamp - timedelta(seconds=settings.INGEST_RUNNING_TIMEOUT)
+    return (
+        FilesUploaded.objects.filter(
+            Q(status=ProcessingStatus.PENDING, status_updated_at__lt=stale)
+            | Q(
+                status=ProcessingStatus.FAILED,
+                status_updated_at__lt=stale,
+                attempts__lt=settings.INGEST_MAX_ATTEMPTS,
+            )
+            | Q(status=ProcessingStatus.RUNNING, status_updated_at__lt=lost)
+        )
+        .annotate(
+            backlog_rank=Case(
+                When(status=ProcessingStatus.PENDING, then=Value(0)),
+                When(status=ProcessingStatus.FAILED, then=Value(1)),
+                default=Value(2),
+                output_field=IntegerField(),
+            )
+        )
+        .order_by("backlog_rank", "attempts", "status_updated_at", "pk")
+    )
+
+
+@shared_task
+def drain_file_backlog():
+    """
+    Celery beat: requeue pending, failed and lost files, keeping the proc_N
+    queues fed up to INGEST_DRAIN_QUEUE_LIMIT messages, so a paused backlog
+    is caught up in one sustained pass once AllowToLoadData is active again.
+    """
+    if not AllowToLoadData.objects.filter(active=True).exists():
+        return "Data loading is currently disabled."
+    room = settings.INGEST_DRAIN_BATCH
+    depths = queue_depths()
+    if depths:
+        room = min(room, settings.INGEST_DRAIN_QUEUE_LIMIT - sum(depths.values()))
+    if room <= 0:
+        return "Shard queues are full."
+
+    files = list(_file_backlog()[:room])
+    # Touched now so the next runs don't queue them twice
+    FilesUploaded.objects.filter(pk__in=[f.pk for f in files]).update(
+        status_updated_at=now()
+    )
+    for file_obj in files:
+        enqueue_process_file(file_obj)
+    return f"Requeued {len(files)} files."
+
+
+def _release_file_shard(task, args, kwargs):
+    if task is None or task.name.rsplit(".", 1)[-1] not in SHARDED_TASKS:
+        return
+    args, kwargs = args or (), kwargs or {}
+    release_shard(kwargs.get("_uploaded_by_id"), task_file_pk(args, kwargs))
+
+
+@task_success.connect
+def _release_shard_on_success(sender=None, **kwargs):
+    request = sender.request if sender is not None else None
+    if request is not None and not getattr(request, "shard_handed_off", False):
+        _release_file_shard(sender, request.args, request.kwargs)
+
+
+@task_failure.connect
+def _release_shard_on_failure(sender=None, args=None, kwargs=None, **extra):
+    # Sent once the task gives up (process_file_chunk: after its retries)
+    _release_file_shard(sender, args, kwargs)
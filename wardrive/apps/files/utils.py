@@ -1,19 +1,55 @@
+import csv
+import logging
+import os
+import pickle
 import re
+import shutil
+import time
 from decimal import Decimal
 from datetime import datetime
-from functools import reduce
+from functools import lru_cache, reduce
 from operator import or_ as OR
 from contextlib import contextmanager
+from io import BytesIO, StringIO
 
-from pandas import read_csv, to_datetime, isna, notna, to_numeric, DataFrame
+from billiard import get_context
+from numpy import trunc
+from pandas import read_csv, to_datetime, isna, notna, to_numeric, DataFrame, Series
 from redis import Redis
 
-from django.db import transaction
-from django.db.models import Q
-from django.utils.timezone import make_aware, now, is_naive
+from django.db import connection, connections, transaction
+from django.db.models import DateTimeField, IntegerField, Q, UniqueConstraint
+from django.db.models.expressions import RawSQL
+from django.db.models.sql.query import Query
+from django.utils.timezone import (
+    make_aware,
+    now,
+    is_naive,
+    get_current_timezone,
+    get_current_timezone_name,
+)
 from django.conf import settings
 
-from apps.wardriving.models import Wardriving, SourceDevice, LTEWardriving
+from apps.vendors.oui_index import get_oui_index
+from apps.wardriving.models import (
+    MAX_LATITUDE,
+    MAX_LONGITUDE,
+    MICRO_DEGREES,
+    LTEWardriving,
+    SourceDevice,
+    Wardriving,
+    degrees_to_e6,
+    mac_to_oui,
+)
+from apps.wardriving.rollups import (
+    apply_rollup_delta,
+    lock_rollup_writers,
+    rollup_counts,
+)
+
+from .row_batch import KIND_DATETIME, KIND_INT, RowBatch
+
+logger = logging.getLogger(__name__)
 
 
 # -----------------------------
@@ -68,18 +104,52 @@ def _build_q(keys, key_fields):
     return reduce(lambda a, b: a | b, ors)
 
 
-def _dedupe_keep_best(rows, key_fields, better_row_fn):
+def _key_match_q(model, keys, key_fields):
     """
-    rows: list[dict] (incluyen las key_fields)
-    better_row_fn(new_row, cur_row) -> bool
+    Q matching the rows of any of `keys`. On Postgres the keys travel as one
+    array per key field joined through unnest(), so the statement and its
+    plan keep the same shape whatever the number of keys; other backends
+    fall back to the OR of Q terms.
     """
-    by_key = {}
-    for r in rows:
-        k = tuple(r.get(f) for f in key_fields)
-        cur = by_key.get(k)
-        if cur is None or better_row_fn(r, cur):
-            by_key[k] = r
-    return by_key
+    if connection.vendor != "postgresql" or not keys:
+        return _build_q(keys, key_fields)
+    qn = connection.ops.quote_name
+    fields = [model._meta.get_field(f) for f in key_fields]
+    arrays = ", ".join(f"%s::{f.db_type(connection)}[]" for f in fields)
+    aliases = ", ".join(f"k{i}" for i in range(len(fields)))
+    match = " AND ".join(f"t.{qn(f.column)} = k.k{i}" for i, f in enumerate(fields))
+    sql = (
+        f"SELECT t.{qn(model._meta.pk.column)} FROM {qn(model._meta.db_table)} t "
+        f"JOIN unnest({arrays}) AS k({aliases}) ON {match}"
+    )
+    params = [list(column) for column in zip(*keys)]
+    return Q(pk__in=RawSQL(sql, params))
+
+
+def _dedupe_keep_best(batch, key_fields, better_row_fn):
+    """
+    batch: RowBatch (incluye las key_fields)
+    better_row_fn(new_row, cur_row) -> bool, only called (with row dicts)
+    for repeated keys; the default RSSI rule reads the rssi column directly.
+    Returns a RowBatch with the best row per key, in first-seen key order.
+    """
+    best = {}
+    if better_row_fn is default_better_row_fn and "rssi" in batch:
+        rssi = list(batch.column("rssi"))
+        for i, k in enumerate(batch.keys(key_fields)):
+            cur = best.get(k)
+            if (
+                cur is None
+                or rssi[cur] is None
+                or (rssi[i] is not None and rssi[i] > rssi[cur])
+            ):
+                best[k] = i
+    else:
+        for i, k in enumerate(batch.keys(key_fields)):
+            cur = best.get(k)
+            if cur is None or better_row_fn(batch.row(i), batch.row(cur)):
+                best[k] = i
+    return batch.take(list(best.values()))
 
 
 def default_better_row_fn(new_row, cur_row):
@@ -114,33 +184,191 @@ def wardriving_better_obj_fn(new_row, old_obj):
     return (orssi is None) or (nrssi > orssi)
 
 
+# SQL twin of wardriving_better_obj_fn for the SQL engines: {old} is the
+# stored row and {new} the incoming one
+WARDRIVING_BETTER_SQL = (
+    "(COALESCE({old}.latitude_e6, 0) = 0"
+    " AND COALESCE({old}.longitude_e6, 0) = 0)"
+    " OR ({new}.rssi IS NOT NULL"
+    " AND ({old}.rssi IS NULL OR {new}.rssi > {old}.rssi))"
+)
+
+# Loaded by the ORM engine to compare against (wardriving_better_obj_fn)
+WARDRIVING_ONLY_FIELDS = [
+    "id",
+    "uploaded_by",
+    "mac",
+    "channel",
+    "rssi",
+    "latitude_e6",
+    "longitude_e6",
+]
+
+UPSERT_ENGINE_ORM = "orm"
+UPSERT_ENGINE_ON_CONFLICT = "on_conflict"
+UPSERT_ENGINE_COPY = "copy"
+
+# Outcome of a key after an upsert, used to merge totals across streamed chunks
+UPSERT_CREATED = "created"
+UPSERT_UPDATED = "updated"
+UPSERT_IGNORED = "ignored"
+
+# Rows parsed before each dedupe + upsert round when streaming a file
+STREAM_CHUNK_ROWS = 10000
+
+
+def _merge_outcome(previous, current):
+    """
+    A key created by an earlier chunk stays created, and an update from any
+    chunk wins over ignored, so streamed totals match a single upsert.
+    """
+    if previous is None or previous == UPSERT_IGNORED:
+        return current
+    return previous
+
+
+def _iter_row_batches(rows, size):
+    """RowBatch items pass through; row dicts are grouped `size` at a time."""
+    pending = []
+    for item in rows:
+        if isinstance(item, RowBatch):
+            if pending:
+                yield RowBatch.from_rows(pending)
+                pending = []
+            yield item
+            continue
+        pending.append(item)
+        if len(pending) >= size:
+            yield RowBatch.from_rows(pending)
+            pending = []
+    if pending:
+        yield RowBatch.from_rows(pending)
+
+
+def _row_batch_kinds(model, fields):
+    """RowBatch column kind of each of `fields` from its model field."""
+    kinds = {}
+    for name in fields:
+        field = model._meta.get_field(name)
+        if field.is_relation:
+            field = field.target_field
+        if isinstance(field, IntegerField):
+            kinds[name] = KIND_INT
+        elif isinstance(field, DateTimeField):
+            kinds[name] = KIND_DATETIME
+    return kinds
+
+
+def _new_row_batch(model, fields, **constants):
+    return RowBatch(fields, _row_batch_kinds(model, fields), constants)
+
+
 @transaction.atomic
 def bulk_upsert_by_keys(
     *,
     model,
     key_fields,  # e.g. ['uploaded_by','mac','channel']
-    rows,  # list[dict]
+    rows,  # RowBatch or list[dict]
     better_obj_fn,  # (new_row:dict, old_obj:model)->bool
     better_row_fn=default_better_row_fn,
     update_fields=None,  # list[str]
     only_fields=None,  # list[str]
     base_filter=None,  # dict
     chunk_size=1000,
+    key_outcomes=None,  # dict[key, outcome], filled when given
+    engine=None,  # UPSERT_ENGINE_*, default settings.INGEST_UPSERT_ENGINE
 ):
     if not rows:
         return 0, 0, 0
 
     update_fields = update_fields or []
+    if not isinstance(rows, RowBatch):
+        rows = RowBatch.from_rows(rows)
 
     # 1) Deduplicación en memoria: mejor candidato por clave
-    best_by_key = _dedupe_keep_best(rows, key_fields, better_row_fn)
-    keys = list(best_by_key.keys())
+    best = _dedupe_keep_best(rows, key_fields, better_row_fn)
+    keys = best.keys(key_fields)
+
+    # BI rollups (D02-D06) move by what this batch changes: rows of these keys
+    # after the upsert minus before it, inside the same transaction
+    rollup_before = None
+    if model is Wardriving:
+        lock_rollup_writers(key[key_fields.index("uploaded_by")] for key in keys)
+        rollup_before = _rollup_counts_for_keys(model, keys, key_fields, chunk_size)
+
+    created, updated, ignored = _upsert_best_by_key(
+        model=model,
+        key_fields=key_fields,
+        best=best,
+        keys=keys,
+        better_obj_fn=better_obj_fn,
+        update_fields=update_fields,
+        only_fields=only_fields,
+        base_filter=base_filter,
+        chunk_size=chunk_size,
+        key_outcomes=key_outcomes,
+        engine=engine,
+    )
+
+    if rollup_before is not None and (created or updated):
+        apply_rollup_delta(
+            rollup_before,
+            _rollup_counts_for_keys(model, keys, key_fields, chunk_size),
+        )
+    return created, updated, ignored
+
+
+def _rollup_counts_for_keys(model, keys, key_fields, chunk_size):
+    return rollup_counts(
+        *(
+            model.objects.filter(
+                _key_match_q(model, keys[i : i + chunk_size], key_fields)
+            )
+            for i in range(0, len(keys), chunk_size)
+        )
+    )
+
+
+def _upsert_best_by_key(
+    *,
+    model,
+    key_fields,
+    best,
+    keys,
+    better_obj_fn,
+    update_fields,
+    only_fields,
+    base_filter,
+    chunk_size,
+    key_outcomes,
+    engine,
+):
+    engine = _resolve_upsert_engine(model, key_fields, better_obj_fn, engine)
+    if engine == UPSERT_ENGINE_ON_CONFLICT:
+        return _on_conflict_upsert(
+            model=model,
+            key_fields=key_fields,
+            best=best,
+            keys=keys,
+            update_fields=update_fields,
+            chunk_size=chunk_size,
+            key_outcomes=key_outcomes,
+        )
+    if engine == UPSERT_ENGINE_COPY:
+        return _copy_upsert(
+            model=model,
+            key_fields=key_fields,
+            best=best,
+            keys=keys,
+            update_fields=update_fields,
+            key_outcomes=key_outcomes,
+        )
 
     # 2) Leer existentes en 1..N queries
     existing = {}
     for i in range(0, len(keys), chunk_size):
         batch = keys[i : i + chunk_size]
-        cond = _build_q(batch, key_fields)
+        cond = _key_match_q(model, batch, key_fields)
         qs = model.objects.filter(cond)
         if base_filter:
             qs = qs.filter(**base_filter)
@@ -154,16 +382,23 @@ def bulk_upsert_by_keys(
     to_create = []
     to_update = []
 
-    for k, row in best_by_key.items():
+    for i, k in enumerate(keys):
+        # Row dicts only exist here, one per deduped row
+        row = best.row(i)
         obj = existing.get(k)
         if obj is None:
             to_create.append(model(**row))
+            outcome = UPSERT_CREATED
+        elif better_obj_fn(row, obj):
+            for f in update_fields:
+                if f in row and row[f] is not None:
+                    setattr(obj, f, row[f])
+            to_update.append(obj)
+            outcome = UPSERT_UPDATED
         else:
-            if better_obj_fn(row, obj):
-                for f in update_fields:
-                    if f in row and row[f] is not None:
-                        setattr(obj, f, row[f])
-                to_update.append(obj)
+            outcome = UPSERT_IGNORED
+        if key_outcomes is not None:
+            key_outcomes[k] = _merge_outcome(key_outcomes.get(k), outcome)
 
     # 4) Ejecutar en bulk
     created = updated = 0
@@ -174,7 +409,332 @@ def bulk_upsert_by_keys(
         model.objects.bulk_update(to_update, update_fields, batch_size=1000)
         updated = len(to_update)
 
-    ignored = max(0, len(best_by_key) - (created + updated))
+    ignored = max(0, len(keys) - (created + updated))
+    return created, updated, ignored
+
+
+# -----------------------------
+# Postgres native upsert (INSERT ... ON CONFLICT DO UPDATE)
+# -----------------------------
+
+
+def _insert_fields(model):
+    # Columns the SQL engines write: no pk, no database-generated columns
+    return [
+        f for f in model._meta.concrete_fields if not f.primary_key and not f.generated
+    ]
+
+
+def _conflict_constraint(model, key_fields):
+    """UniqueConstraint of `model` over exactly `key_fields`, or None."""
+    for constraint in model._meta.constraints:
+        if isinstance(constraint, UniqueConstraint) and list(constraint.fields) == list(
+            key_fields
+        ):
+            return constraint
+    return None
+
+
+def _resolve_upsert_engine(model, key_fields, better_obj_fn, engine=None):
+    """
+    The SQL engines need Postgres and the Wardriving "better" rule (mirrored
+    in WARDRIVING_BETTER_SQL); ON CONFLICT also needs a unique constraint
+    over the key. Anything else goes through the ORM engine.
+    """
+    engine = engine or settings.INGEST_UPSERT_ENGINE
+    if engine == UPSERT_ENGINE_ORM:
+        return UPSERT_ENGINE_ORM
+    if (
+        connection.vendor != "postgresql"
+        or better_obj_fn is not wardriving_better_obj_fn
+    ):
+        return UPSERT_ENGINE_ORM
+    if (
+        engine == UPSERT_ENGINE_ON_CONFLICT
+        and _conflict_constraint(model, key_fields) is None
+    ):
+        return UPSERT_ENGINE_ORM
+    return engine
+
+
+def _constraint_condition_sql(model, constraint):
+    if constraint.condition is None:
+        return "", []
+    query = Query(model=model, alias_cols=False)
+    where = query.build_where(constraint.condition)
+    compiler = query.get_compiler(connection=connection)
+    sql, params = where.as_sql(compiler, connection)
+    return f" WHERE {sql}", list(params)
+
+
+def _db_prep_columns(model, fields, best):
+    """
+    Per insert field, the database value of every row of `best`: the cell
+    when set, else the model default (auto_now fields always get the stamp).
+    """
+    blank = model()
+    prepared = []
+    for f in fields:
+        default = f.get_db_prep_save(f.pre_save(blank, True), connection)
+        auto = getattr(f, "auto_now", False) or getattr(f, "auto_now_add", False)
+        if auto or f.attname not in best:
+            prepared.append([default] * len(best))
+            continue
+        prepared.append(
+            [
+                default if v is None else f.get_db_prep_save(v, connection)
+                for v in best.column(f.attname)
+            ]
+        )
+    return prepared
+
+
+def _on_conflict_upsert(
+    *, model, key_fields, best, keys, update_fields, chunk_size, key_outcomes
+):
+    """
+    One INSERT ... ON CONFLICT DO UPDATE ... WHERE <better> per batch.
+    RETURNING (xmax = 0) tells inserted rows from updated ones; rows the
+    WHERE rejects are not returned and count as ignored.
+    """
+    qn = connection.ops.quote_name
+    table = qn(model._meta.db_table)
+    fields = _insert_fields(model)
+    key_columns = [model._meta.get_field(f).column for f in key_fields]
+    target = ", ".join(qn(c) for c in key_columns)
+    cond_sql, cond_params = _constraint_condition_sql(
+        model, _conflict_constraint(model, key_fields)
+    )
+    better_sql = WARDRIVING_BETTER_SQL.format(old=table, new="EXCLUDED")
+
+    prepared = _db_prep_columns(model, fields, best)
+
+    # Rows are grouped by the fields they carry, so a field missing from a
+    # row (unset cell) never overwrites the stored value
+    created = updated = 0
+    with connection.cursor() as cursor:
+        for shape, indices in best.group_by_shape().items():
+            set_columns = [
+                model._meta.get_field(f).column for f in update_fields if f in shape
+            ]
+            set_columns.append(model._meta.get_field("updated_at").column)
+            assignments = ", ".join(f"{qn(c)} = EXCLUDED.{qn(c)}" for c in set_columns)
+            placeholder = "(" + ", ".join(["%s"] * len(fields)) + ")"
+
+            for i in range(0, len(indices), chunk_size):
+                batch = indices[i : i + chunk_size]
+                params = [column[j] for j in batch for column in prepared]
+                cursor.execute(
+                    f"INSERT INTO {table} ({', '.join(qn(f.column) for f in fields)}) "
+                    f"VALUES {', '.join([placeholder] * len(batch))} "
+                    f"ON CONFLICT ({target}){cond_sql} "
+                    f"DO UPDATE SET {assignments} WHERE {better_sql} "
+                    f"RETURNING (xmax = 0), {', '.join(qn(c) for c in key_columns)}",
+                    params + cond_params,
+                )
+                for inserted, *key in cursor.fetchall():
+                    if inserted:
+                        created += 1
+                    else:
+                        updated += 1
+                    if key_outcomes is not None:
+                        k = tuple(key)
+                        outcome = UPSERT_CREATED if inserted else UPSERT_UPDATED
+                        key_outcomes[k] = _merge_outcome(key_outcomes.get(k), outcome)
+
+    if key_outcomes is not None:
+        for k in keys:
+            key_outcomes.setdefault(k, UPSERT_IGNORED)
+
+    ignored = max(0, len(keys) - (created + updated))
+    return created, updated, ignored
+
+
+# -----------------------------
+# COPY staging-table loader (COPY FROM STDIN + one set-based merge)
+# -----------------------------
+
+
+def _copy_literal(value):
+    # Quoted values are never NULL in COPY csv, only the bare \N marker is
+    if value is None:
+        return "\\N"
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def _copy_upsert(*, model, key_fields, best, keys, update_fields, key_outcomes):
+    """
+    Stream the deduped rows into a temporary staging table with COPY and
+    merge them with a single statement: an UPDATE of the alive rows the
+    staging row beats (WARDRIVING_BETTER_SQL) and an INSERT of unknown keys.
+    Fields missing from a row are NULL in staging, so the UPDATE keeps the
+    stored value and the INSERT falls back to the model default.
+    """
+    qn = connection.ops.quote_name
+    table = qn(model._meta.db_table)
+    staging = qn(f"staging_{model._meta.db_table}")
+    fields = _insert_fields(model)
+    columns = [qn(f.column) for f in fields]
+    key_columns = [qn(model._meta.get_field(f).column) for f in key_fields]
+    set_columns = [qn(model._meta.get_field(f).column) for f in update_fields]
+    updated_at = qn(model._meta.get_field("updated_at").column)
+
+    # Defaults (and auto_now values) for fields a row does not carry
+    blank = model()
+    defaults = [f.get_db_prep_save(f.pre_save(blank, True), connection) for f in fields]
+    auto_fields = {
+        f.name
+        for f in fields
+        if getattr(f, "auto_now", False) or getattr(f, "auto_now_add", False)
+    }
+
+    # COPY csv text column by column, then joined row by row
+    literals = []
+    for f, default in zip(fields, defaults):
+        if f.name in auto_fields:
+            literals.append([_copy_literal(default)] * len(best))
+        elif f.attname in best:
+            literals.append(
+                [
+                    _copy_literal(
+                        None
+                        if v is None
+                        else f.get_db_prep_save(f.to_python(v), connection)
+                    )
+                    for v in best.column(f.attname)
+                ]
+            )
+        else:
+            literals.append([_copy_literal(None)] * len(best))
+    buffer = StringIO()
+    buffer.writelines(",".join(values) + "\n" for values in zip(*literals))
+    buffer.seek(0)
+
+    key_match = " AND ".join(f"t.{c} = s.{c}" for c in key_columns)
+    better_sql = WARDRIVING_BETTER_SQL.format(old="t", new="s")
+    assignments = ", ".join(f"{c} = COALESCE(s.{c}, t.{c})" for c in set_columns)
+    assignments = ", ".join(
+        filter(None, [assignments, f"{updated_at} = s.{updated_at}"])
+    )
+    insert_values = ", ".join(f"COALESCE(s.{c}, %s)" for c in columns)
+    returned_keys = ", ".join(key_columns)
+
+    with connection.cursor() as cursor:
+        started = time.perf_counter()
+        cursor.execute(f"DROP TABLE IF EXISTS {staging}")
+        cursor.execute(
+            f"CREATE TEMP TABLE {staging} AS "
+            f"SELECT {', '.join(columns)} FROM {table} WITH NO DATA"
+        )
+        cursor.cursor.copy_expert(
+            f"COPY {staging} ({', '.join(columns)}) FROM STDIN "
+            f"WITH (FORMAT csv, NULL '\\N')",
+            buffer,
+        )
+        copied_at = time.perf_counter()
+
+        cursor.execute(
+            f"""
+            WITH upd AS (
+                UPDATE {table} t SET {assignments}
+                FROM {staging} s
+                WHERE {key_match} AND t.deleted_at IS NULL AND ({better_sql})
+                RETURNING {', '.join(f't.{c}' for c in key_columns)}
+            ), ins AS (
+                INSERT INTO {table} ({', '.join(columns)})
+                SELECT {insert_values} FROM {staging} s
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM {table} t
+                    WHERE {key_match} AND t.deleted_at IS NULL
+                )
+                ON CONFLICT DO NOTHING
+                RETURNING {returned_keys}
+            )
+            SELECT FALSE, {returned_keys} FROM upd
+            UNION ALL
+            SELECT TRUE, {returned_keys} FROM ins
+            """,
+            defaults,
+        )
+        merged = cursor.fetchall()
+        cursor.execute(f"DROP TABLE {staging}")
+        merged_at = time.perf_counter()
+
+    created = updated = 0
+    for inserted, *key in merged:
+        if inserted:
+            created += 1
+        else:
+            updated += 1
+        if key_outcomes is not None:
+            k = tuple(key)
+            outcome = UPSERT_CREATED if inserted else UPSERT_UPDATED
+            key_outcomes[k] = _merge_outcome(key_outcomes.get(k), outcome)
+    if key_outcomes is not None:
+        for k in keys:
+            key_outcomes.setdefault(k, UPSERT_IGNORED)
+
+    total = len(keys)
+    logger.info(
+        "COPY upsert %s: %d rows, copy %.0f rows/s, merge %.0f rows/s",
+        model._meta.db_table,
+        total,
+        total / max(copied_at - started, 1e-9),
+        total / max(merged_at - copied_at, 1e-9),
+    )
+    ignored = max(0, total - (created + updated))
+    return created, updated, ignored
+
+
+class IngestProgress:
+    """
+    Position of the next unread line of a file (byte `offset` and `line`
+    number), advanced by the readers as they consume lines. `save` is called
+    with (offset, line) inside the transaction of each committed batch, so
+    the stored position never runs ahead of the stored rows.
+    """
+
+    def __init__(self, offset=0, line=0, save=None):
+        self.offset = offset
+        self.line = line
+        self._save = save
+
+    def advance(self, offset, lines):
+        self.offset = offset
+        self.line += lines
+
+    def checkpoint(self):
+        if self._save is not None:
+            self._save(self.offset, self.line)
+
+
+def bulk_upsert_stream(
+    *, rows, chunk_rows=STREAM_CHUNK_ROWS, checkpoint=None, **upsert_kwargs
+):
+    """
+    Same contract as bulk_upsert_by_keys but `rows` may be any iterable
+    (usually a generator) of RowBatch, as the parsers yield them, or of row
+    dicts. Each RowBatch (or `chunk_rows` dicts) is deduped, upserted and
+    committed on its own, so only one batch plus the per-key outcomes stays
+    in memory and row locks last one batch. `checkpoint()` runs in the
+    transaction of every batch (IngestProgress.checkpoint). Replaying a
+    batch is harmless: a stored row is only replaced by a better one.
+    """
+    key_outcomes = {}
+    for batch in _iter_row_batches(rows, chunk_rows):
+        with transaction.atomic():
+            bulk_upsert_by_keys(rows=batch, key_outcomes=key_outcomes, **upsert_kwargs)
+            if checkpoint is not None:
+                checkpoint()
+
+    created = updated = ignored = 0
+    for outcome in key_outcomes.values():
+        if outcome == UPSERT_CREATED:
+            created += 1
+        elif outcome == UPSERT_UPDATED:
+            updated += 1
+        else:
+            ignored += 1
     return created, updated, ignored
 
 
@@ -228,26 +788,44 @@ _SKIP_CONTAINS = (
 )
 
 
+def _is_marauder_noise(s: str) -> bool:
+    """Same as _should_skip_marauder_line for an already stripped line."""
+    if not s or s.startswith("#"):
+        return True
+    return any(x in s for x in _SKIP_CONTAINS)
+
+
 def _should_skip_marauder_line(line: str) -> bool:
     """Return True if the line is metadata/noise and should not be parsed."""
     if not line:
         return True
-    s = line.strip()
-    if not s or s.startswith("#"):
-        return True
-    return any(x in s for x in _SKIP_CONTAINS)
+    return _is_marauder_noise(line.strip())
 
 
-def _parse_dt_aware(s: str):
-    """Parse 'YYYY-MM-DD HH:MM:SS' into a timezone-aware datetime; return None on failure."""
-    if not s:
-        return None
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+@lru_cache(maxsize=8192)
+def _cached_dt_aware(s, tz):
+    # Devices log the same second for every network of a scan, so each
+    # distinct (timestamp, timezone) is parsed once
     try:
-        return make_aware(datetime.strptime(s.strip(), "%Y-%m-%d %H:%M:%S"))
+        return make_aware(datetime.strptime(s, TIMESTAMP_FORMAT), tz)
     except Exception:
         return None
 
 
+def _parse_dt_aware(s: str, tz=None):
+    """
+    Parse 'YYYY-MM-DD HH:MM:SS' into a timezone-aware datetime (current
+    timezone unless `tz`); return None on failure. Line loops should pass
+    `tz` so the current timezone is looked up once per file.
+    """
+    if not s:
+        return None
+    return _cached_dt_aware(s.strip(), tz or get_current_timezone())
+
+
 def _to_int(s: str):
     """Convert string to int; return None when empty/invalid."""
     if s is None:
@@ -297,6 +875,10 @@ def _parse_marauder_ble_line(line: str):
     m = LINE_RE_FLIPPER_BLE.match(line.strip())
     if not m:
         return None
+    return _normalize_ble_groups(m.groups())
+
+
+def _normalize_ble_groups(groups):
     # groups: (device_name, mac, extra, auth_mode, first_seen, channel, rssi, lat, lon, alt, acc, data_type)
     (
         device_name,
@@ -311,7 +893,7 @@ def _parse_marauder_ble_line(line: str):
         alt,
         acc,
         data_type,
-    ) = m.groups()
+    ) = groups
 
     # Normalize to the common tuple (use device_name as "ssid" field downstream)
     ssid_or_name = (device_name or "").strip() or None
@@ -330,26 +912,53 @@ def _parse_marauder_ble_line(line: str):
     )
 
 
+def _parse_marauder_line(line: str):
+    """
+    Parse a mixed Marauder line (BLE or WiFi) with a single regex scan.
+    The trailing technology token picks the grammar, and WiFi lines must
+    also start with the "N |" index, so no line is stripped or matched twice.
+    """
+    if not line:
+        return None
+    s = line.strip()
+    if s.endswith("WIFI"):
+        # Index may come after a ">" prompt, e.g. "> 12 | aa:bb:..."
+        if not s.lstrip("> \t")[:1].isdigit() or _is_marauder_noise(s):
+            return None
+        m = LINE_RE_FLIPPER_WIFI.match(s)
+        return m.groups() if m else None
+    if s.endswith("BLE"):
+        if _is_marauder_noise(s):
+            return None
+        m = LINE_RE_FLIPPER_BLE.match(s)
+        return _normalize_ble_groups(m.groups()) if m else None
+    return None
+
+
 # -----------------------------
 # Core processor (single source of truth)
 # -----------------------------
 
 
-def _process_format_flipper_marauder_core(
-    lines,
-    parser_fn,
-    device_source,
-    uploaded_by,
+def _iter_marauder_batches(
+    lines, parser_fn, device_source, uploaded_by, batch_rows=STREAM_CHUNK_ROWS
 ):
     """
-    Core processing loop:
+    Lazily turn Marauder lines into RowBatches of Wardriving rows
+    (WARDRIVING_ROW_FIELDS), `batch_rows` rows each:
     - Parse each line via parser_fn
     - Normalize types (datetime/int/Decimal)
     - Apply minimal validation rules
-    - Bulk upsert into Wardriving
+    - Stamp the vendor id from the OUI index (when it has been built)
     """
-    rows = []
-
+    oui_index = get_oui_index()
+    tz = get_current_timezone()
+    batch = _new_row_batch(
+        Wardriving,
+        WARDRIVING_ROW_FIELDS,
+        uploaded_by=uploaded_by,
+        device_source=device_source,
+    )
     for line in lines:
         g = parser_fn(line)
         if not g:
@@ -374,12 +983,12 @@ def _process_format_flipper_marauder_core(
         auth_mode = (auth_mode or "").strip() or None
         data_type = (data_type or "").strip() or None
 
-        first_seen = _parse_dt_aware(first_seen)
+        first_seen = _parse_dt_aware(first_seen, tz)
 
         channel = _to_int(channel)
         rssi = _to_int(rssi)
-        lat = _to_dec(lat)
-        lon = _to_dec(lon)
+        lat = degrees_to_e6(lat, MAX_LATITUDE)
+        lon = degrees_to_e6(lon, MAX_LONGITUDE)
         alt = _to_dec(alt)
         acc = _to_dec(acc)
 
@@ -393,44 +1002,61 @@ def _process_format_flipper_marauder_core(
         if lat == 0 and lon == 0:
             continue
 
-        row = {
-            "uploaded_by": uploaded_by,
-            "mac": mac,
-            "channel": channel,
-            "ssid": ssid_or_name,  # For BLE we store device_name here to reuse the same model
-            "auth_mode": auth_mode,
-            "first_seen": first_seen,
-            "current_latitude": lat,
-            "current_longitude": lon,
-            "altitude_meters": alt,
-            "accuracy_meters": acc,
-            "type": data_type,  # WIFI or BLE
-            "rssi": rssi,
-            "device_source": device_source,
-        }
-
-        # Remove None values so we don't overwrite existing DB fields with nulls
-        row = {k: v for k, v in row.items() if v is not None}
-        rows.append(row)
-
-    return bulk_upsert_by_keys(
+        # None cells stay unset so we don't overwrite existing DB fields with nulls
+        batch.append(
+            (
+                mac,
+                mac_to_oui(mac),
+                oui_index.lookup(mac) if oui_index else None,
+                channel,
+                ssid_or_name,  # For BLE we store device_name here to reuse the same model
+                auth_mode,
+                first_seen,
+                lat,
+                lon,
+                alt,
+                acc,
+                data_type,  # WIFI or BLE
+                rssi,
+            )
+        )
+        if len(batch) >= batch_rows:
+            yield batch
+            batch = batch.new_like()
+    if len(batch):
+        yield batch
+
+
+def _process_format_flipper_marauder_core(
+    lines,
+    parser_fn,
+    device_source,
+    uploaded_by,
+    checkpoint=None,
+):
+    """
+    Core processing loop: batches from _iter_marauder_batches are streamed
+    into Wardriving, so `lines` can be a generator over a huge file.
+    """
+    return bulk_upsert_stream(
         model=Wardriving,
         key_fields=["uploaded_by", "mac", "channel"],
-        rows=rows,
+        rows=_iter_marauder_batches(lines, parser_fn, device_source, uploaded_by),
+        checkpoint=checkpoint,
         better_obj_fn=wardriving_better_obj_fn,
         update_fields=[
             "ssid",
             "auth_mode",
             "first_seen",
-            "current_latitude",
-            "current_longitude",
+            "latitude_e6",
+            "longitude_e6",
             "altitude_meters",
             "accuracy_meters",
             "type",
             "rssi",
             "device_source",
         ],
-        only_fields=["id", "uploaded_by", "mac", "channel", "rssi"],
+        only_fields=WARDRIVING_ONLY_FIELDS,
         chunk_size=1000,
     )
 
@@ -444,6 +1070,7 @@ def process_format_flipper_marauder_wifi(
     lines=list(),
     device_source=SourceDevice.FLIPPER_DEV_BOARD,
     uploaded_by="Without Owner",
+    checkpoint=None,
 ):
     """Process Marauder Flipper-format WiFi lines."""
     return _process_format_flipper_marauder_core(
@@ -451,6 +1078,7 @@ def process_format_flipper_marauder_wifi(
         parser_fn=_parse_marauder_wifi_line,
         device_source=device_source,
         uploaded_by=uploaded_by,
+        checkpoint=checkpoint,
     )
 
 
@@ -458,6 +1086,7 @@ def process_format_flipper_marauder_ble(
     lines=list(),
     device_source=SourceDevice.FLIPPER_DEV_BOARD,
     uploaded_by="Without Owner",
+    checkpoint=None,
 ):
     """Process Marauder Flipper-format BLE lines."""
     return _process_format_flipper_marauder_core(
@@ -465,6 +1094,7 @@ def process_format_flipper_marauder_ble(
         parser_fn=_parse_marauder_ble_line,
         device_source=device_source,
         uploaded_by=uploaded_by,
+        checkpoint=checkpoint,
     )
 
 
@@ -474,31 +1104,34 @@ def process_format_flipper_marauder(
     lines=list(),
     device_source=SourceDevice.FLIPPER_DEV_BOARD,
     uploaded_by="Without Owner",
+    checkpoint=None,
 ):
     """
     Process mixed Marauder output (BLE + WiFi).
-    Tries BLE first (many BLE lines do not have the numeric index), then WiFi.
+    Each line is routed to the BLE or WiFi grammar by _parse_marauder_line.
     """
-
-    def _auto_parser(line: str):
-        return _parse_marauder_ble_line(line) or _parse_marauder_wifi_line(line)
-
     return _process_format_flipper_marauder_core(
         lines=lines,
-        parser_fn=_auto_parser,
+        parser_fn=_parse_marauder_line,
         device_source=device_source,
         uploaded_by=uploaded_by,
+        checkpoint=checkpoint,
     )
 
 
 # Process some files with structure from project Marauder ESP32 in classic format (without index and can process as CSV)
 # Source to project firmware: https://github.com/justcallmekoko/ESP32Marauder/
-def process_format_classic_marauder(
-    lines=list(),
-    device_source=SourceDevice.MARAUDER_V6,
-    uploaded_by="Without Owner",
+def _iter_classic_marauder_batches(
+    lines, device_source, uploaded_by, batch_rows=STREAM_CHUNK_ROWS
 ):
-    rows = []
+    oui_index = get_oui_index()
+    tz = get_current_timezone()
+    batch = _new_row_batch(
+        Wardriving,
+        WARDRIVING_ROW_FIELDS,
+        uploaded_by=uploaded_by,
+        device_source=device_source,
+    )
     for line in lines:
         if line.startswith("#") or "stopscan" in line or "Starting Wardrive" in line:
             continue
@@ -533,119 +1166,520 @@ def process_format_classic_marauder(
         ) = m.groups()
 
         ssid = ssid or None
-        if first_seen:
-            try:
-                first_seen = make_aware(
-                    datetime.strptime(first_seen, "%Y-%m-%d %H:%M:%S")
-                )
-            except Exception:
-                first_seen = None
-        if isinstance(first_seen, str):
-            first_seen = None
+        first_seen = _parse_dt_aware(first_seen, tz)
 
         try:
             channel = int(channel) if channel and channel.isdigit() else None
             rssi = int(rssi) if rssi not in (None, "") else None
-            lat = Decimal(lat) if lat else None
-            lon = Decimal(lon) if lon else None
+            lat_e6 = degrees_to_e6(lat, MAX_LATITUDE) if lat else None
+            lon_e6 = degrees_to_e6(lon, MAX_LONGITUDE) if lon else None
             alt = Decimal(alt) if alt else None
             acc = Decimal(acc) if acc else None
         except Exception:
             continue
+        # Unparseable coordinates drop the row, as before
+        if (lat and lat_e6 is None) or (lon and lon_e6 is None):
+            continue
+        lat, lon = lat_e6, lon_e6
 
         if channel is None:
             continue
         if lat == 0 and lon == 0:
             continue
 
-        row = {
-            "uploaded_by": uploaded_by,
-            "mac": mac,
-            "channel": channel,
-            "ssid": ssid,
-            "auth_mode": auth_mode,
-            "first_seen": first_seen,
-            "current_latitude": lat,
-            "current_longitude": lon,
-            "altitude_meters": alt,
-            "accuracy_meters": acc,
-            "type": data_type,
-            "rssi": rssi,
-            "device_source": device_source,
-        }
-        row = {k: v for k, v in row.items() if v is not None}
-        rows.append(row)
-
-    return bulk_upsert_by_keys(
+        batch.append(
+            (
+                mac,
+                mac_to_oui(mac),
+                oui_index.lookup(mac) if oui_index else None,
+                channel,
+                ssid,
+                auth_mode,
+                first_seen,
+                lat,
+                lon,
+                alt,
+                acc,
+                data_type,
+                rssi,
+            )
+        )
+        if len(batch) >= batch_rows:
+            yield batch
+            batch = batch.new_like()
+    if len(batch):
+        yield batch
+
+
+def process_format_classic_marauder(
+    lines=list(),
+    device_source=SourceDevice.MARAUDER_V6,
+    uploaded_by="Without Owner",
+    checkpoint=None,
+):
+    return bulk_upsert_stream(
         model=Wardriving,
         key_fields=["uploaded_by", "mac", "channel"],
-        rows=rows,
+        rows=_iter_classic_marauder_batches(lines, device_source, uploaded_by),
+        checkpoint=checkpoint,
+        better_obj_fn=wardriving_better_obj_fn,
+        update_fields=[
+            "ssid",
+            "auth_mode",
+            "first_seen",
+            "latitude_e6",
+            "longitude_e6",
+            "altitude_meters",
+            "accuracy_meters",
+            "type",
+            "rssi",
+            "device_source",
+        ],
+        only_fields=WARDRIVING_ONLY_FIELDS,
+        chunk_size=1000,
+    )
+
+
+# Per-row fields of a Wardriving RowBatch, in the order parsers append them;
+# uploaded_by and device_source are batch constants
+WARDRIVING_ROW_FIELDS = [
+    "mac",
+    "oui",
+    "vendor_id",
+    "channel",
+    "ssid",
+    "auth_mode",
+    "first_seen",
+    "latitude_e6",
+    "longitude_e6",
+    "altitude_meters",
+    "accuracy_meters",
+    "type",
+    "rssi",
+]
+
+
+LTE_WARDRIVING_ROW_FIELDS = [
+    "tech",
+    "mcc",
+    "mnc",
+    "lac",
+    "cell_id",
+    "first_seen",
+    "rssi",
+    "rsrp",
+    "rsrq",
+    "sinr",
+    "band",
+    "provider",
+    "longitude_e6",
+    "latitude_e6",
+]
+
+
+def _localize_datetimes(series):
+    """Column version of make_aware: naive values take the current timezone."""
+    if series.dt.tz is not None:
+        return series
+    tz_name = get_current_timezone_name()
+    localized = series.dt.tz_localize(tz_name, ambiguous="NaT", nonexistent="NaT")
+    edge = localized.isna() & series.notna()
+    if edge.any():
+        # Local times repeated or skipped by a DST change go through the same
+        # make_aware as the line parsers, so both paths store the same instant
+        tz = get_current_timezone()
+        fixed = series[edge].map(lambda value: make_aware(value.to_pydatetime(), tz))
+        localized = localized.where(
+            ~edge, to_datetime(fixed, utc=True).dt.tz_convert(tz_name)
+        )
+    return localized
+
+
+def _parse_datetimes(values):
+    """
+    Column version of _parse_dt_aware: TIMESTAMP_FORMAT values are parsed in
+    one vectorized pass; only the ones it rejects go through pandas' per-value
+    inference, as the whole column did before.
+    """
+    parsed = to_datetime(values, format=TIMESTAMP_FORMAT, errors="coerce")
+    retry = parsed.isna() & values.notna()
+    if retry.any():
+        parsed = parsed.where(~retry, to_datetime(values[retry], errors="coerce"))
+    return _localize_datetimes(parsed)
+
+
+def _frame_coordinates(df):
+    """
+    Column version of degrees_to_e6: current_latitude/current_longitude
+    (degrees) -> latitude_e6/longitude_e6, null when missing or invalid.
+    """
+    for source, target, limit in (
+        ("current_latitude", "latitude_e6", MAX_LATITUDE),
+        ("current_longitude", "longitude_e6", MAX_LONGITUDE),
+    ):
+        if source in df:
+            e6 = (to_numeric(df[source], errors="coerce") * MICRO_DEGREES).round()
+            df[target] = e6.where(e6.abs() <= limit * MICRO_DEGREES).astype("Int64")
+
+
+def _frame_oui(macs):
+    """Column version of mac_to_oui."""
+    oui = macs.astype(str).str.replace(r"[^0-9A-Fa-f]", "", regex=True).str[:6]
+    return oui.str.upper().where(oui.str.len() == 6, "")
+
+
+def _frame_vendor_ids(macs):
+    """Column version of the per-row vendor stamp (all null without an index)."""
+    oui_index = get_oui_index()
+    if oui_index is None:
+        return Series(index=macs.index, dtype="Int64")
+    return oui_index.lookup_many(macs)
+
+
+def _iter_frame_batches(df, model, fields, batch_rows=STREAM_CHUNK_ROWS, **constants):
+    """
+    Cut an already normalized DataFrame into RowBatches of `fields`, column
+    by column. Null cells stay unset so they don't overwrite existing DB
+    fields; `constants` are the values every row shares.
+    """
+    kinds = _row_batch_kinds(model, [f for f in fields if f in df])
+    for start in range(0, len(df), batch_rows):
+        yield RowBatch.from_frame(
+            df.iloc[start : start + batch_rows], fields, kinds, constants
+        )
+
+
+def _iter_file_lines(file_path, start=0, end=None, progress=None):
+    """
+    Yield the lines of a file one at a time. Each line is decoded as UTF-8
+    and falls back to latin-1 on its own, so the file is never fully loaded.
+    With `start`/`end` only the lines of that byte range are read; `start`
+    must be the beginning of a line. `progress` (IngestProgress) moves past
+    each line as it is read.
+    """
+    with open(file_path, "rb") as file:
+        file.seek(start)
+        offset = start
+        while end is None or offset < end:
+            raw = file.readline()
+            if not raw:
+                break
+            offset += len(raw)
+            if progress is not None:
+                progress.advance(offset, 1)
+            try:
+                yield raw.decode("utf-8")
+            except UnicodeDecodeError:
+                yield raw.decode("latin-1")
+
+
+# -----------------------------
+# Parallel parsing of one file (byte ranges over a process pool)
+# -----------------------------
+
+
+def _count_quotes(file, start, end, block=1024 * 1024):
+    file.seek(start)
+    quotes = 0
+    while start < end:
+        data = file.read(min(block, end - start))
+        if not data:
+            break
+        quotes += data.count(b'"')
+        start += len(data)
+    return quotes
+
+
+def _split_line_ranges(file_path, parts, start=0, quoted=False):
+    """
+    Split [start, EOF) into at most `parts` byte ranges whose boundaries fall
+    on line starts, so each range can be parsed on its own. With `quoted`
+    (CSV) a boundary also needs an even number of '"' before it, so a quoted
+    field spanning lines is never cut ("" escapes keep the count even).
+    """
+    size = os.path.getsize(file_path)
+    step = max(1, (size - start) // max(1, parts))
+    bounds = [start]
+    quotes, counted = 0, start
+    with open(file_path, "rb") as file:
+        for i in range(1, parts):
+            pos = max(start + i * step, bounds[-1] + 1)
+            if pos >= size:
+                break
+            # Finish the line that crosses `pos`, next line starts the range
+            file.seek(pos - 1)
+            file.readline()
+            pos = file.tell()
+            while quoted and pos < size:
+                quotes += _count_quotes(file, counted, pos)
+                counted = pos
+                if quotes % 2 == 0:
+                    break
+                # Inside a quoted field: try the next line start
+                file.seek(pos)
+                file.readline()
+                pos = file.tell()
+            if pos >= size:
+                break
+            bounds.append(pos)
+    bounds.append(size)
+    return [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+
+def _best_rows_in_range(
+    parse_range_fn, file_path, start, end, device_source, uploaded_by
+):
+    """
+    Pool worker: parse one byte range and keep the best row per key, as one
+    RowBatch (pickled back column by column), or None when nothing parsed.
+    """
+    key_fields = ["uploaded_by", "mac", "channel"]
+    parts = [
+        _dedupe_keep_best(batch, key_fields, default_better_row_fn)
+        for batch in parse_range_fn(file_path, start, end, device_source, uploaded_by)
+    ]
+    if not parts:
+        return None
+    return _dedupe_keep_best(RowBatch.concat(parts), key_fields, default_better_row_fn)
+
+
+def _use_parallel_parse(file_path, workers):
+    return (
+        workers > 1 and os.path.getsize(file_path) >= settings.INGEST_PARALLEL_MIN_BYTES
+    )
+
+
+def _process_file_parallel(
+    file_path,
+    device_source,
+    uploaded_by,
+    parse_range_fn,
+    workers,
+    data_start=0,
+    quoted=False,
+):
+    """
+    Parse a file split in line-aligned byte ranges across a process pool.
+    Partial results are concatenated in file order and upserted once; the
+    upsert dedupe keeps the best RSSI per key, so ties resolve like a
+    sequential pass.
+    """
+    ranges = _split_line_ranges(file_path, workers, start=data_start, quoted=quoted)
+
+    # Forked workers only parse; they must not inherit open DB sockets
+    connections.close_all()
+    # billiard, not concurrent.futures: a prefork celery child is daemonic and
+    # multiprocessing refuses to fork children from it
+    with get_context("fork").Pool(processes=min(workers, len(ranges)) or 1) as pool:
+        parts = pool.starmap(
+            _best_rows_in_range,
+            [
+                (parse_range_fn, file_path, start, end, device_source, uploaded_by)
+                for start, end in ranges
+            ],
+        )
+    return _upsert_best_parts(parts)
+
+
+def _upsert_best_parts(parts):
+    """
+    Upsert the per-range RowBatch results (None for empty ranges) as one
+    deduped set, committed STREAM_CHUNK_ROWS keys at a time.
+    """
+    parts = [part for part in parts if part is not None]
+    if not parts:
+        return 0, 0, 0
+
+    key_fields = ["uploaded_by", "mac", "channel"]
+    best = _dedupe_keep_best(RowBatch.concat(parts), key_fields, default_better_row_fn)
+    return bulk_upsert_stream(
+        model=Wardriving,
+        key_fields=key_fields,
+        rows=(
+            best.take(range(i, min(i + STREAM_CHUNK_ROWS, len(best))))
+            for i in range(0, len(best), STREAM_CHUNK_ROWS)
+        ),
         better_obj_fn=wardriving_better_obj_fn,
         update_fields=[
             "ssid",
             "auth_mode",
             "first_seen",
-            "current_latitude",
-            "current_longitude",
+            "latitude_e6",
+            "longitude_e6",
             "altitude_meters",
             "accuracy_meters",
             "type",
             "rssi",
             "device_source",
         ],
-        only_fields=["id", "uploaded_by", "mac", "channel", "rssi"],
+        only_fields=WARDRIVING_ONLY_FIELDS,
         chunk_size=1000,
     )
 
 
+# -----------------------------
+# Celery fan-out helpers: chunks of one big file (chord) and groups of
+# small files of one uploader (process_file_group), see tasks.py
+# -----------------------------
+
+
+def _range_parser(device_source):
+    """(parse_range_fn, data_start) of a source parsed by byte ranges."""
+    if device_source == SourceDevice.MININO:
+        return _parse_minino_range, _minino_data_offset
+    if CHOICES_FUNCTION_PROCESS.get(device_source) is process_file_marauder_esp32:
+        return _parse_marauder_range, None
+    return None
+
+
+def can_process_together(device_source):
+    return _range_parser(device_source) is not None
+
+
+def process_files_together(file_paths, device_source, uploaded_by):
+    """
+    Parse several files of one uploader and device and upsert them as one
+    set: a single dedupe pass and a single upsert for the whole group.
+    Files are concatenated in the given order, so ties resolve like
+    processing them one after the other.
+    """
+    parse_range_fn, data_start = _range_parser(device_source)
+    parts = [
+        _best_rows_in_range(
+            parse_range_fn,
+            file_path,
+            data_start(file_path) if data_start else 0,
+            os.path.getsize(file_path),
+            device_source,
+            uploaded_by,
+        )
+        for file_path in file_paths
+    ]
+    return _upsert_best_parts(parts)
+
+
+def plan_file_chunks(file_path, device_source, chunks=None):
+    """
+    Line-aligned (start, end) byte ranges of a file big enough to be split
+    across chunk tasks (INGEST_CHUNKED_*), or [] to process it in one task.
+    """
+    chunks = settings.INGEST_CHUNKED_CHUNKS if chunks is None else chunks
+    parser = _range_parser(device_source)
+    if chunks < 2 or parser is None:
+        return []
+    if os.path.getsize(file_path) < settings.INGEST_CHUNKED_MIN_BYTES:
+        return []
+    _, data_start = parser
+    start = data_start(file_path) if data_start else 0
+    # Only Minino files are CSV (quoted fields); Marauder lines are not
+    return _split_line_ranges(
+        file_path, chunks, start=start, quoted=device_source == SourceDevice.MININO
+    )
+
+
+def _chunk_dir(file_pk):
+    return os.path.join(settings.INGEST_CHUNK_DIR, str(file_pk))
+
+
+def chunk_checkpoint_path(file_pk, start, end):
+    return os.path.join(_chunk_dir(file_pk), f"{start}-{end}.pkl")
+
+
+def parse_file_chunk(file_path, device_source, uploaded_by, start, end, checkpoint):
+    """
+    Parse one byte range into its best row per key and save it to
+    `checkpoint`. A checkpoint left by an earlier attempt is reused, so a
+    retried file only parses the chunks that did not finish.
+    """
+    if os.path.exists(checkpoint):
+        return checkpoint
+    parse_range_fn, _ = _range_parser(device_source)
+    best = _best_rows_in_range(
+        parse_range_fn, file_path, start, end, device_source, uploaded_by
+    )
+    os.makedirs(os.path.dirname(checkpoint), exist_ok=True)
+    # Written aside and renamed, a checkpoint is either complete or missing
+    partial = f"{checkpoint}.{os.getpid()}.tmp"
+    with open(partial, "wb") as file:
+        pickle.dump(best, file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(partial, checkpoint)
+    return checkpoint
+
+
+def upsert_file_chunks(checkpoints):
+    """Merge the chunk checkpoints in file order and upsert them at once."""
+    parts = []
+    for checkpoint in checkpoints:
+        with open(checkpoint, "rb") as file:
+            parts.append(pickle.load(file))
+    return _upsert_best_parts(parts)
+
+
+def clear_file_chunks(file_pk):
+    shutil.rmtree(_chunk_dir(file_pk), ignore_errors=True)
+
+
 # -----------------------------
 # General function for Marauder/Flipper
 # -----------------------------
 # Entry point for processing Marauder ESP32 files
 # Header example of file
 # mac,ssid,auth_mode,first_seen,channel,rssi,lat,lon,alt,acc,scan_device_type
+MARAUDER_FLIPPER_SOURCES = (
+    SourceDevice.FLIPPER_DEV_BOARD,
+    SourceDevice.FLIPPER_DEV_BOARD_PRO,
+    SourceDevice.KIISU,
+)
+
+
+def _parse_marauder_range(file_path, start, end, device_source, uploaded_by):
+    lines = _iter_file_lines(file_path, start, end)
+    if device_source in MARAUDER_FLIPPER_SOURCES:
+        return _iter_marauder_batches(
+            lines, _parse_marauder_line, device_source, uploaded_by
+        )
+    return _iter_classic_marauder_batches(lines, device_source, uploaded_by)
+
+
 def process_file_marauder_esp32(
     file_path="",
     device_source=SourceDevice.FLIPPER_DEV_BOARD,
     uploaded_by="Without Owner",
+    parse_workers=None,
+    progress=None,
 ):
-    try:
-        with open(file_path, "r", encoding="utf-8") as file:
-            lines = file.readlines()
-    except UnicodeDecodeError:
-        with open(file_path, "r", encoding="latin-1") as file:
-            lines = file.readlines()
+    """
+    `progress` (IngestProgress) is where a previous attempt stopped; the
+    sequential pass resumes there and commits its position with each batch.
+    The parallel pass parses the whole file and upserts it in one go.
+    """
+    workers = parse_workers or settings.INGEST_PARSE_WORKERS
+    progress = progress or IngestProgress()
+    if not progress.offset and _use_parallel_parse(file_path, workers):
+        return _process_file_parallel(
+            file_path, device_source, uploaded_by, _parse_marauder_range, workers
+        )
+
+    lines = _iter_file_lines(file_path, start=progress.offset, progress=progress)
 
     esp32_classess_process = {
-        SourceDevice.FLIPPER_DEV_BOARD: process_format_flipper_marauder,
-        SourceDevice.FLIPPER_DEV_BOARD_PRO: process_format_flipper_marauder,
-        SourceDevice.KIISU: process_format_flipper_marauder,
+        source: process_format_flipper_marauder for source in MARAUDER_FLIPPER_SOURCES
     }
     cls_process = esp32_classess_process.get(
         device_source, process_format_classic_marauder
     )
     return cls_process(
-        device_source=device_source, uploaded_by=uploaded_by, lines=lines
+        device_source=device_source,
+        uploaded_by=uploaded_by,
+        lines=lines,
+        checkpoint=progress.checkpoint,
     )
 
 
 # -----------------------------
 # Minino (Electronic Cats)
 # -----------------------------
-# Process some files with structure from project Minino
-# Source to project firmware: https://github.com/ElectronicCats/Minino
-# Header example of file
-# MAC,SSID,AuthMode,FirstSeen,Channel,Frequency,RSSI,CurrentLatitude,CurrentLongitude,AltitudeMeters,AccuracyMeters,RCOIs,MfgrId,Type
-def process_file_minino(
-    file_path="",
-    device_source=SourceDevice.MININO,
-    uploaded_by="Without Owner",
-):
-    try:
-        df = read_csv(file_path, encoding="utf-8", skiprows=1, on_bad_lines="skip")
-    except UnicodeDecodeError:
-        df = read_csv(file_path, encoding="latin-1", skiprows=1, on_bad_lines="skip")
-
+def _normalize_minino_frame(df):
     deleted_rows = ["Frequency", "RCOIs", "MfgrId"]
     renamed_headers = {
         "MAC": "mac",
@@ -664,87 +1698,158 @@ def process_file_minino(
     df = df.drop(columns=[col for col in deleted_rows if col in df.columns])
     df.rename(columns=renamed_headers, inplace=True)
 
-    # Normaliza first_seen
+    # Rows without key fields are discarded up front (null masks); an export
+    # missing the MAC or Channel column keeps no row, as the row loop did
+    for key in ("mac", "channel"):
+        if key not in df:
+            df[key] = None
+    df["channel"] = to_numeric(df["channel"], errors="coerce")
+    df = df[df["mac"].notna() & df["channel"].notna()].copy()
+    df["channel"] = df["channel"].astype("int64")
+
     if "first_seen" in df:
-        fs = to_datetime(df["first_seen"], errors="coerce")
-        # make_aware individual en loop por seguridad de tz
-        df["first_seen"] = fs
-
-    rows = []
-    for _, row in df.iterrows():
-        mac = row.get("mac")
-        channel = row.get("channel")
-        if isna(mac) or isna(channel):
-            continue
+        df["first_seen"] = _parse_datetimes(df["first_seen"])
+
+    # Empty texts do not overwrite stored values, except type defaults to WIFI
+    for col in ("ssid", "auth_mode", "type"):
+        if col in df:
+            df[col] = df[col].where(df[col].astype(str).str.len() > 0)
+    df["type"] = df["type"].fillna("WIFI") if "type" in df else "WIFI"
 
-        first_seen = row.get("first_seen")
-        if isna(first_seen):
-            first_seen = None
-        # pandas Timestamp -> datetime
-        elif hasattr(first_seen, "to_pydatetime"):
-            first_seen = first_seen.to_pydatetime()
-            if is_naive(first_seen):
-                first_seen = make_aware(first_seen)
-
-        # datetime normal
-        elif isinstance(first_seen, datetime):
-            if is_naive(first_seen):
-                first_seen = make_aware(first_seen)
-
-        rssi_val = int(row["rssi"]) if "rssi" in row and notna(row["rssi"]) else None
-
-        payload = {
-            "uploaded_by": uploaded_by,
-            "mac": mac,
-            "channel": int(channel),
-            "ssid": (row.get("ssid") or None),
-            "auth_mode": (row.get("auth_mode") or None),
-            "first_seen": first_seen,
-            "current_latitude": (
-                Decimal(row["current_latitude"])
-                if notna(row.get("current_latitude"))
-                else None
-            ),
-            "current_longitude": (
-                Decimal(row["current_longitude"])
-                if notna(row.get("current_longitude"))
-                else None
-            ),
-            "altitude_meters": (
-                Decimal(row["altitude_meters"])
-                if notna(row.get("altitude_meters"))
-                else None
-            ),
-            "accuracy_meters": (
-                Decimal(row["accuracy_meters"])
-                if notna(row.get("accuracy_meters"))
-                else None
-            ),
-            "type": (row.get("type") or "WIFI"),
-            "rssi": rssi_val,
-            "device_source": device_source,
-        }
-        payload = {k: v for k, v in payload.items() if v is not None}
-        rows.append(payload)
-
-    return bulk_upsert_by_keys(
+    numeric_cols = [
+        "rssi",
+        "altitude_meters",
+        "accuracy_meters",
+    ]
+    for col in numeric_cols:
+        if col in df:
+            df[col] = to_numeric(df[col], errors="coerce")
+    _frame_coordinates(df)
+    if "rssi" in df:
+        df["rssi"] = trunc(df["rssi"]).astype("Int64")
+
+    df["oui"] = _frame_oui(df["mac"])
+    df["vendor_id"] = _frame_vendor_ids(df["mac"])
+    return df
+
+
+def _read_minino_range(file_path, start, end):
+    with open(file_path, "rb") as file:
+        file.readline()  # device pre-header
+        header = file.readline()
+        file.seek(start)
+        return header, file.read(end - start)
+
+
+def _parse_minino_range(file_path, start, end, device_source, uploaded_by):
+    header, raw = _read_minino_range(file_path, start, end)
+    return _minino_batches(header, raw, device_source, uploaded_by)
+
+
+def _csv_header(header, encoding):
+    # csv, not split(","): header names may be quoted
+    return next(csv.reader(StringIO(header.decode(encoding))), [])
+
+
+def _minino_batches(header, raw, device_source, uploaded_by):
+    if not raw.strip():
+        return iter(())
+    try:
+        columns = _csv_header(header, "utf-8")
+        df = read_csv(
+            BytesIO(raw), names=columns, encoding="utf-8", on_bad_lines="skip"
+        )
+    except UnicodeDecodeError:
+        columns = _csv_header(header, "latin-1")
+        df = read_csv(
+            BytesIO(raw), names=columns, encoding="latin-1", on_bad_lines="skip"
+        )
+    return _iter_frame_batches(
+        _normalize_minino_frame(df),
+        Wardriving,
+        WARDRIVING_ROW_FIELDS,
+        uploaded_by=uploaded_by,
+        device_source=device_source,
+    )
+
+
+def _minino_data_offset(file_path):
+    # Data starts after the device pre-header and the column header
+    with open(file_path, "rb") as file:
+        file.readline()
+        file.readline()
+        return file.tell()
+
+
+# Bytes of Minino lines read into one DataFrame by the sequential pass
+MININO_RANGE_BYTES = 4 * 1024 * 1024
+
+
+def _iter_minino_batches(file_path, device_source, uploaded_by, progress):
+    """
+    Minino rows of the file from `progress` on, MININO_RANGE_BYTES of lines
+    per DataFrame. `progress` reaches the end of a range with its last batch,
+    so an interrupted file resumes at the start of a range.
+    """
+    data_start = _minino_data_offset(file_path)
+    if progress.offset < data_start:
+        progress.offset, progress.line = data_start, 2
+    size = os.path.getsize(file_path)
+    parts = max(1, -(-(size - progress.offset) // MININO_RANGE_BYTES))
+    ranges = _split_line_ranges(file_path, parts, start=progress.offset, quoted=True)
+    for start, end in ranges:
+        header, raw = _read_minino_range(file_path, start, end)
+        batches = list(_minino_batches(header, raw, device_source, uploaded_by))
+        last = batches.pop() if batches else None
+        yield from batches
+        progress.advance(end, raw.count(b"\n"))
+        if last is not None:
+            yield last
+
+
+# Process some files with structure from project Minino
+# Source to project firmware: https://github.com/ElectronicCats/Minino
+# Header example of file
+# MAC,SSID,AuthMode,FirstSeen,Channel,Frequency,RSSI,CurrentLatitude,CurrentLongitude,AltitudeMeters,AccuracyMeters,RCOIs,MfgrId,Type
+def process_file_minino(
+    file_path="",
+    device_source=SourceDevice.MININO,
+    uploaded_by="Without Owner",
+    parse_workers=None,
+    progress=None,
+):
+    workers = parse_workers or settings.INGEST_PARSE_WORKERS
+    progress = progress or IngestProgress()
+    if not progress.offset and _use_parallel_parse(file_path, workers):
+        return _process_file_parallel(
+            file_path,
+            device_source,
+            uploaded_by,
+            _parse_minino_range,
+            workers,
+            data_start=_minino_data_offset(file_path),
+            quoted=True,
+        )
+
+    return bulk_upsert_stream(
         model=Wardriving,
         key_fields=["uploaded_by", "mac", "channel"],
-        rows=rows,
+        rows=_iter_minino_batches(file_path, device_source, uploaded_by, progress),
+        checkpoint=progress.checkpoint,
         better_obj_fn=wardriving_better_obj_fn,
         update_fields=[
             "ssid",
             "auth_mode",
             "first_seen",
-            "current_latitude",
-            "current_longitude",
+            "latitude_e6",
+            "longitude_e6",
             "altitude_meters",
             "accuracy_meters",
             "type",
             "rssi",
             "device_source",
         ],
-        only_fields=["id", "uploaded_by", "mac", "channel", "rssi"],
+        only_fields=WARDRIVING_ONLY_FIELDS,
         chunk_size=1000,
     )
 
@@ -787,34 +1892,29 @@ def process_lte_wardriving(
     dataframe = dataframe.dropna(subset=["rssi"]).reset_index(drop=True)
     dataframe["rssi"] = dataframe["rssi"].astype(int)
 
-    dataframe["provider"] = dataframe["provider"].fillna("Not Provided")
-
-    rows = []
-    for instance_data in dataframe.to_dict(orient="records"):
-        if not instance_data.get("cell_id"):
-            continue
-        row = {
-            "uploaded_by": uploaded_by,
-            "device_source": device_source,
-            "tech": instance_data.get("tech"),
-            "mcc": instance_data.get("mcc"),
-            "mnc": instance_data.get("mnc"),
-            "lac": instance_data.get("lac"),
-            "cell_id": instance_data.get("cell_id"),
-            "first_seen": now(),
-            "rssi": instance_data.get("rssi"),
-            "rsrp": instance_data.get("rsrp"),
-            "rsrq": instance_data.get("rsrq"),
-            "sinr": instance_data.get("sinr"),
-            "band": instance_data.get("band"),
-            "provider": instance_data.get("provider") or "Not Provided",
-            "current_longitude": instance_data.get("current_longitude"),
-            "current_latitude": instance_data.get("current_latitude"),
-        }
-        row = {k: v for k, v in row.items() if v is not None}
-        rows.append(row)
-
-    return bulk_upsert_by_keys(
+    # Keys and counters as nullable ints; rows without a cell_id are dropped
+    # (all of them when the export has no CellID column)
+    for key in ["mcc", "mnc", "lac", "cell_id", "rsrp", "rsrq", "sinr"]:
+        if key in dataframe:
+            values = to_numeric(dataframe[key], errors="coerce")
+            dataframe[key] = trunc(values).astype("Int64")
+    if "cell_id" in dataframe:
+        dataframe = dataframe[dataframe["cell_id"].fillna(0) != 0].copy()
+    else:
+        dataframe = dataframe.iloc[0:0].copy()
+
+    if "tech" in dataframe:
+        dataframe["tech"] = dataframe["tech"].fillna("LTE")
+    else:
+        dataframe["tech"] = "LTE"
+    if "provider" in dataframe:
+        provider = dataframe["provider"]
+        dataframe["provider"] = provider.mask(provider == "").fillna("Not Provided")
+    else:
+        dataframe["provider"] = "Not Provided"
+    _frame_coordinates(dataframe)
+
+    return bulk_upsert_stream(
         model=LTEWardriving,
         key_fields=[
             "uploaded_by",
@@ -825,7 +1925,14 @@ def process_lte_wardriving(
             "lac",
             "cell_id",
         ],
-        rows=rows,
+        rows=_iter_frame_batches(
+            dataframe,
+            LTEWardriving,
+            LTE_WARDRIVING_ROW_FIELDS,
+            uploaded_by=uploaded_by,
+            device_source=device_source,
+            first_seen=now(),
+        ),
         better_obj_fn=wardriving_better_obj_fn,
         update_fields=[
             "first_seen",
@@ -835,8 +1942,8 @@ def process_lte_wardriving(
             "sinr",
             "band",
             "provider",
-            "current_longitude",
-            "current_latitude",
+            "longitude_e6",
+            "latitude_e6",
         ],
         only_fields=[
             "id",
@@ -848,6 +1955,8 @@ def process_lte_wardriving(
             "lac",
             "cell_id",
             "rssi",
+            "latitude_e6",
+            "longitude_e6",
         ],
         chunk_size=1000,
     )
@@ -884,42 +1993,40 @@ def process_wifi_rf_wardriving(
     dataframe = dataframe.dropna(subset=["rssi"]).reset_index(drop=True)
     dataframe["rssi"] = dataframe["rssi"].astype(int)
 
-    rows = []
-    for rec in dataframe.to_dict(orient="records"):
-        if rec.get("mac") is None or rec.get("channel") is None:
-            continue
-        row = {
-            "uploaded_by": uploaded_by,
-            "mac": rec["mac"],
-            "channel": int(rec["channel"]),
-            "ssid": rec.get("ssid"),
-            "auth_mode": rec.get("auth_mode"),
-            "first_seen": now(),
-            "current_latitude": rec.get("current_latitude"),
-            "current_longitude": rec.get("current_longitude"),
-            "rssi": rec.get("rssi"),
-            "device_source": device_source,
-            "type": "WIFI",
-        }
-        row = {k: v for k, v in row.items() if v is not None}
-        rows.append(row)
-
-    return bulk_upsert_by_keys(
+    dataframe["channel"] = to_numeric(dataframe["channel"], errors="coerce")
+    dataframe = dataframe[
+        dataframe["mac"].notna() & dataframe["channel"].notna()
+    ].copy()
+    dataframe["channel"] = dataframe["channel"].astype("int64")
+    dataframe["oui"] = _frame_oui(dataframe["mac"])
+    dataframe["vendor_id"] = _frame_vendor_ids(dataframe["mac"])
+    _frame_coordinates(dataframe)
+
+    dataframe["type"] = "WIFI"
+
+    return bulk_upsert_stream(
         model=Wardriving,
         key_fields=["uploaded_by", "mac", "channel"],
-        rows=rows,
+        rows=_iter_frame_batches(
+            dataframe,
+            Wardriving,
+            WARDRIVING_ROW_FIELDS,
+            uploaded_by=uploaded_by,
+            device_source=device_source,
+            first_seen=now(),
+        ),
         better_obj_fn=wardriving_better_obj_fn,
         update_fields=[
             "ssid",
             "auth_mode",
             "first_seen",
-            "current_latitude",
-            "current_longitude",
+            "latitude_e6",
+            "longitude_e6",
             "rssi",
             "device_source",
             "type",
         ],
-        only_fields=["id", "uploaded_by", "mac", "channel", "rssi"],
+        only_fields=WARDRIVING_ONLY_FIELDS,
         chunk_size=1000,
     )
 
@@ -928,7 +2035,10 @@ def process_file_rf(
     file_path="",
     device_source=SourceDevice.RF_CUSTOM_FIRMWARE_WIFI,
     uploaded_by="Without Owner",
+    progress=None,
 ):
+    # RF captures are small CSVs read whole: a redelivered file starts over
+    # (its batches still commit one by one and replay harmlessly)
     try:
         df = read_csv(file_path, encoding="utf-8", sep=",")
     except UnicodeDecodeError:
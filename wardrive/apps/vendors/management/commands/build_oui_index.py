@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.vendors.oui_index import OuiIndex, build_oui_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera el índice OUI (MA-L/MA-M/MA-S, longest-prefix) desde la tabla "
+        "Vendors en un archivo mmap compartido por web y celery."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path",
+            default=settings.OUI_INDEX_PATH,
+            help="Archivo destino (por defecto settings.OUI_INDEX_PATH).",
+        )
+
+    def handle(self, *args, **opts):
+        path = opts["path"]
+        build_oui_index(path)
+        index = OuiIndex(path)
+        self.stdout.write(
+            self.style.SUCCESS(f"🗂️  OUI index listo: {len(index)} prefijos en {path}")
+        )
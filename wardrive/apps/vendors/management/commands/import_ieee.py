@@ -1,24 +1,57 @@
+import codecs
 import csv
+import hashlib
 import io
+import os
 import re
 import sys
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
 from dataclasses import dataclass
-from typing import Iterable, Iterator, Optional, Tuple
+from typing import Iterable, Iterator, Optional, Union
 
 import requests
-from django.core.management.base import BaseCommand
-from django.db import transaction
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, transaction
+from django.utils.timezone import now
 
-from apps.vendors.models import Vendors
+from apps.vendors import SourceVendor
+from apps.vendors.models import Vendors, VendorSyncState
+from apps.vendors.oui_index import build_oui_index
 
 IEEE_OUI_TXT = "https://standards-oui.ieee.org/oui/oui.txt"
 IEEE_OUI_CSV = "https://standards-oui.ieee.org/oui/oui.csv"
 
+
+@dataclass(frozen=True)
+class IeeeRegistry:
+    prefix_bits: int
+    csv_url: str
+    txt_url: str = ""  # only MA-L has a txt format the parser understands
+
+    @property
+    def csv_name(self) -> str:
+        return self.csv_url.rsplit("/", 1)[-1]
+
+
+# Registros IEEE: longitud del prefijo y archivos publicados
+IEEE_REGISTRIES = {
+    "MA-L": IeeeRegistry(24, IEEE_OUI_CSV, IEEE_OUI_TXT),
+    "MA-M": IeeeRegistry(28, "https://standards-oui.ieee.org/oui28/mam.csv"),
+    "MA-S": IeeeRegistry(36, "https://standards-oui.ieee.org/oui36/oui36.csv"),
+    "CID": IeeeRegistry(24, "https://standards-oui.ieee.org/cid/cid.csv"),
+    "IAB": IeeeRegistry(36, "https://standards-oui.ieee.org/iab/iab.csv"),
+}
+
 UA = (
     "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
     "(KHTML, like Gecko) Chrome/141.0.0.0 Safari/537.36"
 )
 
+# Bytes per read while streaming the source (HTTP body or local file)
+STREAM_CHUNK_BYTES = 64 * 1024
+
 # Ej: "28-6F-B9   (hex)     Nokia Shanghai Bell Co., Ltd."
 HEX_LINE_RE = re.compile(
     r"^\s*([0-9A-Fa-f]{2}(?:-[0-9A-Fa-f]{2}){2})\s+\(hex\)\s+(.+?)\s*$"
@@ -36,15 +69,51 @@ class ParsedOui:
     org_address: str
 
 
-def _http_get(url: str, timeout: int = 60) -> Tuple[int, bytes]:
+def _http_stream(
+    url: str, etag: str = "", last_modified: str = "", timeout: int = 60
+) -> requests.Response:
     headers = {
         "User-Agent": UA,
         "Accept": "text/plain,text/csv,*/*;q=0.9",
         "Accept-Language": "en-US,en;q=0.9,es;q=0.8",
         "Connection": "keep-alive",
     }
-    resp = requests.get(url, headers=headers, timeout=timeout)
-    return resp.status_code, resp.content
+    # Conditional GET: an unchanged source answers 304 without a body
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return requests.get(url, headers=headers, timeout=timeout, stream=True)
+
+
+def _iter_text_lines(chunks: Iterable[bytes], digest) -> Iterator[str]:
+    """
+    Decode a byte stream into lines (newline kept) while feeding `digest`,
+    so the source is hashed and parsed in the same single pass.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pending = ""
+    for chunk in chunks:
+        digest.update(chunk)
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+def _sync_state(source: str) -> VendorSyncState:
+    # Unsaved until a sync succeeds, so an unchanged source writes nothing
+    return VendorSyncState.objects.filter(source=source).first() or VendorSyncState(
+        source=source
+    )
+
+
+def _iter_file_chunks(path: str) -> Iterator[bytes]:
+    with open(path, "rb") as fh:
+        yield from iter(lambda: fh.read(STREAM_CHUNK_BYTES), b"")
 
 
 def _normalize_assignment(hex_with_dashes: str) -> str:
@@ -52,15 +121,19 @@ def _normalize_assignment(hex_with_dashes: str) -> str:
     return hex_with_dashes.replace("-", "").upper()
 
 
-def parse_oui_txt(content: str) -> Iterator[ParsedOui]:
+def parse_oui_txt(content: Union[str, Iterable[str]]) -> Iterator[ParsedOui]:
     """
     Parser por bloques del formato clásico:
       XX-XX-XX (hex)  Organization Name
           Address line 1
           Address line 2
           ...
+    `content` puede ser el texto completo o un iterable de líneas (stream).
     """
-    lines = content.splitlines()
+    if isinstance(content, str):
+        lines = content.splitlines()
+    else:
+        lines = (line.rstrip("\r\n") for line in content)
 
     current_hex: Optional[str] = None
     current_name: Optional[str] = None
@@ -102,13 +175,18 @@ def parse_oui_txt(content: str) -> Iterator[ParsedOui]:
     yield from flush()
 
 
-def parse_oui_csv(content: str) -> Iterator[ParsedOui]:
+def parse_oui_csv(
+    content: Union[str, Iterable[str]], registries: Optional[Iterable[str]] = None
+) -> Iterator[ParsedOui]:
     """
-    Cabeceras oficiales:
+    Cabeceras oficiales (iguales para MA-L, MA-M, MA-S, CID e IAB):
       Registry,Assignment,Organization Name,Organization Address
+    `content` puede ser el texto completo o un iterable de líneas (stream).
+    Solo se emiten los `registries` pedidos (por defecto todos los IEEE).
     """
+    registries = set(registries or IEEE_REGISTRIES)
     # El CSV puede traer comillas y comas en la dirección
-    f = io.StringIO(content)
+    f = io.StringIO(content) if isinstance(content, str) else content
     reader = csv.DictReader(f)
     # Validación suave de cabeceras
     required = {"Registry", "Assignment", "Organization Name", "Organization Address"}
@@ -124,15 +202,14 @@ def parse_oui_csv(content: str) -> Iterator[ParsedOui]:
         org = (row.get("Organization Name") or "").strip()
         addr = (row.get("Organization Address") or "").strip()
 
-        # Para este command nos enfocamos en MA-L (OUI 24-bit)
-        if registry != "MA-L":
+        if registry not in registries:
             continue
 
         if not assignment or not org:
             continue
 
         yield ParsedOui(
-            registry="MA-L",
+            registry=registry,
             assignment=assignment,
             org_name=org,
             org_address=addr,
@@ -140,127 +217,477 @@ def parse_oui_csv(content: str) -> Iterator[ParsedOui]:
 
 
 def registry_to_prefix_bits(registry: str) -> int:
-    # Para este caso: MA-L (OUI 24-bit)
-    if registry == "MA-L":
-        return 24
-    # Si luego agregas otros registros:
-    # MA-M -> 28, MA-S -> 36, etc.
-    return 24
+    # MA-L/CID -> 24, MA-M -> 28, MA-S/IAB -> 36
+    known = IEEE_REGISTRIES.get(registry)
+    return known.prefix_bits if known else 24
+
+
+@dataclass
+class VendorDiff:
+    inserted: int = 0
+    changed: int = 0
+    removed: int = 0
+    unchanged: int = 0
+
+    @property
+    def writes(self) -> int:
+        return self.inserted + self.changed + self.removed
+
+
+def collect_assignments(parsed: Iterable[ParsedOui]) -> dict:
+    """
+    Desired state of a source: (registry, assignment) -> list of
+    (organization_name, organization_address), in file order, no repeats.
+    """
+    desired = defaultdict(list)
+    for item in parsed:
+        entries = desired[(item.registry, item.assignment)]
+        entry = (item.org_name, item.org_address)
+        if entry not in entries:
+            entries.append(entry)
+    return desired
+
+
+@transaction.atomic
+def apply_vendor_diff(
+    desired: dict, registries: Iterable[str], source_url: str, batch_size: int
+) -> VendorDiff:
+    """
+    Make the IEEE rows of `registries` match `desired` with one diff:
+    - identical rows are left alone
+    - a changed organization/address is updated in place, so the vendor id
+      already stamped on Wardriving rows stays valid
+    - assignments gone from the source are soft deleted
+    - new entries recover a soft deleted twin when there is one, otherwise
+      they are inserted
+    """
+    diff = VendorDiff()
+    alive = defaultdict(list)
+    dead = {}
+    existing = Vendors.all_objects.filter(
+        registry__in=list(registries), source=SourceVendor.IEEE
+    ).order_by("id")
+    for obj in existing.iterator(chunk_size=batch_size):
+        key = (obj.registry, obj.assignment)
+        if obj.deleted_at is None:
+            alive[key].append(obj)
+        else:
+            dead[(*key, obj.organization_name, obj.organization_address)] = obj
+
+    stamp = now()
+    to_create = []
+    to_update = []
+    for key in desired.keys() | alive.keys():
+        registry, assignment = key
+        wanted = desired.get(key, [])
+        have = alive.get(key, [])
+        have_entries = {(o.organization_name, o.organization_address) for o in have}
+
+        stale = [
+            o
+            for o in have
+            if (o.organization_name, o.organization_address) not in wanted
+        ]
+        missing = []
+        for entry in wanted:
+            if entry in have_entries:
+                diff.unchanged += 1
+                continue
+            twin = dead.get((*key, *entry))
+            if twin is not None:
+                twin.deleted_at = None
+                twin.updated_at = stamp
+                to_update.append(twin)
+                diff.inserted += 1
+            else:
+                missing.append(entry)
+
+        for obj, (org_name, org_address) in zip(stale, missing):
+            obj.organization_name = org_name
+            obj.organization_address = org_address
+            obj.source_url = source_url
+            obj.updated_at = stamp
+            to_update.append(obj)
+            diff.changed += 1
+
+        for org_name, org_address in missing[len(stale) :]:
+            to_create.append(
+                Vendors(
+                    registry=registry,
+                    assignment=assignment,
+                    prefix_bits=registry_to_prefix_bits(registry),
+                    normalized_prefix=assignment,
+                    organization_name=org_name,
+                    organization_address=org_address,
+                    source=SourceVendor.IEEE,
+                    source_url=source_url,
+                )
+            )
+            diff.inserted += 1
+
+        for obj in stale[len(missing) :]:
+            obj.deleted_at = stamp
+            obj.updated_at = stamp
+            to_update.append(obj)
+            diff.removed += 1
+
+    if to_update:
+        _update_vendors(to_update, batch_size)
+    if to_create:
+        _insert_vendors(to_create, batch_size)
+    return diff
+
+
+# Columnas que el diff puede cambiar en una fila existente
+VENDOR_DIFF_FIELDS = [
+    "organization_name",
+    "organization_address",
+    "source_url",
+    "deleted_at",
+    "updated_at",
+]
+
+
+def _copy_literal(value) -> str:
+    # Quoted values are never NULL in COPY csv, only the bare \N marker is
+    if value is None:
+        return "\\N"
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def _copy_rows(cursor, table: str, columns: list, rows: Iterable[list]):
+    buffer = io.StringIO()
+    for values in rows:
+        buffer.write(",".join(_copy_literal(v) for v in values) + "\n")
+    buffer.seek(0)
+    cursor.cursor.copy_expert(
+        f"COPY {table} ({', '.join(columns)}) FROM STDIN "
+        f"WITH (FORMAT csv, NULL '\\N')",
+        buffer,
+    )
+
+
+def _insert_vendors(objs: list, batch_size: int):
+    """INSERT of new rows; COPY FROM STDIN on Postgres (a full registry in one go)."""
+    if connection.vendor != "postgresql":
+        Vendors.objects.bulk_create(objs, batch_size=batch_size)
+        return
+    qn = connection.ops.quote_name
+    fields = [f for f in Vendors._meta.concrete_fields if not f.primary_key]
+    # auto_now/auto_now_add columns share one timestamp for the whole load
+    stamp = now()
+    auto = {
+        f.attname
+        for f in fields
+        if getattr(f, "auto_now", False) or getattr(f, "auto_now_add", False)
+    }
+    with connection.cursor() as cursor:
+        _copy_rows(
+            cursor,
+            qn(Vendors._meta.db_table),
+            [qn(f.column) for f in fields],
+            (
+                [
+                    stamp if f.attname in auto else getattr(obj, f.attname)
+                    for f in fields
+                ]
+                for obj in objs
+            ),
+        )
+
+
+def _update_vendors(objs: list, batch_size: int):
+    """
+    Changed/removed/recovered rows. On Postgres they are COPY'd into a temp
+    staging table and applied with a single UPDATE ... FROM.
+    """
+    if connection.vendor != "postgresql":
+        Vendors.all_objects.bulk_update(objs, VENDOR_DIFF_FIELDS, batch_size=batch_size)
+        return
+    qn = connection.ops.quote_name
+    table = qn(Vendors._meta.db_table)
+    staging = qn(f"staging_{Vendors._meta.db_table}")
+    fields = [Vendors._meta.pk] + [
+        Vendors._meta.get_field(f) for f in VENDOR_DIFF_FIELDS
+    ]
+    columns = [qn(f.column) for f in fields]
+    pk = columns[0]
+    assignments = ", ".join(f"{c} = s.{c}" for c in columns[1:])
+    with connection.cursor() as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {staging}")
+        cursor.execute(
+            f"CREATE TEMP TABLE {staging} AS "
+            f"SELECT {', '.join(columns)} FROM {table} WITH NO DATA"
+        )
+        _copy_rows(
+            cursor,
+            staging,
+            columns,
+            ([getattr(obj, f.attname) for f in fields] for obj in objs),
+        )
+        cursor.execute(
+            f"UPDATE {table} t SET {assignments} FROM {staging} s WHERE t.{pk} = s.{pk}"
+        )
+        cursor.execute(f"DROP TABLE {staging}")
+
+
+@dataclass
+class SyncResult:
+    registry: str
+    source: str
+    status: str  # "synced", "not_modified" (304) or "unchanged" (same hash)
+    diff: VendorDiff
+    notes: list
+
+
+def _open_remote(url: str, state: VendorSyncState, force: bool):
+    """Response for url, or None when the server says 304 Not Modified."""
+    etag = "" if force else state.etag
+    last_modified = "" if force else state.last_modified
+    resp = _http_stream(url, etag, last_modified)
+    if resp.status_code == 304:
+        resp.close()
+        return None
+    if resp.status_code != 200:
+        resp.close()
+        raise RuntimeError(f"Download failed: url={url} status={resp.status_code}")
+    return resp
+
+
+def sync_registry(
+    registry: str,
+    source: str,
+    *,
+    local: bool = False,
+    use_csv: bool = True,
+    force: bool = False,
+    batch_size: int = 5000,
+) -> SyncResult:
+    """
+    Stream one registry file (URL or local path) and apply its diff.
+    Runs in its own worker process when several registries are synced.
+    """
+    notes = []
+    resp = None
+    if local:
+        source = os.path.abspath(source)
+        state = _sync_state(source)
+        chunks = _iter_file_chunks(source)
+    else:
+        state = _sync_state(source)
+        try:
+            resp = _open_remote(source, state, force)
+        except (requests.RequestException, RuntimeError) as e:
+            csv_url = IEEE_REGISTRIES[registry].csv_url
+            if use_csv or source == csv_url:
+                raise
+            # Bloqueo común: 418/403. Fallback automático a CSV.
+            notes.append(f"⚠️  TXT no disponible ({e}). Fallback a CSV: {csv_url}")
+            source, use_csv = csv_url, True
+            state = _sync_state(source)
+            resp = _open_remote(source, state, force)
+        if resp is None:
+            return SyncResult(registry, source, "not_modified", VendorDiff(), notes)
+        chunks = resp.iter_content(chunk_size=STREAM_CHUNK_BYTES)
+
+    digest = hashlib.sha256()
+    lines = _iter_text_lines(chunks, digest)
+    try:
+        if use_csv:
+            parsed = parse_oui_csv(lines, registries=[registry])
+        else:
+            parsed = parse_oui_txt(lines)
+        desired = collect_assignments(parsed)
+    finally:
+        if resp is not None:
+            resp.close()
+    content_sha256 = digest.hexdigest()
+
+    if resp is not None:
+        state.etag = resp.headers.get("ETag", "")
+        state.last_modified = resp.headers.get("Last-Modified", "")
+
+    if not force and content_sha256 == state.content_sha256:
+        # Same content under new validators (e.g. a rotated ETag): keep them,
+        # so the next run gets a 304 instead of downloading it again
+        if resp is not None:
+            state.save(update_fields=["etag", "last_modified"])
+        return SyncResult(registry, source, "unchanged", VendorDiff(), notes)
+
+    with transaction.atomic():
+        diff = apply_vendor_diff(desired, [registry], source, batch_size)
+        state.content_sha256 = content_sha256
+        state.synced_at = now()
+        state.save()
+    return SyncResult(registry, source, "synced", diff, notes)
 
 
 class Command(BaseCommand):
     help = (
-        "Importa IEEE OUI (MA-L) desde oui.txt (fallback a oui.csv) a la tabla Vendors."
+        "Sincroniza los registros IEEE (MA-L, MA-M, MA-S, CID, IAB) en paralelo, "
+        "un worker por registro, desde la web o archivos locales hacia Vendors, "
+        "aplicando solo el diff."
     )
 
     def add_arguments(self, parser):
+        parser.add_argument(
+            "--registry",
+            action="append",
+            choices=sorted(IEEE_REGISTRIES),
+            help="Registro a sincronizar (repetible). Por defecto todos.",
+        )
         parser.add_argument(
             "--url",
-            default=IEEE_OUI_TXT,
-            help="URL origen (por defecto oui.txt de IEEE).",
+            default=None,
+            help="URL origen para un solo registro (por defecto la oficial de IEEE).",
+        )
+        parser.add_argument(
+            "--file",
+            default=None,
+            help="Archivo local oui.txt/*.csv para un solo registro (modo offline).",
+        )
+        parser.add_argument(
+            "--dir",
+            default=None,
+            help=(
+                "Directorio local con los archivos IEEE (oui.csv u oui.txt, mam.csv, "
+                "oui36.csv, cid.csv, iab.csv) para el modo offline."
+            ),
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Procesos en paralelo (por defecto uno por registro).",
         )
         parser.add_argument(
             "--batch-size",
             type=int,
             default=5000,
-            help="Tamaño de lote para bulk_create.",
+            help="Tamaño de lote al leer/escribir Vendors.",
         )
         parser.add_argument(
             "--use-csv",
             action="store_true",
-            help="Forzar uso del CSV (oui.csv) aunque el txt responda.",
+            help="Forzar uso del CSV (oui.csv) para MA-L aunque el txt responda.",
         )
         parser.add_argument(
-            "--truncate",
+            "--force",
             action="store_true",
-            help="Borra los registros MA-L antes de importar (cuidado).",
+            help="Ignora ETag/Last-Modified/hash guardados y recalcula el diff.",
         )
 
-    def handle(self, *args, **opts):
-        url = opts["url"]
-        batch_size = opts["batch_size"]
-        use_csv = opts["use_csv"]
-        truncate = opts["truncate"]
-
-        self.stdout.write(self.style.NOTICE(f"📥 Descargando: {url}"))
-
-        parsed_iter: Iterable[ParsedOui]
-
-        if use_csv:
-            status, raw = _http_get(IEEE_OUI_CSV)
-            if status != 200:
-                raise RuntimeError(f"CSV download failed: status={status}")
-            content = raw.decode("utf-8", errors="replace")
-            parsed_iter = parse_oui_csv(content)
-            source_url = IEEE_OUI_CSV
-        else:
-            status, raw = _http_get(url)
+    def _jobs(self, opts):
+        """(registry, source, local, use_csv) for every registry to sync."""
+        registries = opts["registry"] or list(IEEE_REGISTRIES)
+        single = opts["file"] or opts["url"]
+        if single and len(registries) != 1:
+            if opts["registry"]:
+                raise CommandError("--file/--url solo aceptan un --registry")
+            registries = ["MA-L"]
+
+        jobs = []
+        for registry in registries:
+            info = IEEE_REGISTRIES[registry]
+            if opts["file"]:
+                if not os.path.isfile(opts["file"]):
+                    raise CommandError(f"No existe el archivo: {opts['file']}")
+                path = opts["file"]
+                jobs.append((registry, path, True, not path.lower().endswith(".txt")))
+            elif opts["dir"]:
+                csv_path = os.path.join(opts["dir"], info.csv_name)
+                txt_path = os.path.join(opts["dir"], "oui.txt")
+                if os.path.isfile(csv_path) and (opts["use_csv"] or not info.txt_url):
+                    jobs.append((registry, csv_path, True, True))
+                elif info.txt_url and os.path.isfile(txt_path):
+                    jobs.append((registry, txt_path, True, False))
+                elif os.path.isfile(csv_path):
+                    jobs.append((registry, csv_path, True, True))
+                else:
+                    self.stdout.write(
+                        self.style.WARNING(
+                            f"⚠️  {registry}: sin archivo en {opts['dir']}"
+                        )
+                    )
+            elif opts["url"]:
+                url = opts["url"]
+                jobs.append((registry, url, False, not url.lower().endswith(".txt")))
+            elif info.txt_url and not opts["use_csv"]:
+                jobs.append((registry, info.txt_url, False, False))
+            else:
+                jobs.append((registry, info.csv_url, False, True))
+        return jobs
+
+    def _run(self, jobs, workers, force, batch_size):
+        kwargs = {"force": force, "batch_size": batch_size}
+        if workers <= 1 or len(jobs) <= 1:
+            for registry, source, local, use_csv in jobs:
+                yield sync_registry(
+                    registry, source, local=local, use_csv=use_csv, **kwargs
+                )
+            return
+
+        # Forked workers open their own DB connection, not the parent's socket
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(jobs)), mp_context=get_context("fork")
+        ) as pool:
+            futures = [
+                pool.submit(
+                    sync_registry,
+                    registry,
+                    source,
+                    local=local,
+                    use_csv=use_csv,
+                    **kwargs,
+                )
+                for registry, source, local, use_csv in jobs
+            ]
+            for future in futures:
+                yield future.result()
 
-            # Bloqueo común: 418/403. Fallback automático a CSV.
-            if status in (403, 418) or status != 200:
+    def handle(self, *args, **opts):
+        jobs = self._jobs(opts)
+        if not jobs:
+            raise CommandError("No hay registros para sincronizar")
+
+        workers = opts["workers"] or len(jobs)
+        if connection.vendor != "postgresql":
+            # SQLite & co. serialize writers, the pool would only add lock errors
+            workers = 1
+
+        for registry, source, local, _ in jobs:
+            icon = "📂 Leyendo" if local else "📥 Descargando"
+            self.stdout.write(self.style.NOTICE(f"{icon} {registry}: {source}"))
+
+        writes = 0
+        for result in self._run(jobs, workers, opts["force"], opts["batch_size"]):
+            for note in result.notes:
+                self.stdout.write(self.style.WARNING(note))
+            if result.status == "not_modified":
                 self.stdout.write(
-                    self.style.WARNING(
-                        f"⚠️  TXT no disponible (status={status}). Fallback a CSV: {IEEE_OUI_CSV}"
+                    self.style.SUCCESS(
+                        f"✅ {result.registry}: sin cambios (304 Not Modified)."
                     )
                 )
-                status2, raw2 = _http_get(IEEE_OUI_CSV)
-                if status2 != 200:
-                    raise RuntimeError(
-                        f"Fallback CSV download failed: txt_status={status} csv_status={status2}"
+            elif result.status == "unchanged":
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"✅ {result.registry}: sin cambios (mismo hash)."
                     )
-                content = raw2.decode("utf-8", errors="replace")
-                parsed_iter = parse_oui_csv(content)
-                source_url = IEEE_OUI_CSV
+                )
             else:
-                content = raw.decode("utf-8", errors="replace")
-                parsed_iter = parse_oui_txt(content)
-                source_url = url
-
-        if truncate:
-            self.stdout.write(self.style.WARNING("🧨 Truncating MA-L rows..."))
-            Vendors.objects.filter(registry="MA-L").delete()
-
-        created_total = 0
-        seen_total = 0
-
-        buffer: list[Vendors] = []
-
-        @transaction.atomic
-        def flush_batch(batch: list[Vendors]) -> int:
-            # ignore_conflicts=True evita reventar por UniqueConstraint
-            Vendors.objects.bulk_create(
-                batch, ignore_conflicts=True, batch_size=len(batch)
-            )
-            return len(batch)
-
-        for item in parsed_iter:
-            seen_total += 1
-
-            prefix_bits = registry_to_prefix_bits(item.registry)
-            obj = Vendors(
-                registry=item.registry,
-                assignment=item.assignment,
-                prefix_bits=prefix_bits,
-                normalized_prefix=item.assignment,
-                organization_name=item.org_name,
-                organization_address=item.org_address,
-                source="ieee",
-                source_url=source_url,
-            )
-            buffer.append(obj)
-
-            if len(buffer) >= batch_size:
-                created_total += flush_batch(buffer)
+                diff = result.diff
+                writes += diff.writes
                 self.stdout.write(
-                    f"✅ batch insert: {created_total} (seen={seen_total})"
+                    self.style.SUCCESS(
+                        f"🎉 {result.registry}: insertados={diff.inserted} "
+                        f"cambiados={diff.changed} eliminados={diff.removed} "
+                        f"sin_cambio={diff.unchanged} source={result.source}"
+                    )
                 )
-                buffer = []
-
-        if buffer:
-            created_total += flush_batch(buffer)
 
-        self.stdout.write(
-            self.style.SUCCESS(
-                f"🎉 Import terminado. intentos_insert={created_total} seen={seen_total} source={source_url}"
-            )
-        )
+        if writes:
+            # Ingest stamps vendor ids from this file, rebuild it with the new rows
+            prefixes = build_oui_index()
+            self.stdout.write(f"🗂️  OUI index regenerado: {prefixes} prefijos")
@@ -0,0 +1,43 @@
+# Generated by Django 5.2 on 2026-10-17 03:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("vendors", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="VendorSyncState",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("source", models.CharField(max_length=512, unique=True)),
+                ("etag", models.CharField(blank=True, default="", max_length=255)),
+                (
+                    "last_modified",
+                    models.CharField(blank=True, default="", max_length=64),
+                ),
+                (
+                    "content_sha256",
+                    models.CharField(blank=True, default="", max_length=64),
+                ),
+                ("synced_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "verbose_name": "Vendor Sync State",
+                "verbose_name_plural": "Vendor Sync States",
+                "db_table": "vendor_sync_state",
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2 on 2026-10-17 03:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("vendors", "0002_vendorsyncstate"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="VendorEnrichmentState",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("watermark", models.DateTimeField(blank=True, null=True)),
+                ("last_run_at", models.DateTimeField(blank=True, null=True)),
+                ("last_rows_updated", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "Vendor Enrichment State",
+                "verbose_name_plural": "Vendor Enrichment State",
+                "db_table": "vendor_enrichment_state",
+            },
+        ),
+    ]
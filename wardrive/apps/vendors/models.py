@@ -44,3 +44,36 @@ class Vendors(BaseModel):
 
     def __str__(self):
         return f"{self.pk} - {self.assignment} with registry {self.registry} ({self.prefix_bits} bits)"
+
+
+class VendorSyncState(models.Model):
+    # One row per IEEE source (URL or local file path) synced by import_ieee
+    source = models.CharField(max_length=512, unique=True)
+    etag = models.CharField(max_length=255, blank=True, default="")
+    last_modified = models.CharField(max_length=64, blank=True, default="")
+    content_sha256 = models.CharField(max_length=64, blank=True, default="")
+    synced_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "vendor_sync_state"
+        verbose_name = "Vendor Sync State"
+        verbose_name_plural = "Vendor Sync States"
+
+    def __str__(self):
+        return f"{self.source} ({self.content_sha256[:12] or 'never synced'})"
+
+
+class VendorEnrichmentState(models.Model):
+    # Singleton (pk=1): vendor rows changed after `watermark` still need their
+    # prefixes re-stamped on Wardriving by tasks.reenrich_vendor_ids
+    watermark = models.DateTimeField(null=True, blank=True)
+    last_run_at = models.DateTimeField(null=True, blank=True)
+    last_rows_updated = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = "vendor_enrichment_state"
+        verbose_name = "Vendor Enrichment State"
+        verbose_name_plural = "Vendor Enrichment State"
+
+    def __str__(self):
+        return f"watermark={self.watermark} updated={self.last_rows_updated}"
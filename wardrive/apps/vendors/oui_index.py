@@ -0,0 +1,181 @@
+"""
+Longest-prefix OUI lookup (MA-S 36 bits, MA-M 28 bits, MA-L 24 bits).
+
+The index is built from the `vendor` table into a single binary file:
+
+    magic (8 bytes) | count per prefix length (uint64 x 3) |
+    for each length: sorted prefixes (uint64 x n) + vendor ids (int64 x n)
+
+Every process (gunicorn, celery, parse workers) maps the same file
+read-only, so the arrays live once in the page cache. The file is
+replaced atomically, and readers reopen it when it changes.
+"""
+
+import logging
+import mmap
+import os
+import re
+import struct
+import tempfile
+import threading
+from bisect import bisect_left
+
+import numpy as np
+from django.conf import settings
+from pandas import Series
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"OUIIDX01"
+MAC_BITS = 48
+# Longest first, so the most specific assignment wins
+PREFIX_BITS = (36, 28, 24)
+
+NON_HEX_RE = re.compile(r"[^0-9A-Fa-f]")
+
+
+def mac_to_int(mac):
+    # "aa:bb:cc:dd:ee:ff" -> 0xAABBCCDDEEFF, None if it is not a full MAC
+    digits = NON_HEX_RE.sub("", mac or "")
+    if len(digits) < 12:
+        return None
+    return int(digits[:12], 16)
+
+
+def build_oui_index(path=None):
+    """
+    Write the index for the alive vendors into `path` (default
+    settings.OUI_INDEX_PATH). When an assignment is repeated (same prefix,
+    other address) the newest row wins. Returns the number of prefixes.
+    """
+    from apps.vendors.models import Vendors
+
+    path = path or settings.OUI_INDEX_PATH
+    tables = {bits: {} for bits in PREFIX_BITS}
+    rows = Vendors.objects.order_by("id").values_list("id", "normalized_prefix")
+    for vendor_id, prefix in rows.iterator(chunk_size=5000):
+        prefix = (prefix or "").strip().upper()
+        bits = len(prefix) * 4
+        if bits not in tables or NON_HEX_RE.search(prefix):
+            continue
+        tables[bits][int(prefix, 16)] = vendor_id
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".oui_index.")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(MAGIC)
+            fh.write(struct.pack("<3Q", *(len(tables[b]) for b in PREFIX_BITS)))
+            for bits in PREFIX_BITS:
+                prefixes = sorted(tables[bits])
+                fh.write(np.asarray(prefixes, dtype="<u8").tobytes())
+                fh.write(
+                    np.asarray(
+                        [tables[bits][p] for p in prefixes], dtype="<i8"
+                    ).tobytes()
+                )
+        os.chmod(tmp_path, 0o644)
+        # Atomic swap: mapped readers keep the old inode until they reopen
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+    total = sum(len(t) for t in tables.values())
+    logger.info("OUI index %s: %d prefixes", path, total)
+    return total
+
+
+class OuiIndex:
+    def __init__(self, path):
+        with open(path, "rb") as fh:
+            self._mmap = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not an OUI index")
+
+        offset = len(MAGIC)
+        counts = struct.unpack_from("<3Q", self._mmap, offset)
+        offset += struct.calcsize("<3Q")
+
+        # (shift, prefixes, vendor ids) per prefix length, all views on the mmap
+        self._tables = []
+        for bits, count in zip(PREFIX_BITS, counts):
+            prefixes = np.frombuffer(
+                self._mmap, dtype="<u8", count=count, offset=offset
+            )
+            offset += 8 * count
+            ids = np.frombuffer(self._mmap, dtype="<i8", count=count, offset=offset)
+            offset += 8 * count
+            self._tables.append((MAC_BITS - bits, prefixes, ids))
+
+        # Zero-copy sequences for the scalar bisect (cheaper than numpy per call)
+        self._scalar_tables = [
+            (shift, memoryview(prefixes).cast("B").cast("Q"), ids)
+            for shift, prefixes, ids in self._tables
+        ]
+
+    def __len__(self):
+        return sum(len(prefixes) for _, prefixes, _ in self._tables)
+
+    def lookup(self, mac):
+        """Vendor id of the longest assignment covering `mac`, or None."""
+        value = mac_to_int(mac)
+        if value is None:
+            return None
+        for shift, prefixes, ids in self._scalar_tables:
+            key = value >> shift
+            pos = bisect_left(prefixes, key)
+            if pos < len(prefixes) and prefixes[pos] == key:
+                return int(ids[pos])
+        return None
+
+    def lookup_many(self, macs):
+        """Column version of lookup: a Series of MACs -> Int64 vendor ids."""
+        digits = macs.astype(str).str.replace(r"[^0-9A-Fa-f]", "", regex=True)
+        valid = (digits.str.len() >= 12).to_numpy()
+        values = np.fromiter(
+            (int(d[:12], 16) for d in digits[valid]),
+            dtype=np.uint64,
+            count=int(valid.sum()),
+        )
+
+        found = np.full(len(values), -1, dtype=np.int64)
+        for shift, prefixes, ids in self._tables:
+            if not len(prefixes):
+                continue
+            keys = values >> np.uint64(shift)
+            pos = np.minimum(np.searchsorted(prefixes, keys), len(prefixes) - 1)
+            hit = (found < 0) & (prefixes[pos] == keys)
+            found[hit] = ids[pos[hit]]
+
+        result = np.full(len(macs), -1, dtype=np.int64)
+        result[valid] = found
+        return Series(result, index=macs.index, dtype="Int64").mask(result < 0)
+
+
+_cached = {"stamp": None, "index": None}
+_lock = threading.Lock()
+
+
+def get_oui_index():
+    """
+    Process-wide OuiIndex over settings.OUI_INDEX_PATH, reopened when the
+    file is rebuilt. None while the index has not been built yet.
+    """
+    path = settings.OUI_INDEX_PATH
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    stamp = (path, st.st_ino, st.st_mtime_ns, st.st_size)
+    with _lock:
+        if _cached["stamp"] != stamp:
+            try:
+                _cached["index"] = OuiIndex(path)
+            except (OSError, ValueError):
+                logger.exception("Could not open OUI index %s", path)
+                _cached["index"] = None
+            _cached["stamp"] = stamp
+        return _cached["index"]
@@ -0,0 +1,130 @@
+import os
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from celery import shared_task
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from django.utils.timezone import now
+from pandas import Series
+
+from apps.wardriving.models import Wardriving
+from apps.wardriving.rollups import (
+    apply_rollup_delta,
+    lock_rollup_writers,
+    rollup_counts,
+)
+from apps.wardriving.tasks import request_bi_refresh
+
+from .models import Vendors, VendorEnrichmentState
+from .oui_index import build_oui_index, get_oui_index
+
+# Imports stamp one updated_at per registry transaction and those can commit
+# out of order, so each run looks a bit behind the watermark (re-checking a
+# prefix is idempotent)
+WATERMARK_OVERLAP = timedelta(minutes=10)
+
+
+def changed_ouis(since=None):
+    """
+    24-bit OUIs (Wardriving.oui format) touched by vendor rows changed after
+    `since`, plus the newest updated_at seen. A 28/36-bit assignment maps to
+    the OUI it extends. On the first run (`since=None`) every row has to be
+    checked, so the OUIs come back as None.
+    """
+    changed = Vendors.all_objects.all()
+    if since is None:
+        return None, changed.aggregate(newest=Max("updated_at"))["newest"]
+    changed = changed.filter(updated_at__gte=since - WATERMARK_OVERLAP)
+    newest = changed.aggregate(newest=Max("updated_at"))["newest"]
+    ouis = {
+        prefix[:6].upper()
+        for prefix in changed.values_list("normalized_prefix", flat=True).distinct()
+        if prefix and len(prefix) >= 6
+    }
+    return ouis, newest
+
+
+def _oui_index_built_at():
+    try:
+        mtime = os.stat(settings.OUI_INDEX_PATH).st_mtime
+    except FileNotFoundError:
+        return datetime.min.replace(tzinfo=dt_timezone.utc)
+    return datetime.fromtimestamp(mtime, tz=dt_timezone.utc)
+
+
+@shared_task(
+    bind=True,
+    acks_late=True,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    retry_jitter=True,
+    max_retries=5,
+    reject_on_worker_lost=True,
+)
+def reenrich_vendor_ids(self, batch_size=5000):
+    """
+    Re-stamp Wardriving.vendor_id only for rows whose OUI had vendor changes
+    since the last run, walking them by id (keyset pagination) in batches.
+    """
+    state, _ = VendorEnrichmentState.objects.get_or_create(pk=1)
+    ouis, newest = changed_ouis(state.watermark)
+
+    # Stamps must come from an index that already has these vendor changes
+    if newest is not None and newest > _oui_index_built_at():
+        build_oui_index()
+    oui_index = get_oui_index()
+    if oui_index is None:
+        return "OUI index not built yet (run import_ieee or build_oui_index)."
+
+    scanned = updated = 0
+    if ouis is None or ouis:
+        rows = Wardriving.objects.order_by("id")
+        if ouis is not None:
+            rows = rows.filter(oui__in=sorted(ouis))
+        last_id = 0
+        while True:
+            batch = list(
+                rows.filter(id__gt=last_id).values_list(
+                    "id", "mac", "vendor_id", "uploaded_by"
+                )[:batch_size]
+            )
+            if not batch:
+                break
+            last_id = batch[-1][0]
+            scanned += len(batch)
+
+            ids, macs, current, uploaders = zip(*batch)
+            found = oui_index.lookup_many(Series(macs))
+            to_update, touched = [], set()
+            for pk, old, new, uploaded_by in zip(
+                ids, current, found.astype(object).where(found.notna(), None), uploaders
+            ):
+                if old != new:
+                    to_update.append(
+                        Wardriving(id=pk, vendor_id=None if new is None else int(new))
+                    )
+                    touched.add(uploaded_by)
+            if to_update:
+                # The vendor is a rollup dimension, move its counts too; the
+                # shards ingesting these uploaders wait for this transaction
+                changed = Wardriving.objects.filter(id__in=[o.id for o in to_update])
+                with transaction.atomic():
+                    lock_rollup_writers(touched)
+                    before = rollup_counts(changed)
+                    Wardriving.objects.bulk_update(to_update, ["vendor"])
+                    apply_rollup_delta(before, rollup_counts(changed))
+                updated += len(to_update)
+
+    if updated:
+        request_bi_refresh()
+
+    if newest is not None:
+        state.watermark = max(newest, state.watermark or newest)
+    state.last_run_at = now()
+    state.last_rows_updated = updated
+    state.save()
+    return (
+        f"Vendor re-enrichment: {'all' if ouis is None else len(ouis)} changed OUIs, "
+        f"{scanned} rows scanned, {updated} rows updated"
+    )
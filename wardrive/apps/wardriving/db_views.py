@@ -1,8 +1,10 @@
 from django.db import models
-from django_db_views.db_view import DBView
+from django_db_views.db_view import DBView, DBMaterializedView
 
 from apps.wardriving.sql_views import (
     WardrivingVendorsSQL,
+    WardrivingVendorsMaterializedSQL,
+    WardrivingRollupVendorsSQL,
 )
 
 
@@ -17,8 +19,8 @@ class WardrivingVendorsView(DBView):
     channel = models.IntegerField()
     rssi = models.IntegerField()
     signal_streng = models.CharField()
-    current_latitude = models.DecimalField(max_digits=13, decimal_places=7)
-    current_longitude = models.DecimalField(max_digits=13, decimal_places=7)
+    current_latitude = models.DecimalField(max_digits=9, decimal_places=6)
+    current_longitude = models.DecimalField(max_digits=9, decimal_places=6)
     altitude_meters = models.DecimalField(max_digits=10, decimal_places=2)
     accuracy_meters = models.DecimalField(max_digits=6, decimal_places=2)
     type = models.CharField()
@@ -30,3 +32,46 @@ class WardrivingVendorsView(DBView):
     class Meta:
         managed = False
         db_table = "wardriving_vendor"
+
+
+class WardrivingVendorsMaterializedView(DBMaterializedView):
+    id = models.BigIntegerField(primary_key=True)
+    mac = models.CharField()
+    registry = models.CharField()
+    vendor = models.CharField()
+    source = models.CharField()
+    ssid = models.CharField()
+    auth_mode = models.CharField()
+    first_seen = models.DateTimeField()
+    channel = models.IntegerField()
+    rssi = models.IntegerField()
+    signal_streng = models.CharField()
+    current_latitude = models.DecimalField(max_digits=9, decimal_places=6)
+    current_longitude = models.DecimalField(max_digits=9, decimal_places=6)
+    altitude_meters = models.DecimalField(max_digits=10, decimal_places=2)
+    accuracy_meters = models.DecimalField(max_digits=6, decimal_places=2)
+    type = models.CharField()
+    device_source = models.CharField()
+    uploaded_by = models.TextField()
+    # SQL Definition
+    view_definition = WardrivingVendorsMaterializedSQL.view_definition
+
+    class Meta:
+        managed = False
+        db_table = "wardriving_vendor_mv"
+
+
+class WardrivingRollupVendorsView(DBView):
+    day = models.DateField()
+    uploaded_by = models.TextField()
+    device_source = models.CharField()
+    auth_mode = models.CharField()
+    signal_streng = models.CharField()
+    vendor = models.CharField()
+    qty = models.BigIntegerField()
+    # SQL Definition
+    view_definition = WardrivingRollupVendorsSQL.view_definition
+
+    class Meta:
+        managed = False
+        db_table = "wardriving_rollup_vendor"
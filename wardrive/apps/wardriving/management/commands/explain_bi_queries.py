@@ -0,0 +1,139 @@
+import re
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from apps.wardriving.rollups import rebuild_rollups
+
+# Metabase field filters, e.g. "{{author}}"
+TEMPLATE_TAG_RE = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+# Base table and the materialized view the dashboards read
+SEQ_SCAN_RE = re.compile(r"Seq Scan on (wardriving|wardriving_vendor_mv)\b")
+
+SEED_START = "2025-01-01 00:00:00+00"
+SEED_STEP_SECONDS = 10
+
+SEED_SQL = f"""
+INSERT INTO wardriving (
+    created_at, updated_at, deleted_at, first_seen, uploaded_by,
+    device_source, mac, ssid, auth_mode, channel, rssi, latitude_e6,
+    longitude_e6, altitude_meters, accuracy_meters, type, oui
+)
+SELECT
+    now(),
+    now(),
+    CASE WHEN g %% 20 = 0 THEN now() END,
+    timestamptz '{SEED_START}' + g * interval '{SEED_STEP_SECONDS} seconds',
+    'seed-author-' || (g %% %s),
+    'marauder v6',
+    'de:ad:' || substr(lpad(to_hex(g), 8, '0'), 1, 2) || ':'
+        || substr(lpad(to_hex(g), 8, '0'), 3, 2) || ':'
+        || substr(lpad(to_hex(g), 8, '0'), 5, 2) || ':'
+        || substr(lpad(to_hex(g), 8, '0'), 7, 2),
+    'seed-ssid-' || (g %% 5000),
+    CASE WHEN g %% 3 = 0 THEN '[OPEN]' ELSE '[WPA2_PSK]' END,
+    1 + g %% 11,
+    -30 - g %% 60,
+    19400000 + (g %% 1000) * 10,
+    -99100000 - (g %% 1000) * 10,
+    2240,
+    5,
+    'WIFI',
+    'DEAD' || upper(substr(lpad(to_hex(g), 8, '0'), 1, 2))
+FROM generate_series(1, %s) AS g
+"""
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Siembra datos de prueba (en una transacción que se revierte), corre "
+        "EXPLAIN sobre los queries D00-D06 y falla si alguno hace Seq Scan "
+        "sobre wardriving o wardriving_vendor_mv."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sql-dir",
+            default=str(Path(settings.BASE_DIR).parent / "sql_bi_sources"),
+            help="Directorio con los queries D00-D06.",
+        )
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=200000,
+            help="Filas sembradas en wardriving.",
+        )
+        parser.add_argument(
+            "--authors",
+            type=int,
+            default=50,
+            help="Participantes distintos en los datos sembrados.",
+        )
+
+    def _render(self, sql, since, author):
+        """Replace the Metabase field filters with a typical dashboard filter."""
+        params = []
+        # D02-D06 read the daily rollup, where first_seen maps to `day`
+        rollup = "wardriving_rollup_vendor" in sql
+
+        def _tag(match):
+            tag = match.group(1)
+            if tag == "author":
+                params.append(author)
+                return "uploaded_by = %s"
+            if tag == "first_seen":
+                params.append(since.date() if rollup else since)
+                return "day >= %s" if rollup else "first_seen >= %s"
+            return "TRUE"
+
+        return TEMPLATE_TAG_RE.sub(_tag, sql), params
+
+    def handle(self, *args, **opts):
+        if connection.vendor != "postgresql":
+            raise CommandError("EXPLAIN check only runs on PostgreSQL")
+
+        sources = sorted(Path(opts["sql_dir"]).glob("D0*.sql"))
+        if not sources:
+            raise CommandError(f"No D0*.sql files in {opts['sql_dir']}")
+
+        rows = opts["rows"]
+        author = "seed-author-1"
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT timestamptz '{SEED_START}'")
+            start = cursor.fetchone()[0]
+        since = start + timedelta(seconds=rows * SEED_STEP_SECONDS) - timedelta(days=1)
+
+        failures = []
+        try:
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(SEED_SQL, [opts["authors"], rows])
+                cursor.execute("ANALYZE wardriving")
+                # The dashboards read the materialized view, load the seed into it
+                cursor.execute("REFRESH MATERIALIZED VIEW wardriving_vendor_mv")
+                cursor.execute("ANALYZE wardriving_vendor_mv")
+                rebuild_rollups()
+                cursor.execute("ANALYZE wardriving_rollup")
+                for path in sources:
+                    sql, params = self._render(path.read_text(), since, author)
+                    cursor.execute(f"EXPLAIN {sql}", params)
+                    plan = "\n".join(line for (line,) in cursor.fetchall())
+                    if SEQ_SCAN_RE.search(plan):
+                        failures.append(path.name)
+                        self.stdout.write(self.style.ERROR(f"❌ {path.name}"))
+                        self.stdout.write(plan)
+                    else:
+                        self.stdout.write(self.style.SUCCESS(f"✅ {path.name}"))
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        if failures:
+            raise CommandError(f"Seq Scan on the BI tables in: {', '.join(failures)}")
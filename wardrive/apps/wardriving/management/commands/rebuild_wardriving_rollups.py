@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.wardriving.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula desde cero la tabla wardriving_rollup (conteos por día y "
+        "dimensión que leen los queries D02-D06)."
+    )
+
+    def handle(self, *args, **opts):
+        total = rebuild_rollups()
+        self.stdout.write(self.style.SUCCESS(f"📊 Rollup listo: {total} filas"))
@@ -0,0 +1,46 @@
+# Generated by Django 5.2 on 2026-10-17 03:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wardriving", "0012_auto_20260125_1245"),
+    ]
+
+    operations = [
+        # Keep the best alive row per (uploaded_by, mac, channel): real
+        # coordinates first, then strongest RSSI, then oldest id. The other
+        # duplicates are soft deleted so the unique constraint can be built.
+        migrations.RunSQL(
+            sql="""
+            UPDATE wardriving SET deleted_at = CURRENT_TIMESTAMP
+            WHERE id IN (
+                SELECT id FROM (
+                    SELECT
+                        id,
+                        ROW_NUMBER() OVER (
+                            PARTITION BY uploaded_by, mac, channel
+                            ORDER BY
+                                (current_latitude = 0 AND current_longitude = 0),
+                                rssi DESC,
+                                id
+                        ) AS rn
+                    FROM wardriving
+                    WHERE deleted_at IS NULL
+                ) ranked
+                WHERE ranked.rn > 1
+            )
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddConstraint(
+            model_name="wardriving",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=("uploaded_by", "mac", "channel"),
+                name="uniq_wardriving_alive_uploader_mac_channel",
+            ),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2 on 2026-10-17 03:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wardriving", "0013_wardriving_uniq_wardriving_alive_uploader_mac_channel"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="ltewardriving",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=[
+                    "uploaded_by",
+                    "device_source",
+                    "tech",
+                    "mcc",
+                    "mnc",
+                    "lac",
+                    "cell_id",
+                ],
+                name="lte_wardriving_ingest_key_idx",
+            ),
+        ),
+    ]
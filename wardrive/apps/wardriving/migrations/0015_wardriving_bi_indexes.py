@@ -0,0 +1,71 @@
+# Generated by Django 5.2 on 2026-10-17 03:42
+
+from django.db import migrations, models
+
+
+def create_first_seen_brin(apps, schema_editor):
+    # BRIN is Postgres only; first_seen grows with inserts so a BRIN stays
+    # tiny and still prunes the date ranges of the dashboards
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS wd_first_seen_brin "
+        "ON wardriving USING brin (first_seen)"
+    )
+
+
+def drop_first_seen_brin(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS wd_first_seen_brin")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wardriving", "0014_ltewardriving_ingest_key_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="wardriving",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["uploaded_by", "first_seen"],
+                name="wd_alive_uploader_seen_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="wardriving",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["mac"],
+                name="wd_alive_mac_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="wardriving",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["ssid"],
+                name="wd_alive_ssid_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="wardriving",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["auth_mode"],
+                name="wd_alive_auth_mode_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="wardriving",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["device_source"],
+                name="wd_alive_device_source_idx",
+            ),
+        ),
+        migrations.RunPython(create_first_seen_brin, drop_first_seen_brin),
+    ]
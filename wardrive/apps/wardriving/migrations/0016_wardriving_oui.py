@@ -0,0 +1,58 @@
+# Generated by Django 5.2 on 2026-10-17 03:44
+
+import re
+
+from django.db import migrations, models
+
+
+def backfill_oui(apps, schema_editor):
+    # Same normalization as apps.wardriving.models.mac_to_oui
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(
+            "UPDATE wardriving SET oui = CASE "
+            "WHEN length(regexp_replace(mac, '[^0-9A-Fa-f]', '', 'g')) >= 6 "
+            "THEN upper(left(regexp_replace(mac, '[^0-9A-Fa-f]', '', 'g'), 6)) "
+            "ELSE '' END"
+        )
+        return
+
+    def mac_to_oui(mac):
+        oui = re.sub(r"[^0-9A-Fa-f]", "", mac or "")[:6].upper()
+        return oui if len(oui) == 6 else ""
+
+    Wardriving = apps.get_model("wardriving", "Wardriving")
+    batch = []
+    for obj in Wardriving.objects.only("id", "mac").iterator(chunk_size=2000):
+        obj.oui = mac_to_oui(obj.mac)
+        batch.append(obj)
+        if len(batch) >= 2000:
+            Wardriving.objects.bulk_update(batch, ["oui"])
+            batch = []
+    if batch:
+        Wardriving.objects.bulk_update(batch, ["oui"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wardriving", "0015_wardriving_bi_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="wardriving",
+            name="oui",
+            field=models.CharField(
+                blank=True, default="", editable=False, max_length=6, verbose_name="OUI"
+            ),
+        ),
+        migrations.RunPython(backfill_oui, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="wardriving",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["oui"],
+                name="wd_alive_oui_idx",
+            ),
+        ),
+    ]
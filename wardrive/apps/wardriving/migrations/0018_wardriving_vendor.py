@@ -0,0 +1,83 @@
+# Generated by Django 5.2 on 2026-10-17 03:47
+
+import re
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Same longest-prefix match as apps.vendors.oui_index: MA-S (36 bits), MA-M
+# (28) then MA-L (24) hex digits of a full MAC, the newest alive vendor wins
+PREFIX_DIGITS = (9, 7, 6)
+
+
+def backfill_vendor(apps, schema_editor):
+    # Without it wardriving_vendor (0019, joined on vendor_id) shows every
+    # existing row as not found until reenrich_vendor_ids runs with an index
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(
+            "UPDATE wardriving SET vendor_id = found.vendor_id FROM ("
+            "SELECT macs.id, ("
+            "SELECT vendor.id FROM vendor "
+            "WHERE vendor.deleted_at IS NULL AND vendor.normalized_prefix IN ("
+            + ", ".join(f"left(macs.hex, {n})" for n in PREFIX_DIGITS)
+            + ") ORDER BY length(vendor.normalized_prefix) DESC, vendor.id DESC "
+            "LIMIT 1) AS vendor_id "
+            "FROM (SELECT id, upper(regexp_replace(mac, '[^0-9A-Fa-f]', '', 'g')) "
+            "AS hex FROM wardriving) AS macs "
+            "WHERE length(macs.hex) >= 12"
+            ") AS found "
+            "WHERE wardriving.id = found.id AND found.vendor_id IS NOT NULL"
+        )
+        return
+
+    Vendors = apps.get_model("vendors", "Vendors")
+    Wardriving = apps.get_model("wardriving", "Wardriving")
+    prefixes = dict(
+        Vendors.objects.filter(deleted_at__isnull=True)
+        .order_by("id")
+        .values_list("normalized_prefix", "id")
+    )
+    if not prefixes:
+        return
+    batch = []
+    for obj in Wardriving.objects.only("id", "mac").iterator(chunk_size=2000):
+        digits = re.sub(r"[^0-9A-Fa-f]", "", obj.mac or "").upper()
+        if len(digits) < 12:
+            continue
+        obj.vendor_id = next(
+            (prefixes[p] for p in (digits[:n] for n in PREFIX_DIGITS) if p in prefixes),
+            None,
+        )
+        if obj.vendor_id is not None:
+            batch.append(obj)
+        if len(batch) >= 2000:
+            Wardriving.objects.bulk_update(batch, ["vendor"])
+            batch = []
+    if batch:
+        Wardriving.objects.bulk_update(batch, ["vendor"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("vendors", "0001_initial"),
+        ("wardriving", "0017_auto_20261016_2144"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="wardriving",
+            name="vendor",
+            field=models.ForeignKey(
+                blank=True,
+                db_constraint=False,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="+",
+                to="vendors.vendors",
+                verbose_name="Vendor",
+            ),
+        ),
+        migrations.RunPython(backfill_vendor, migrations.RunPython.noop),
+    ]
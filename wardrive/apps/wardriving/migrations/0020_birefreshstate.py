@@ -0,0 +1,77 @@
+# Generated by Django 5.2 on 2026-10-17 03:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wardriving", "0019_auto_20261016_2156"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WardrivingVendorsMaterializedView",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("mac", models.CharField()),
+                ("registry", models.CharField()),
+                ("vendor", models.CharField()),
+                ("source", models.CharField()),
+                ("ssid", models.CharField()),
+                ("auth_mode", models.CharField()),
+                ("first_seen", models.DateTimeField()),
+                ("channel", models.IntegerField()),
+                ("rssi", models.IntegerField()),
+                ("signal_streng", models.CharField()),
+                (
+                    "current_latitude",
+                    models.DecimalField(decimal_places=7, max_digits=13),
+                ),
+                (
+                    "current_longitude",
+                    models.DecimalField(decimal_places=7, max_digits=13),
+                ),
+                (
+                    "altitude_meters",
+                    models.DecimalField(decimal_places=2, max_digits=10),
+                ),
+                (
+                    "accuracy_meters",
+                    models.DecimalField(decimal_places=2, max_digits=6),
+                ),
+                ("type", models.CharField()),
+                ("device_source", models.CharField()),
+                ("uploaded_by", models.TextField()),
+            ],
+            options={
+                "db_table": "wardriving_vendor_mv",
+                "managed": False,
+            },
+        ),
+        migrations.CreateModel(
+            name="BIRefreshState",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("view_name", models.CharField(max_length=128, unique=True)),
+                ("refreshed_at", models.DateTimeField(blank=True, null=True)),
+                ("stale_since", models.DateTimeField(blank=True, null=True)),
+                ("changed_at", models.DateTimeField(blank=True, null=True)),
+                ("refresh_queued_at", models.DateTimeField(blank=True, null=True)),
+                ("last_duration_ms", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "BI Refresh State",
+                "verbose_name_plural": "BI Refresh States",
+                "db_table": "bi_refresh_state",
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2 on 2026-10-17 04:02
+
+from django.db import migrations
+
+# WardrivingVendorsMaterializedSQL.indexes as of this migration
+MV_INDEXES = (
+    "CREATE UNIQUE INDEX IF NOT EXISTS wardriving_vendor_mv_id_uniq "
+    "ON wardriving_vendor_mv (id)",
+    "CREATE INDEX IF NOT EXISTS wardriving_vendor_mv_author_seen_idx "
+    "ON wardriving_vendor_mv (uploaded_by, first_seen)",
+    "CREATE INDEX IF NOT EXISTS wardriving_vendor_mv_seen_idx "
+    "ON wardriving_vendor_mv (first_seen)",
+)
+
+
+def create_mv_indexes(apps, schema_editor):
+    # The materialized view only exists on PostgreSQL
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for ddl in MV_INDEXES:
+        schema_editor.execute(ddl)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wardriving", "0021_auto_20261016_2159"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_mv_indexes, migrations.RunPython.noop),
+    ]
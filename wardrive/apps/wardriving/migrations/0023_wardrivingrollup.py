@@ -0,0 +1,136 @@
+# Generated by Django 5.2 on 2026-10-17 04:02
+
+from django.db import migrations, models
+from django.db.models import BigIntegerField, Case, CharField, Count, Value, When
+from django.db.models.functions import Coalesce, TruncDate
+
+
+def backfill_rollups(apps, schema_editor):
+    # Frozen copy of apps.wardriving.rollups.rebuild_rollups at this point of
+    # the schema (decimal coordinates); later migrations must not change it
+    Wardriving = apps.get_model("wardriving", "Wardriving")
+    WardrivingRollup = apps.get_model("wardriving", "WardrivingRollup")
+    signal_streng = Case(
+        When(rssi__gte=-49, then=Value("Excellent")),
+        When(rssi__gte=-60, then=Value("Good")),
+        When(rssi__gte=-70, then=Value("Fair")),
+        default=Value("Weak"),
+        output_field=CharField(max_length=16),
+    )
+    rows = (
+        Wardriving.objects.filter(deleted_at__isnull=True)
+        .exclude(current_latitude=0)
+        .exclude(current_longitude=0)
+        .annotate(
+            rollup_day=TruncDate("first_seen"),
+            rollup_signal=signal_streng,
+            rollup_vendor=Coalesce("vendor", Value(0), output_field=BigIntegerField()),
+        )
+        .order_by()
+        .values(
+            "rollup_day",
+            "uploaded_by",
+            "device_source",
+            "auth_mode",
+            "rollup_signal",
+            "rollup_vendor",
+        )
+        .annotate(qty=Count("id"))
+    )
+    WardrivingRollup.objects.all().delete()
+    WardrivingRollup.objects.bulk_create(
+        (
+            WardrivingRollup(
+                day=row["rollup_day"],
+                uploaded_by=row["uploaded_by"],
+                device_source=row["device_source"],
+                auth_mode=row["auth_mode"],
+                signal_streng=row["rollup_signal"],
+                vendor_id=row["rollup_vendor"],
+                qty=row["qty"],
+            )
+            for row in rows.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wardriving", "0022_wardriving_vendor_mv_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WardrivingRollupVendorsView",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("uploaded_by", models.TextField()),
+                ("device_source", models.CharField()),
+                ("auth_mode", models.CharField()),
+                ("signal_streng", models.CharField()),
+                ("vendor", models.CharField()),
+                ("qty", models.BigIntegerField()),
+            ],
+            options={
+                "db_table": "wardriving_rollup_vendor",
+                "managed": False,
+            },
+        ),
+        migrations.CreateModel(
+            name="WardrivingRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("uploaded_by", models.TextField(default="")),
+                ("device_source", models.CharField(default="", max_length=50)),
+                ("auth_mode", models.CharField(default="", max_length=50)),
+                ("signal_streng", models.CharField(max_length=16)),
+                ("vendor_id", models.BigIntegerField(default=0)),
+                ("qty", models.BigIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "Wardriving Rollup",
+                "verbose_name_plural": "Wardriving Rollups",
+                "db_table": "wardriving_rollup",
+                "indexes": [
+                    models.Index(
+                        fields=["uploaded_by", "day"], name="wd_rollup_uploader_day_idx"
+                    ),
+                    models.Index(fields=["day"], name="wd_rollup_day_idx"),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=(
+                            "day",
+                            "uploaded_by",
+                            "device_source",
+                            "auth_mode",
+                            "signal_streng",
+                            "vendor_id",
+                        ),
+                        name="uniq_wardriving_rollup_dims",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
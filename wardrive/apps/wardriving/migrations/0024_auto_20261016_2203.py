@@ -0,0 +1,48 @@
+# Generated by Django 5.2 on 2026-10-17 04:03
+
+import django_db_views.migration_functions
+import django_db_views.operations
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wardriving", "0023_wardrivingrollup"),
+    ]
+
+    operations = [
+        django_db_views.operations.ViewRunPython(
+            code=django_db_views.migration_functions.ForwardViewMigration(
+                "SELECT\n            wardriving_rollup.id,\n            wardriving_rollup.day,\n            wardriving_rollup.uploaded_by,\n            wardriving_rollup.device_source,\n            wardriving_rollup.auth_mode,\n            wardriving_rollup.signal_streng,\n            COALESCE(vendor.organization_name, 'Not found yet') AS vendor,\n            wardriving_rollup.qty\n        FROM wardriving_rollup\n        LEFT JOIN vendor ON vendor.id = wardriving_rollup.vendor_id",
+                "wardriving_rollup_vendor",
+                engine="django.db.backends.postgresql",
+            ),
+            reverse_code=django_db_views.migration_functions.BackwardViewMigration(
+                "", "wardriving_rollup_vendor", engine="django.db.backends.postgresql"
+            ),
+            atomic=False,
+        ),
+        django_db_views.operations.ViewRunPython(
+            code=django_db_views.migration_functions.ForwardViewMigration(
+                "SELECT\n            wardriving_rollup.id,\n            wardriving_rollup.day,\n            wardriving_rollup.uploaded_by,\n            wardriving_rollup.device_source,\n            wardriving_rollup.auth_mode,\n            wardriving_rollup.signal_streng,\n            COALESCE(vendor.organization_name, 'Not found yet') AS vendor,\n            wardriving_rollup.qty\n        FROM wardriving_rollup\n        LEFT JOIN vendor ON vendor.id = wardriving_rollup.vendor_id",
+                "wardriving_rollup_vendor",
+                engine="django.db.backends.sqlite3",
+            ),
+            reverse_code=django_db_views.migration_functions.BackwardViewMigration(
+                "", "wardriving_rollup_vendor", engine="django.db.backends.sqlite3"
+            ),
+            atomic=False,
+        ),
+        django_db_views.operations.ViewRunPython(
+            code=django_db_views.migration_functions.ForwardViewMigration(
+                "SELECT\n            wardriving_rollup.id,\n            wardriving_rollup.day,\n            wardriving_rollup.uploaded_by,\n            wardriving_rollup.device_source,\n            wardriving_rollup.auth_mode,\n            wardriving_rollup.signal_streng,\n            COALESCE(vendor.organization_name, 'Not found yet') AS vendor,\n            wardriving_rollup.qty\n        FROM wardriving_rollup\n        LEFT JOIN vendor ON vendor.id = wardriving_rollup.vendor_id",
+                "wardriving_rollup_vendor",
+                engine="django.db.backends.mysql",
+            ),
+            reverse_code=django_db_views.migration_functions.BackwardViewMigration(
+                "", "wardriving_rollup_vendor", engine="django.db.backends.mysql"
+            ),
+            atomic=False,
+        ),
+    ]
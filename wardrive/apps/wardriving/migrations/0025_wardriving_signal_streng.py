@@ -0,0 +1,38 @@
+# Generated by Django 5.2 on 2026-10-17 04:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("vendors", "0003_vendorenrichmentstate"),
+        ("wardriving", "0024_auto_20261016_2203"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="wardriving",
+            name="signal_streng",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=models.Case(
+                    models.When(rssi__gte=-49, then=models.Value("Excellent")),
+                    models.When(rssi__gte=-60, then=models.Value("Good")),
+                    models.When(rssi__gte=-70, then=models.Value("Fair")),
+                    default=models.Value("Weak"),
+                    output_field=models.CharField(max_length=16),
+                ),
+                output_field=models.CharField(max_length=16),
+                verbose_name="Signal Strength",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="wardriving",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["signal_streng"],
+                name="wd_alive_signal_streng_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2 on 2026-10-17 04:06
+
+from django.db import migrations
+
+# WardrivingVendorsMaterializedSQL.indexes as of this migration
+MV_INDEXES = (
+    "CREATE UNIQUE INDEX IF NOT EXISTS wardriving_vendor_mv_id_uniq "
+    "ON wardriving_vendor_mv (id)",
+    "CREATE INDEX IF NOT EXISTS wardriving_vendor_mv_author_seen_idx "
+    "ON wardriving_vendor_mv (uploaded_by, first_seen)",
+    "CREATE INDEX IF NOT EXISTS wardriving_vendor_mv_seen_idx "
+    "ON wardriving_vendor_mv (first_seen)",
+)
+
+
+def create_mv_indexes(apps, schema_editor):
+    # 0026 recreated wardriving_vendor_mv (and dropped its indexes)
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for ddl in MV_INDEXES:
+        schema_editor.execute(ddl)
+
+
+class Migration(migrations.Migration):
+
+    # Renamed: it shared its name with 0022; databases that applied the old
+    # name count this one as applied
+    replaces = [("wardriving", "0027_wardriving_vendor_mv_indexes")]
+
+    dependencies = [
+        ("wardriving", "0026_auto_20261016_2205"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_mv_indexes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 5.2 on 2026-10-17 04:08
+
+from django.db import migrations, models
+
+COORDINATE_TABLES = (("wardriving", "Wardriving"), ("lte_wardriving", "LTEWardriving"))
+# (column, largest |degrees|): out of range or missing values become 0, as
+# they would at ingest, instead of overflowing the integer column
+COORDINATE_LIMITS = (("latitude", 90), ("longitude", 180))
+
+
+def _to_e6(value, limit):
+    if value is None or abs(value) > limit:
+        return 0
+    return round(value * 1000000)
+
+
+def backfill_micro_degrees(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        assignments = ", ".join(
+            f"{axis}_e6 = CASE WHEN abs(current_{axis}) <= {limit} "
+            f"THEN round(current_{axis} * 1000000) ELSE 0 END"
+            for axis, limit in COORDINATE_LIMITS
+        )
+        for table, _ in COORDINATE_TABLES:
+            schema_editor.execute(f"UPDATE {table} SET {assignments}")
+        return
+
+    for _, model_name in COORDINATE_TABLES:
+        Model = apps.get_model("wardriving", model_name)
+        batch = []
+        rows = Model.objects.only("id", "current_latitude", "current_longitude")
+        for obj in rows.iterator(chunk_size=2000):
+            obj.latitude_e6 = _to_e6(obj.current_latitude, 90)
+            obj.longitude_e6 = _to_e6(obj.current_longitude, 180)
+            batch.append(obj)
+            if len(batch) >= 2000:
+                Model.objects.bulk_update(batch, ["latitude_e6", "longitude_e6"])
+                batch = []
+        if batch:
+            Model.objects.bulk_update(batch, ["latitude_e6", "longitude_e6"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wardriving", "0027_recreate_wardriving_vendor_mv_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ltewardriving",
+            name="latitude_e6",
+            field=models.IntegerField(default=0, verbose_name="Latitude (µ°)"),
+        ),
+        migrations.AddField(
+            model_name="ltewardriving",
+            name="longitude_e6",
+            field=models.IntegerField(default=0, verbose_name="Longitude (µ°)"),
+        ),
+        migrations.AddField(
+            model_name="wardriving",
+            name="latitude_e6",
+            field=models.IntegerField(default=0, verbose_name="Latitude (µ°)"),
+        ),
+        migrations.AddField(
+            model_name="wardriving",
+            name="longitude_e6",
+            field=models.IntegerField(default=0, verbose_name="Longitude (µ°)"),
+        ),
+        migrations.RunPython(backfill_micro_degrees, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,102 @@
+# Generated by Django 5.2 on 2026-10-17 04:10
+
+from django.db import migrations
+from django.db.models import BigIntegerField, Case, CharField, Count, Value, When
+from django.db.models.functions import Coalesce, TruncDate
+
+# WardrivingVendorsMaterializedSQL.indexes as of this migration
+MV_INDEXES = (
+    "CREATE UNIQUE INDEX IF NOT EXISTS wardriving_vendor_mv_id_uniq "
+    "ON wardriving_vendor_mv (id)",
+    "CREATE INDEX IF NOT EXISTS wardriving_vendor_mv_author_seen_idx "
+    "ON wardriving_vendor_mv (uploaded_by, first_seen)",
+    "CREATE INDEX IF NOT EXISTS wardriving_vendor_mv_seen_idx "
+    "ON wardriving_vendor_mv (first_seen)",
+)
+
+
+def create_mv_indexes(apps, schema_editor):
+    # 0029 recreated wardriving_vendor_mv (and dropped its indexes)
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for ddl in MV_INDEXES:
+        schema_editor.execute(ddl)
+
+
+def backfill_rollups(apps, schema_editor):
+    # Recount on the micro-degree columns: 0028 turned out-of-range decimal
+    # coordinates into 0, which drops those rows from the rollup counted in 0023
+    # Frozen copy of apps.wardriving.rollups.rebuild_rollups as of this migration
+    Wardriving = apps.get_model("wardriving", "Wardriving")
+    WardrivingRollup = apps.get_model("wardriving", "WardrivingRollup")
+    signal_streng = Case(
+        When(rssi__gte=-49, then=Value("Excellent")),
+        When(rssi__gte=-60, then=Value("Good")),
+        When(rssi__gte=-70, then=Value("Fair")),
+        default=Value("Weak"),
+        output_field=CharField(max_length=16),
+    )
+    rows = (
+        Wardriving.objects.filter(deleted_at__isnull=True)
+        .exclude(latitude_e6=0)
+        .exclude(longitude_e6=0)
+        .annotate(
+            rollup_day=TruncDate("first_seen"),
+            rollup_signal=signal_streng,
+            rollup_vendor=Coalesce("vendor", Value(0), output_field=BigIntegerField()),
+        )
+        .order_by()
+        .values(
+            "rollup_day",
+            "uploaded_by",
+            "device_source",
+            "auth_mode",
+            "rollup_signal",
+            "rollup_vendor",
+        )
+        .annotate(qty=Count("id"))
+    )
+    WardrivingRollup.objects.all().delete()
+    WardrivingRollup.objects.bulk_create(
+        (
+            WardrivingRollup(
+                day=row["rollup_day"],
+                uploaded_by=row["uploaded_by"],
+                device_source=row["device_source"],
+                auth_mode=row["auth_mode"],
+                signal_streng=row["rollup_signal"],
+                vendor_id=row["rollup_vendor"],
+                qty=row["qty"],
+            )
+            for row in rows.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wardriving", "0029_auto_20261016_2209"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="ltewardriving",
+            name="current_latitude",
+        ),
+        migrations.RemoveField(
+            model_name="ltewardriving",
+            name="current_longitude",
+        ),
+        migrations.RemoveField(
+            model_name="wardriving",
+            name="current_latitude",
+        ),
+        migrations.RemoveField(
+            model_name="wardriving",
+            name="current_longitude",
+        ),
+        migrations.RunPython(create_mv_indexes, migrations.RunPython.noop),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
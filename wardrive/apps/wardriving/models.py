@@ -1,11 +1,95 @@
 from django.db import models
 from django.utils.timezone import now
 
-from decimal import Decimal, InvalidOperation
+from decimal import Decimal
+import re
 
 from . import SourceDevice
 from apps.core.models import WardriveBaseModel
 
+NON_HEX_RE = re.compile(r"[^0-9A-Fa-f]")
+
+
+def mac_to_oui(mac):
+    # "aa:bb:cc:dd:ee:ff" -> "AABBCC", same format as Vendors.normalized_prefix
+    oui = NON_HEX_RE.sub("", mac or "")[:6].upper()
+    return oui if len(oui) == 6 else ""
+
+
+# Coordinates are stored as int32 micro-degrees (6 decimals, about 11 cm)
+MICRO_DEGREES = 1_000_000
+# Largest |degrees| accepted per axis (both fit int32 as micro-degrees)
+MAX_LATITUDE = 90
+MAX_LONGITUDE = 180
+
+
+def degrees_to_e6(value, limit=MAX_LONGITUDE):
+    """Degrees (str, float, Decimal) -> int micro-degrees, None if invalid."""
+    if value is None:
+        return None
+    try:
+        e6 = round(float(value) * MICRO_DEGREES)
+    except (TypeError, ValueError, OverflowError):
+        return None
+    if abs(e6) > limit * MICRO_DEGREES:
+        return None
+    return e6
+
+
+def e6_to_degrees(value):
+    return None if value is None else Decimal(value).scaleb(-6)
+
+
+def micro_degrees_property(field_name, limit):
+    # Decimal degrees over an int micro-degree field, so code written for the
+    # old DecimalField coordinates (and Model(current_latitude=...)) still works
+    def getter(self):
+        return e6_to_degrees(getattr(self, field_name))
+
+    def setter(self, value):
+        if value is None:
+            setattr(self, field_name, 0)
+            return
+        e6 = degrees_to_e6(value, limit)
+        if e6 is None:
+            # 0 would put the point at (0, 0) and hide it from the BI views
+            raise ValueError(f"Invalid coordinate for {field_name}: {value!r}")
+        setattr(self, field_name, e6)
+
+    return property(getter, setter)
+
+
+# Signal strength buckets of the BI views: first bucket whose minimum RSSI
+# (inclusive, dBm) the row reaches. Single source for the stored
+# Wardriving.signal_streng column, the rollups and signal_streng_for();
+# changing it needs a migration (the column is regenerated) and a rollup rebuild
+SIGNAL_STRENGTH_BUCKETS = (
+    ("Excellent", -49),
+    ("Good", -60),
+    ("Fair", -70),
+)
+SIGNAL_STRENGTH_FLOOR = "Weak"
+
+
+def signal_strength_case(field="rssi"):
+    """SQL twin of signal_streng_for() over `field`."""
+    return models.Case(
+        *(
+            models.When(**{f"{field}__gte": minimum}, then=models.Value(label))
+            for label, minimum in SIGNAL_STRENGTH_BUCKETS
+        ),
+        default=models.Value(SIGNAL_STRENGTH_FLOOR),
+        output_field=models.CharField(max_length=16),
+    )
+
+
+def signal_streng_for(rssi):
+    if rssi is not None:
+        for label, minimum in SIGNAL_STRENGTH_BUCKETS:
+            if rssi >= minimum:
+                return label
+    return SIGNAL_STRENGTH_FLOOR
+
 
 class Wardriving(WardriveBaseModel):
     mac = models.CharField(
@@ -17,12 +101,8 @@ class Wardriving(WardriveBaseModel):
     )
     channel = models.IntegerField(verbose_name="Channel")
     rssi = models.IntegerField(verbose_name="RSSI (Signal Strength)")
-    current_latitude = models.DecimalField(
-        max_digits=13, decimal_places=7, verbose_name="Latitude", default=0
-    )
-    current_longitude = models.DecimalField(
-        max_digits=13, decimal_places=7, verbose_name="Longitude", default=0
-    )
+    latitude_e6 = models.IntegerField(verbose_name="Latitude (µ°)", default=0)
+    longitude_e6 = models.IntegerField(verbose_name="Longitude (µ°)", default=0)
     altitude_meters = models.DecimalField(
         max_digits=10,
         decimal_places=2,
@@ -33,32 +113,95 @@ class Wardriving(WardriveBaseModel):
         max_digits=6, decimal_places=2, verbose_name="Accuracy (Meters)", default=0
     )
     type = models.CharField(max_length=50, verbose_name="Type", default="WIFI")
+    # Materialized from mac at ingest, joined against vendor.normalized_prefix
+    oui = models.CharField(
+        max_length=6, verbose_name="OUI", default="", blank=True, editable=False
+    )
+    # Longest-prefix match (MA-S/MA-M/MA-L) stamped at ingest from the OUI index
+    vendor = models.ForeignKey(
+        "vendors.Vendors",
+        null=True,
+        blank=True,
+        editable=False,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+        verbose_name="Vendor",
+    )
+    # Stored bucket of rssi (SIGNAL_STRENGTH_BUCKETS), computed by the database
+    signal_streng = models.GeneratedField(
+        expression=signal_strength_case(),
+        output_field=models.CharField(max_length=16),
+        db_persist=True,
+        verbose_name="Signal Strength",
+    )
 
     class Meta:
         db_table = "wardriving"
         verbose_name = "Wardriving Data"
+        indexes = [
+            # Filters of the BI views (sql_bi_sources D00-D06), alive rows only.
+            # A BRIN index on first_seen is created by migration 0015.
+            models.Index(
+                fields=["uploaded_by", "first_seen"],
+                condition=models.Q(deleted_at__isnull=True),
+                name="wd_alive_uploader_seen_idx",
+            ),
+            models.Index(
+                fields=["mac"],
+                condition=models.Q(deleted_at__isnull=True),
+                name="wd_alive_mac_idx",
+            ),
+            models.Index(
+                fields=["ssid"],
+                condition=models.Q(deleted_at__isnull=True),
+                name="wd_alive_ssid_idx",
+            ),
+            models.Index(
+                fields=["auth_mode"],
+                condition=models.Q(deleted_at__isnull=True),
+                name="wd_alive_auth_mode_idx",
+            ),
+            models.Index(
+                fields=["device_source"],
+                condition=models.Q(deleted_at__isnull=True),
+                name="wd_alive_device_source_idx",
+            ),
+            models.Index(
+                fields=["oui"],
+                condition=models.Q(deleted_at__isnull=True),
+                name="wd_alive_oui_idx",
+            ),
+            models.Index(
+                fields=["signal_streng"],
+                condition=models.Q(deleted_at__isnull=True),
+                name="wd_alive_signal_streng_idx",
+            ),
+        ]
+        constraints = [
+            # Ingest key, target of the ON CONFLICT upsert (alive rows only)
+            models.UniqueConstraint(
+                fields=["uploaded_by", "mac", "channel"],
+                condition=models.Q(deleted_at__isnull=True),
+                name="uniq_wardriving_alive_uploader_mac_channel",
+            )
+        ]
         verbose_name_plural = "Wardriving Data"
 
     def __str__(self):
         device = self.ssid or self.type or "Unknown Device"
         return f"{device} ({self.mac})"
 
-    def is_default_data(self):
-        # Check current_latitude / current_longitude
-        lat = getattr(self, "current_latitude", None)
-        lon = getattr(self, "current_longitude", None)
+    def save(self, *args, **kwargs):
+        self.oui = mac_to_oui(self.mac)
+        return super().save(*args, **kwargs)
 
-        def is_zero_or_none(x):
-            if x is None:
-                return True
-            try:
-                return Decimal(x) == 0
-            except (InvalidOperation, TypeError):
-                # Si viene string raro, NaN, etc. trátalo como default
-                return True
+    current_latitude = micro_degrees_property("latitude_e6", MAX_LATITUDE)
+    current_longitude = micro_degrees_property("longitude_e6", MAX_LONGITUDE)
 
-        # Default si no tenemos coordenadas reales
-        return is_zero_or_none(lat) and is_zero_or_none(lon)
+    def is_default_data(self):
+        # Default si no tenemos coordenadas reales (0 µ° en ambas)
+        return not self.latitude_e6 and not self.longitude_e6
 
 
 class LTEWardriving(WardriveBaseModel):
@@ -75,41 +218,119 @@ class LTEWardriving(WardriveBaseModel):
         verbose_name="SINR (Signal-to-Interference-plus-Noise Ratio)"
     )
     provider = models.TextField(verbose_name="Provider", default="")
-    current_latitude = models.DecimalField(
-        max_digits=9, decimal_places=6, verbose_name="Latitude", default=0
-    )
-    current_longitude = models.DecimalField(
-        max_digits=9, decimal_places=6, verbose_name="Longitude", default=0
-    )
+    latitude_e6 = models.IntegerField(verbose_name="Latitude (µ°)", default=0)
+    longitude_e6 = models.IntegerField(verbose_name="Longitude (µ°)", default=0)
     tech = models.TextField(verbose_name="Technology", default="LTE")
 
     class Meta:
         db_table = "lte_wardriving"
+        indexes = [
+            # Ingest key used by the upsert lookups (alive rows only)
+            models.Index(
+                fields=[
+                    "uploaded_by",
+                    "device_source",
+                    "tech",
+                    "mcc",
+                    "mnc",
+                    "lac",
+                    "cell_id",
+                ],
+                condition=models.Q(deleted_at__isnull=True),
+                name="lte_wardriving_ingest_key_idx",
+            )
+        ]
         verbose_name = " LTE Wardriving Found"
         verbose_name_plural = " LTE Wardriving Founds"
 
     def __str__(self):
         return f"`{self.pk}`:{self.mcc}-{self.mnc}-{self.lac} : ({self.cell_id})"
 
+    current_latitude = micro_degrees_property("latitude_e6", MAX_LATITUDE)
+    current_longitude = micro_degrees_property("longitude_e6", MAX_LONGITUDE)
+
     def is_default_data(self):
-        # Check current_latitude / current_longitude
-        lat = getattr(self, "current_latitude", None)
-        lon = getattr(self, "current_longitude", None)
+        # Default si no tenemos coordenadas reales (0 µ° en ambas)
+        return not self.latitude_e6 and not self.longitude_e6
+
+
+class WardrivingRollup(models.Model):
+    # Rows of wardriving_vendor per day and BI dimension (cards D02-D06),
+    # kept in step with every upsert batch by apps.wardriving.rollups
+    day = models.DateField()
+    uploaded_by = models.TextField(default="")
+    device_source = models.CharField(max_length=50, default="")
+    auth_mode = models.CharField(max_length=50, default="")
+    signal_streng = models.CharField(max_length=16)
+    # Wardriving.vendor_id, 0 when the MAC has no vendor
+    vendor_id = models.BigIntegerField(default=0)
+    qty = models.BigIntegerField(default=0)
+
+    class Meta:
+        db_table = "wardriving_rollup"
+        constraints = [
+            models.UniqueConstraint(
+                fields=[
+                    "day",
+                    "uploaded_by",
+                    "device_source",
+                    "auth_mode",
+                    "signal_streng",
+                    "vendor_id",
+                ],
+                name="uniq_wardriving_rollup_dims",
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["uploaded_by", "day"], name="wd_rollup_uploader_day_idx"
+            ),
+            models.Index(fields=["day"], name="wd_rollup_day_idx"),
+        ]
+        verbose_name = "Wardriving Rollup"
+        verbose_name_plural = "Wardriving Rollups"
+
+    def __str__(self):
+        return f"{self.day} {self.uploaded_by} {self.signal_streng}: {self.qty}"
+
+
+class BIRefreshState(models.Model):
+    # One row per materialized view (db_table) refreshed by
+    # tasks.refresh_bi_views. `refreshed_at` is the watermark: the view has
+    # every write committed before it. `stale_since`/`changed_at` are the
+    # first/last ingest marked after it (None while the view is current).
+    view_name = models.CharField(max_length=128, unique=True)
+    refreshed_at = models.DateTimeField(null=True, blank=True)
+    stale_since = models.DateTimeField(null=True, blank=True)
+    changed_at = models.DateTimeField(null=True, blank=True)
+    refresh_queued_at = models.DateTimeField(null=True, blank=True)
+    last_duration_ms = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = "bi_refresh_state"
+        verbose_name = "BI Refresh State"
+        verbose_name_plural = "BI Refresh States"
+
+    def __str__(self):
+        return f"{self.view_name} refreshed_at={self.refreshed_at}"
 
-        def is_zero_or_none(x):
-            if x is None:
-                return True
-            try:
-                return Decimal(x) == 0
-            except (InvalidOperation, TypeError):
-                # Si viene string raro, NaN, etc. trátalo como default
-                return True
+    @property
+    def is_stale(self):
+        return self.refreshed_at is None or self.stale_since is not None
 
-        # Default si no tenemos coordenadas reales
-        return is_zero_or_none(lat) and is_zero_or_none(lon)
+    @property
+    def staleness_seconds(self):
+        # How long the oldest write missing from the view has been waiting
+        if self.refreshed_at is None:
+            return None
+        if self.stale_since is None:
+            return 0
+        return max((now() - self.stale_since).total_seconds(), 0)
 
 
 ## Impor all Views here
 from .db_views import (
     WardrivingVendorsView,
+    WardrivingVendorsMaterializedView,
+    WardrivingRollupVendorsView,
 )
@@ -0,0 +1,161 @@
+"""
+Daily rollup behind the BI cards D02-D06 (sql_bi_sources).
+
+`wardriving_rollup` holds how many wardriving_vendor rows share a day and
+(uploaded_by, device_source, auth_mode, signal_streng, vendor). Writers
+keep it current inside their own transaction: count the rows they touch
+before and after the write (rollup_counts) and add the difference
+(apply_rollup_delta). rebuild_rollups recomputes it from scratch.
+
+Two writers counting the same rows at once would both add their delta, so
+they first take lock_rollup_writers for the uploaders they touch. That also
+takes the whole table in shared mode, which rebuild_rollups takes exclusive
+so no delta lands on rows it is deleting and recounting.
+"""
+
+from collections import Counter
+
+from django.db import connection, transaction
+from django.db.models import BigIntegerField, Count, F, Value
+from django.db.models.functions import Coalesce, TruncDate
+
+from .models import Wardriving, WardrivingRollup, signal_strength_case
+
+ROLLUP_DIMENSIONS = (
+    "day",
+    "uploaded_by",
+    "device_source",
+    "auth_mode",
+    "signal_streng",
+    "vendor_id",
+)
+
+# pg_advisory_xact_lock(class, hashtext(uploaded_by)) of the rollup writers;
+# the single-key lock on the class is the whole table (a separate key space)
+ROLLUP_LOCK_CLASS = 0x524F4C4C
+
+# Same buckets as the stored Wardriving.signal_streng, as an expression so the
+# historical model of the backfill migration (before that column) works too
+SIGNAL_STRENG = signal_strength_case()
+
+
+def lock_rollup_writers(uploaders):
+    """
+    Hold the rollup of these uploaders until the transaction ends: ingest
+    (one uploader per batch) and re-enrichment (any) take it before their
+    `before` count. Sorted so multi-uploader writers can't deadlock.
+    """
+    if connection.vendor != "postgresql":
+        return
+    with connection.cursor() as cursor:
+        # Shared with the other writers, waits for a running rebuild_rollups
+        cursor.execute("SELECT pg_advisory_xact_lock_shared(%s)", [ROLLUP_LOCK_CLASS])
+        for uploaded_by in sorted(set(uploaders)):
+            cursor.execute(
+                "SELECT pg_advisory_xact_lock(%s, hashtext(%s))",
+                [ROLLUP_LOCK_CLASS, uploaded_by],
+            )
+
+
+def rollup_counts(*querysets):
+    """
+    Counter of rollup dimensions -> rows for the Wardriving querysets, only
+    counting what wardriving_vendor shows (alive rows with coordinates).
+    Days are local to the current time zone. A missing vendor is 0.
+    """
+    counts = Counter()
+    for queryset in querysets:
+        rows = (
+            queryset.filter(deleted_at__isnull=True)
+            .exclude(latitude_e6=0)
+            .exclude(longitude_e6=0)
+            .annotate(
+                rollup_day=TruncDate("first_seen"),
+                rollup_signal=SIGNAL_STRENG,
+                rollup_vendor=Coalesce(
+                    "vendor", Value(0), output_field=BigIntegerField()
+                ),
+            )
+            .order_by()
+            .values(
+                "rollup_day",
+                "uploaded_by",
+                "device_source",
+                "auth_mode",
+                "rollup_signal",
+                "rollup_vendor",
+            )
+            .annotate(qty=Count("id"))
+        )
+        for row in rows:
+            key = (
+                row["rollup_day"],
+                row["uploaded_by"],
+                row["device_source"],
+                row["auth_mode"],
+                row["rollup_signal"],
+                row["rollup_vendor"],
+            )
+            counts[key] += row["qty"]
+    return counts
+
+
+def apply_rollup_delta(before, after, rollup_model=None):
+    """
+    Add `after - before` (two rollup_counts) to the rollup table. Keys go in
+    sorted order so concurrent writers lock the same rows in the same order.
+    """
+    rollup_model = rollup_model or WardrivingRollup
+    delta = Counter(after)
+    delta.subtract(before)
+    changes = sorted(
+        ((key, qty) for key, qty in delta.items() if qty),
+        key=lambda item: tuple(str(v) for v in item[0]),
+    )
+    if not changes:
+        return 0
+
+    with transaction.atomic():
+        if connection.vendor == "postgresql":
+            qn = connection.ops.quote_name
+            table = qn(rollup_model._meta.db_table)
+            columns = ", ".join(qn(c) for c in ROLLUP_DIMENSIONS)
+            placeholder = "(" + ", ".join(["%s"] * (len(ROLLUP_DIMENSIONS) + 1)) + ")"
+            with connection.cursor() as cursor:
+                for i in range(0, len(changes), 1000):
+                    batch = changes[i : i + 1000]
+                    cursor.execute(
+                        f"INSERT INTO {table} ({columns}, qty) "
+                        f"VALUES {', '.join([placeholder] * len(batch))} "
+                        f"ON CONFLICT ({columns}) "
+                        f"DO UPDATE SET qty = {table}.qty + EXCLUDED.qty",
+                        [v for key, qty in batch for v in (*key, qty)],
+                    )
+        else:
+            for key, qty in changes:
+                dims = dict(zip(ROLLUP_DIMENSIONS, key))
+                if not rollup_model.objects.filter(**dims).update(qty=F("qty") + qty):
+                    rollup_model.objects.create(qty=qty, **dims)
+    return len(changes)
+
+
+@transaction.atomic
+def rebuild_rollups(queryset=None, rollup_model=None):
+    """Recompute the whole rollup table. Returns the number of rollup rows."""
+    if queryset is None:
+        queryset = Wardriving.objects.all()
+    rollup_model = rollup_model or WardrivingRollup
+    if connection.vendor == "postgresql":
+        # Waits for the writers in flight and holds new ones until the commit,
+        # so the recount sees every committed delta and none lands after it
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", [ROLLUP_LOCK_CLASS])
+    rollup_model.objects.all().delete()
+    rollup_model.objects.bulk_create(
+        (
+            rollup_model(qty=qty, **dict(zip(ROLLUP_DIMENSIONS, key)))
+            for key, qty in rollup_counts(queryset).items()
+        ),
+        batch_size=1000,
+    )
+    return rollup_model.objects.count()
@@ -1,7 +1,6 @@
-class WardrivingVendorsSQL:
-    view_definition = {
-        "django.db.backends.postgresql": r"""
+WARDRIVING_VENDOR_SELECT = r"""
         SELECT
+            wardriving.id,
             wardriving.mac,
             COALESCE(vendor.registry, 'Not setted yet') AS registry,
             COALESCE(vendor.organization_name, 'Not found yet') AS vendor,
@@ -11,26 +10,71 @@ class WardrivingVendorsSQL:
             wardriving.first_seen,
             wardriving.channel,
             wardriving.rssi,
-            CASE
-                WHEN wardriving.rssi > -50 THEN 'Excellent'
-                WHEN wardriving.rssi BETWEEN -60 AND -50 THEN 'Good'
-                WHEN wardriving.rssi BETWEEN -70 AND -60 THEN 'Fair'
-                ELSE 'Weak'
-            END AS signal_streng,
+            wardriving.signal_streng,
             wardriving.device_source,
             wardriving.uploaded_by,
             wardriving.type,
-            wardriving.current_latitude,
-            wardriving.current_longitude,
+            (wardriving.latitude_e6 / 1000000.0)::numeric(9, 6) AS current_latitude,
+            (wardriving.longitude_e6 / 1000000.0)::numeric(9, 6) AS current_longitude,
             wardriving.altitude_meters,
             wardriving.accuracy_meters
         FROM wardriving
-        LEFT JOIN vendor ON UPPER(REGEXP_REPLACE(vendor.normalized_prefix,'(.{2})(.{2})(.{2})', '\1:\2:\3'))=UPPER(SUBSTRING(wardriving.mac,1,8))
+        LEFT JOIN vendor ON vendor.id = wardriving.vendor_id
         WHERE
-            (wardriving.current_latitude!=0 AND wardriving.current_longitude!=0)
+            (wardriving.latitude_e6!=0 AND wardriving.longitude_e6!=0)
 	        AND wardriving.deleted_at is NULL
-        """,
+        """
+
+
+class WardrivingVendorsSQL:
+    view_definition = {
+        "django.db.backends.postgresql": WARDRIVING_VENDOR_SELECT,
         # 🚧 TODO: All other db systems
         "django.db.backends.sqlite3": "SELECT 1 AS id WHERE 1=0",
         "django.db.backends.mysql": "SELECT 1 AS id WHERE 1=0",
     }
+
+
+class WardrivingVendorsMaterializedSQL:
+    # Same rows as wardriving_vendor, stored for the BI dashboards. Only
+    # PostgreSQL has materialized views, the other engines get no definition.
+    view_definition = {
+        "django.db.backends.postgresql": WARDRIVING_VENDOR_SELECT,
+    }
+    # The unique index on id is what REFRESH ... CONCURRENTLY needs; the rest
+    # back the Metabase filters of sql_bi_sources/D00-D06. Recreating the view
+    # drops them, so tasks.refresh_bi_views re-creates them when missing.
+    indexes = (
+        "CREATE UNIQUE INDEX IF NOT EXISTS wardriving_vendor_mv_id_uniq "
+        "ON wardriving_vendor_mv (id)",
+        "CREATE INDEX IF NOT EXISTS wardriving_vendor_mv_author_seen_idx "
+        "ON wardriving_vendor_mv (uploaded_by, first_seen)",
+        "CREATE INDEX IF NOT EXISTS wardriving_vendor_mv_seen_idx "
+        "ON wardriving_vendor_mv (first_seen)",
+    )
+
+
+WARDRIVING_ROLLUP_VENDOR_SELECT = r"""
+        SELECT
+            wardriving_rollup.id,
+            wardriving_rollup.day,
+            wardriving_rollup.uploaded_by,
+            wardriving_rollup.device_source,
+            wardriving_rollup.auth_mode,
+            wardriving_rollup.signal_streng,
+            COALESCE(vendor.organization_name, 'Not found yet') AS vendor,
+            wardriving_rollup.qty
+        FROM wardriving_rollup
+        LEFT JOIN vendor ON vendor.id = wardriving_rollup.vendor_id
+        """
+
+
+class WardrivingRollupVendorsSQL:
+    # wardriving_rollup with the vendor name of wardriving_vendor, read by the
+    # BI cards D02-D06 (sum(qty) instead of count(*)). Plain SQL, so every
+    # engine gets the real view.
+    view_definition = {
+        "django.db.backends.postgresql": WARDRIVING_ROLLUP_VENDOR_SELECT,
+        "django.db.backends.sqlite3": WARDRIVING_ROLLUP_VENDOR_SELECT,
+        "django.db.backends.mysql": WARDRIVING_ROLLUP_VENDOR_SELECT,
+    }
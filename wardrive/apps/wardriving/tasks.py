@@ -0,0 +1,140 @@
+import time
+
+from celery import shared_task
+from django.conf import settings
+from django.db import connection
+from django.utils.timezone import now
+
+from .models import BIRefreshState, WardrivingVendorsMaterializedView
+from .rollups import rebuild_rollups
+from .sql_views import WardrivingVendorsMaterializedSQL
+
+# (materialized view model, index DDL) refreshed for the BI dashboards
+BI_MATERIALIZED_VIEWS = (
+    (WardrivingVendorsMaterializedView, WardrivingVendorsMaterializedSQL.indexes),
+)
+# pg_try_advisory_lock key, so overlapping beat/burst refreshes skip instead
+# of queueing behind each other
+BI_REFRESH_LOCK_ID = 0x57415244
+
+
+def _bi_states():
+    return [
+        BIRefreshState.objects.get_or_create(view_name=view._meta.db_table)[0]
+        for view, _ in BI_MATERIALIZED_VIEWS
+    ]
+
+
+def mark_bi_stale():
+    """Record that wardriving changed after the last refresh of the BI views."""
+    stamp = now()
+    for state in _bi_states():
+        BIRefreshState.objects.filter(pk=state.pk, stale_since__isnull=True).update(
+            stale_since=stamp
+        )
+        BIRefreshState.objects.filter(pk=state.pk).update(changed_at=stamp)
+
+
+def request_bi_refresh():
+    """
+    Called after an ingest commits. A burst of uploads schedules a single
+    refresh BI_REFRESH_DEBOUNCE_SECONDS after its first file; the beat
+    schedule picks up anything a lost task left behind.
+    """
+    if connection.vendor != "postgresql":
+        return
+    mark_bi_stale()
+    queued = BIRefreshState.objects.filter(refresh_queued_at__isnull=True).update(
+        refresh_queued_at=now()
+    )
+    if queued:
+        refresh_bi_views.apply_async(countdown=settings.BI_REFRESH_DEBOUNCE_SECONDS)
+
+
+def _ensure_indexes(cursor, view, indexes):
+    cursor.execute(
+        "SELECT ispopulated FROM pg_matviews WHERE matviewname = %s",
+        [view._meta.db_table],
+    )
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    for ddl in indexes:
+        cursor.execute(ddl)
+    return row[0]
+
+
+@shared_task(
+    bind=True,
+    acks_late=True,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    retry_jitter=True,
+    max_retries=5,
+    reject_on_worker_lost=True,
+)
+def refresh_bi_views(self, force=False):
+    """
+    REFRESH MATERIALIZED VIEW CONCURRENTLY for every BI view with writes
+    newer than its watermark (or all of them with force=True). Dashboards keep
+    reading the previous snapshot while it runs.
+    """
+    if connection.vendor != "postgresql":
+        return "Materialized BI views are only available on PostgreSQL."
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_try_advisory_lock(%s)", [BI_REFRESH_LOCK_ID])
+        if not cursor.fetchone()[0]:
+            return "Another BI refresh is running."
+
+    refreshed = []
+    try:
+        for state, (view, indexes) in zip(_bi_states(), BI_MATERIALIZED_VIEWS):
+            # Cleared before refreshing so writes landing meanwhile queue again
+            BIRefreshState.objects.filter(pk=state.pk).update(refresh_queued_at=None)
+            if not force and state.refreshed_at and state.changed_at is None:
+                continue
+
+            started = now()
+            clock = time.monotonic()
+            with connection.cursor() as cursor:
+                populated = _ensure_indexes(cursor, view, indexes)
+            if populated is None:
+                continue
+            # CONCURRENTLY needs the unique index and a populated view
+            view.refresh(concurrently=populated)
+
+            # The refresh snapshot began after `started`, so every write marked
+            # up to then is in the view
+            BIRefreshState.objects.filter(pk=state.pk).update(
+                refreshed_at=started,
+                last_duration_ms=int((time.monotonic() - clock) * 1000),
+            )
+            BIRefreshState.objects.filter(pk=state.pk, changed_at__lte=started).update(
+                stale_since=None, changed_at=None
+            )
+            refreshed.append(view._meta.db_table)
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_unlock(%s)", [BI_REFRESH_LOCK_ID])
+
+    if not refreshed:
+        return "BI views are up to date."
+    return f"Refreshed BI views: {', '.join(refreshed)}"
+
+
+@shared_task(
+    bind=True,
+    acks_late=True,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    retry_jitter=True,
+    max_retries=5,
+    reject_on_worker_lost=True,
+)
+def rebuild_wardriving_rollups(self):
+    """
+    Recompute wardriving_rollup from scratch. Ingest keeps it current; this
+    catches writes made outside the upsert path (admin soft deletes, SQL).
+    """
+    return f"Wardriving rollup rebuilt: {rebuild_rollups()} rows"
@@ -205,6 +205,7 @@ CELERY_ENABLE_UTC = False
 # --- Sharding por (uploaded_by, device_source) ---
 CELERY_SHARDS = int(os.getenv("CELERY_SHARDS", "4"))
 CELERY_TASK_DEFAULT_QUEUE = "proc_0"
+CELERY_MAINTENANCE_QUEUE = "maintenance"
 QUEUE_ARGS = {"x-max-priority": 10}
 
 CELERY_TASK_QUEUES = tuple(
@@ -215,27 +216,122 @@ CELERY_TASK_QUEUES = tuple(
         **{"queue_arguments": QUEUE_ARGS},
     )
     for i in range(CELERY_SHARDS)
+) + (
+    # Beat / background tasks that touch rows of every uploader: a worker of
+    # their own, so they never run inside an ingest shard (start_celery.sh
+    # with QUEUE=maintenance)
+    Queue(
+        name=CELERY_MAINTENANCE_QUEUE,
+        exchange=Exchange(CELERY_MAINTENANCE_QUEUE),
+        routing_key=CELERY_MAINTENANCE_QUEUE,
+        **{"queue_arguments": QUEUE_ARGS},
+    ),
 )
 
 
-def _shard_for(uploaded_by_id, device_source, n=CELERY_SHARDS):
-    key = f"{uploaded_by_id}:{device_source}"
-    return f"proc_{(hash(key) % n)}"
+# process_file -> proc_N: consistent-hash ring of (uploaded_by, device_source)
+# with CELERY_SHARD_VNODES points per queue (apps/files/routing.py)
+CELERY_SHARD_VNODES = env("CELERY_SHARD_VNODES", default=64, cast=int)
+# An uploader with nothing in flight spills to the least-loaded queue when
+# its ring queue has this many more messages waiting
+CELERY_SHARD_SPILL_DEPTH = env("CELERY_SHARD_SPILL_DEPTH", default=20, cast=int)
+# Queue depths are read from the broker at most every N seconds
+CELERY_SHARD_DEPTH_TTL = env("CELERY_SHARD_DEPTH_TTL", default=5, cast=int)
+# The uploader -> queue lease expires if its files never report back
+CELERY_SHARD_LEASE_TTL = env("CELERY_SHARD_LEASE_TTL", default=6 * 3600, cast=int)
 
+CELERY_TASK_ROUTES = (
+    "apps.files.routing.route_by_pair",
+    {
+        name: {
+            "queue": CELERY_MAINTENANCE_QUEUE,
+            "routing_key": CELERY_MAINTENANCE_QUEUE,
+        }
+        for name in (
+            "apps.vendors.tasks.reenrich_vendor_ids",
+            "apps.wardriving.tasks.refresh_bi_views",
+            "apps.wardriving.tasks.rebuild_wardriving_rollups",
+            "apps.files.tasks.drain_file_backlog",
+        )
+    },
+)
 
-def route_by_pair(name, args, kwargs, options, task=None, **_):
-    if name.endswith("process_file"):
-        ub = kwargs.get("_uploaded_by_id")
-        ds = kwargs.get("_device_source")
-        if ub is not None and ds is not None:
-            q = _shard_for(ub, ds)
-            # prioridad ejemplo: fuentes críticas más alto (más cercano a 10)
-            prio = 8 if ds in {"wardriving_app"} else 5
-            return {"queue": q, "routing_key": q, "priority": prio}
-    return None
+# --- Upsert engine: "on_conflict" (Postgres INSERT ... ON CONFLICT), "copy"
+# (Postgres COPY into a staging table, then one merge) or "orm" (any database) ---
+INGEST_UPSERT_ENGINE = env("INGEST_UPSERT_ENGINE", default="on_conflict")
+
+# --- Parallel parsing of one big file (byte ranges over a process pool) ---
+# The pool is a billiard one, which forks from prefork celery children; each
+# child then runs up to this many parsers, so size it against --concurrency
+# (or run the proc_N workers with a non-prefork pool: solo / threads)
+INGEST_PARSE_WORKERS = env("INGEST_PARSE_WORKERS", default=1, cast=int)
+INGEST_PARALLEL_MIN_BYTES = env(
+    "INGEST_PARALLEL_MIN_BYTES", default=64 * 1024 * 1024, cast=int
+)
 
+# --- Chunked processing of one big file over Celery (chord of chunk tasks) ---
+# Files of at least INGEST_CHUNKED_MIN_BYTES are split in this many chunks
+# parsed by any proc_N worker; 0 or 1 processes every file in one task
+INGEST_CHUNKED_CHUNKS = env("INGEST_CHUNKED_CHUNKS", default=0, cast=int)
+INGEST_CHUNKED_MIN_BYTES = env(
+    "INGEST_CHUNKED_MIN_BYTES", default=256 * 1024 * 1024, cast=int
+)
+# Chunk checkpoints, must be shared by the celery workers like MEDIA_ROOT
+INGEST_CHUNK_DIR = env(
+    "INGEST_CHUNK_DIR", default=os.path.join(MEDIA_ROOT, "ingest_chunks")
+)
 
-CELERY_TASK_ROUTES = (route_by_pair,)
+# --- Micro-batching of small uploads (process_file_group) ---
+# Small files of one (uploaded_by, device_source) arriving within this many
+# seconds are parsed together and upserted once; 0 queues every file alone
+INGEST_GROUP_WINDOW = env("INGEST_GROUP_WINDOW", default=0, cast=int)
+INGEST_GROUP_MAX_BYTES = env(
+    "INGEST_GROUP_MAX_BYTES", default=8 * 1024 * 1024, cast=int
+)
+INGEST_GROUP_MAX_FILES = env("INGEST_GROUP_MAX_FILES", default=50, cast=int)
+
+# --- Backlog of FilesUploaded (pending / failed / lost) drained by celery beat ---
+# Files requeued per run, at most until the proc_N queues hold this many messages
+INGEST_DRAIN_BATCH = env("INGEST_DRAIN_BATCH", default=200, cast=int)
+INGEST_DRAIN_QUEUE_LIMIT = env("INGEST_DRAIN_QUEUE_LIMIT", default=500, cast=int)
+# Pending or failed files untouched this long (seconds) are requeued; this
+# is the only retry of a failed file (process_file has no autoretry)
+INGEST_DRAIN_STALE_SECONDS = env("INGEST_DRAIN_STALE_SECONDS", default=600, cast=int)
+# Running files without progress this long were lost with their worker
+INGEST_RUNNING_TIMEOUT = env("INGEST_RUNNING_TIMEOUT", default=1800, cast=int)
+# Failed files are not requeued anymore after this many attempts
+INGEST_MAX_ATTEMPTS = env("INGEST_MAX_ATTEMPTS", default=12, cast=int)
+
+# --- OUI longest-prefix index (mmap file shared by web and celery processes) ---
+OUI_INDEX_PATH = env("OUI_INDEX_PATH", default=os.path.join(BASE_DIR, "oui_index.bin"))
+
+# --- Materialized BI views (wardriving_vendor_mv) ---
+# Ingest bursts schedule one refresh this many seconds after the first file
+BI_REFRESH_DEBOUNCE_SECONDS = env("BI_REFRESH_DEBOUNCE_SECONDS", default=60, cast=int)
+
+# --- Celery beat (django_celery_beat DatabaseScheduler syncs these entries) ---
+CELERY_BEAT_SCHEDULE = {
+    # Re-stamp Wardriving.vendor for OUIs changed by the last IEEE import
+    "reenrich-vendor-ids": {
+        "task": "apps.vendors.tasks.reenrich_vendor_ids",
+        "schedule": crontab(minute="*/15"),
+    },
+    # Catch-all for the BI materialized views (no-op while they are current)
+    "refresh-bi-views": {
+        "task": "apps.wardriving.tasks.refresh_bi_views",
+        "schedule": crontab(minute="*/10"),
+    },
+    # Requeue the FilesUploaded backlog (no-op while loading is disabled)
+    "drain-file-backlog": {
+        "task": "apps.files.tasks.drain_file_backlog",
+        "schedule": crontab(minute="*"),
+    },
+    # Nightly full recount of the D02-D06 rollup (ingest updates it in place)
+    "rebuild-wardriving-rollups": {
+        "task": "apps.wardriving.tasks.rebuild_wardriving_rollups",
+        "schedule": crontab(hour=3, minute=30),
+    },
+}
 CELERY_TASK_ACKS_LATE = True
 CELERY_TASK_REJECT_ON_WORKER_LOST = True
 